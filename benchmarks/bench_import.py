@@ -0,0 +1,105 @@
+# ======================================
+# Import time of the Qt compatibility layer and the plug-in
+# ======================================
+# Usage (from the repository root):
+#   python -m benchmarks.bench_import [--repeat 20] [--json out.json]
+#
+# Every measurement runs in a fresh interpreter (nothing is cached in sys.modules).
+#   lazy         : import qt_compat (symbols are resolved on first use)
+#   eager        : import qt_compat + preload() (resolve all symbols, the old behavior)
+#   plugin       : import the plug-in module (stand-in Krita objects), Qt is imported on first use
+#   plugin_eager : preload() + import the plug-in module (what loading the plug-in cost before)
+# "qt" is the number of Qt symbols resolved by the scenario.
+# The Python interpreter startup itself is not included.
+# Without PyQt5 / PyQt6 the Qt stand-ins of krita_stub are used : only the "qt" column
+# means something then, the times do not include any real Qt import.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "lazy": "import split_text.qt_compat",
+    "eager": "import split_text.qt_compat as qc; qc.preload()",
+    "plugin": "import importlib; importlib.import_module('split_text.split_text')",
+    "plugin_eager": "import importlib, split_text.qt_compat as qc; qc.preload(); "
+                    "importlib.import_module('split_text.split_text')",
+}
+
+
+def child_source(statement):
+    return "\n".join([
+        "import sys, time",
+        f"sys.path.insert(0, {ROOT!r})",
+        "import split_text",  # before the stub : the package does not load the extension here
+        "from benchmarks import krita_stub",
+        "krita_stub.install()",
+        "t0 = time.perf_counter()",
+        statement,
+        "t1 = time.perf_counter()",
+        "qc = sys.modules.get('split_text.qt_compat')",
+        "print(len(set(qc._SYMBOLS) & set(vars(qc))) if qc else 0)",
+        "print((t1 - t0) * 1000)",
+    ])
+
+
+def measure(statement, repeat):
+    """ Milliseconds of the statement, one fresh interpreter per run """
+    times = []
+    resolved = 0
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", child_source(statement)],
+                             capture_output=True, text=True, cwd=ROOT)
+        if out.returncode != 0:
+            raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr else "failed")
+        lines = out.stdout.strip().splitlines()
+        resolved = int(lines[-2])
+        times.append(float(lines[-1]))
+    times.sort()
+    return {"min_ms": times[0], "median_ms": times[len(times) // 2], "max_ms": times[-1], "qt": resolved}
+
+
+def qt_available():
+    for name in ("PyQt6", "PyQt5"):
+        out = subprocess.run([sys.executable, "-c", f"import {name}"], capture_output=True)
+        if out.returncode == 0:
+            return name
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_import")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", default=None, help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    qt = qt_available()
+    if qt is None:
+        print("PyQt5 / PyQt6 is not installed, the Qt stand-ins are used (the times are not Qt imports)")
+
+    results = {}
+    print(f"{'scenario':<14}{'min ms':>10}{'median ms':>12}{'max ms':>10}{'qt':>6}")
+    for name, statement in SCENARIOS.items():
+        try:
+            r = results[name] = measure(statement, args.repeat)
+        except RuntimeError as e:
+            print(f"{name:<14} skipped ({e})")
+            continue
+        print(f"{name:<14}{r['min_ms']:>10.2f}{r['median_ms']:>12.2f}{r['max_ms']:>10.2f}{r['qt']:>6}")
+
+    for lazy, eager in (("lazy", "eager"), ("plugin", "plugin_eager")):
+        if lazy in results and eager in results:
+            gain = results[eager]["median_ms"] - results[lazy]["median_ms"]
+            print(f"{lazy} : lazy loading saves {gain:.2f} ms (median)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
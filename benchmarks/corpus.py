@@ -0,0 +1,65 @@
+# ======================================
+# Synthetic text shapes for benchmarks
+# ======================================
+# Text shapes like the output of Krita's shape.toSvg(), with variable
+# line count, <tspan> nesting depth, style size, units and writing-mode.
+
+import random
+
+WRITING_MODES = ("horizontal-tb", "vertical-rl", "vertical-lr")
+FONT_UNITS = ("pt", "px", "mm", "em")
+WORDS = ("Main", "Street", "Coffee", "1.50", "Station", "North", "Exit", "Open", "Menu", "Label")
+
+
+def make_style(size, unit, extra_props=0, rng=None):
+    rng = rng or random.Random(0)
+    props = [f"font-size: {size}{unit}", "font-family: Noto Sans", "fill: #000000"]
+    for i in range(extra_props):
+        props.append(f"-krita-prop-{i}: {rng.randint(0, 999)}")
+    return "; ".join(props) + ";"
+
+
+def make_line(index, depth, rng):
+    words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+    inner = f"{words} {index}"
+    for d in range(depth):
+        inner = f'<tspan fill="#{d % 10}{d % 10}0000" dy="0">{inner}</tspan>'
+    return inner
+
+
+def make_text_svg(lines=10, depth=1, extra_props=0, unit="pt", writing_mode="horizontal-tb",
+                  line_height=None, seed=0):
+    """
+    A <text> element with <tspan> lines
+    - lines: number of lines
+    - depth: nesting depth of <tspan> in each line (0 : plain text lines)
+    - extra_props: number of additional declarations in the style attribute
+    """
+    rng = random.Random(seed)
+    size = {"pt": 12, "px": 16, "mm": 4, "em": 1}[unit]
+    style = make_style(size, unit, extra_props, rng)
+    if line_height:
+        style += f" line-height: {line_height};"
+    attrs = f'style="{style}" writing-mode="{writing_mode}"'
+
+    if depth == 0:
+        body = "\n".join(make_line(i, 0, rng) for i in range(lines))
+        return f"<text {attrs}>{body}</text>"
+
+    parts = []
+    for i in range(lines):
+        parts.append(f'<tspan x="0" dy="{size * 1.2:.2f}">{make_line(i, depth - 1, rng)}\n</tspan>')
+    return f"<text {attrs}>{''.join(parts)}</text>"
+
+
+def make_corpus(count=100, lines=10, depth=1, extra_props=0, seed=0):
+    """ List of text shapes, the units and writing modes are mixed """
+    rng = random.Random(seed)
+    return [
+        make_text_svg(
+            lines=lines, depth=depth, extra_props=extra_props,
+            unit=rng.choice(FONT_UNITS), writing_mode=rng.choice(WRITING_MODES),
+            seed=seed + i,
+        )
+        for i in range(count)
+    ]
@@ -0,0 +1,348 @@
+# ======================================
+# Stand-in Krita objects for benchmarks
+# ======================================
+# A minimal "krita" module (Krita / Document / View / Node / Shape) so that the plug-in
+# code can run outside of Krita. Only the methods used by the plug-in are implemented.
+# Without PyQt, a minimal "PyQt5" package is installed too (QObject, QTimer, QProgressDialog,
+# QFont ...) : the plug-in module loads and main() runs headless.
+# The timers do not run by themselves, run_timers() fires them (no event loop).
+
+import importlib.util
+import sys
+import time
+import types
+import xml.etree.ElementTree as ET
+
+from split_text.affine import parse_svg_transform
+
+
+class StubTransform:
+    """ QTransform like object (m11 .. m32) """
+    def __init__(self, m=(1.0, 0.0, 0.0, 1.0, 0.0, 0.0)):
+        self.m = tuple(float(v) for v in m)
+
+    def m11(self): return self.m[0]
+    def m12(self): return self.m[1]
+    def m21(self): return self.m[2]
+    def m22(self): return self.m[3]
+    def m31(self): return self.m[4]
+    def m32(self): return self.m[5]
+
+
+class StubShape:
+    def __init__(self, svg, transform=None, shape_type="KoSvgTextShapeID", selected=True):
+        self.svg = svg
+        self.transform = transform or StubTransform()
+        self.shape_type = shape_type
+        self.selected = selected
+        self.layer = None
+        self.removed = False
+        self.shape_name = ""
+        self.visible = True
+
+    def toSvg(self): return self.svg
+    def absoluteTransformation(self): return self.transform
+    def setTransformation(self, transform): self.transform = transform
+    def isSelected(self): return self.selected
+    def type(self): return self.shape_type
+    def name(self): return self.shape_name
+    def setName(self, name): self.shape_name = name
+    def isVisible(self): return self.visible
+    def setVisible(self, visible): self.visible = visible
+    def select(self): self.selected = True
+    def deselect(self): self.selected = False
+
+    def remove(self):
+        self.removed = True
+        if self.layer is not None:
+            self.layer.shape_list.remove(self)
+
+
+class StubVectorLayer:
+    def __init__(self, shapes=(), name="Vector Layer", keep_shapes=False):
+        self.layer_name = name
+        # True : addShapesFromSvg() adds the <text> elements as shapes (named by their ids)
+        self.keep_shapes = keep_shapes
+        self.shape_list = []
+        self.add_calls = 0
+        self.added_bytes = 0
+        self.add_seconds = 0.0  # time in addShapesFromSvg()
+        for shape in shapes:
+            self.add_shape(shape)
+
+    def add_shape(self, shape):
+        shape.layer = self
+        self.shape_list.append(shape)
+
+    def type(self): return "vectorlayer"
+    def name(self): return self.layer_name
+    def shapes(self): return list(self.shape_list)
+
+    def addShapesFromSvg(self, svg):
+        # Krita parses the document here (parsed also here for the timing), the call count and size are recorded
+        start = time.perf_counter()
+        self.add_calls += 1
+        self.added_bytes += len(svg)
+        root = ET.fromstring(svg)
+        self.add_seconds += time.perf_counter() - start
+        if not self.keep_shapes:
+            return []
+        added = []
+        for element in root:
+            shape = StubShape(ET.tostring(element, encoding="unicode"),
+                              StubTransform(parse_svg_transform(element.get("transform"))), selected=False)
+            shape.setName(element.get("id", ""))
+            self.add_shape(shape)
+            added.append(shape)
+        return added
+
+
+class StubView:
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.messages = []  # the floating messages (text)
+    def selectedNodes(self): return list(self.nodes)
+    def showFloatingMessage(self, text, icon, timeout, priority): self.messages.append(text)
+
+
+class StubWindow:
+    def __init__(self, view):
+        self.view = view
+    def activeView(self): return self.view
+    def qwindow(self): return None
+
+
+class StubDocument:
+    def __init__(self, width=1000, height=1000):
+        self.w, self.h = width, height
+    def width(self): return self.w
+    def height(self): return self.h
+
+
+class StubAction:
+    def trigger(self): pass
+
+
+class StubKrita:
+    _instance = None
+
+    def __init__(self):
+        self.document = StubDocument()
+        self.window = StubWindow(StubView([]))
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def activeDocument(self): return self.document
+    def activeWindow(self): return self.window
+    def action(self, name): return StubAction()
+    def addExtension(self, extension): pass
+    def readSetting(self, group, name, default): return default
+    def writeSetting(self, group, name, value): pass
+
+
+class StubExtension:
+    def __init__(self, parent=None):
+        self.parent = parent
+
+
+# -------
+# Qt
+# -------
+
+class StubEnum:
+    """ Any Qt enum value (Ex: Qt.WindowModality.WindowModal), compared by its path """
+    def __init__(self, path):
+        self.path = path
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return StubEnum(f"{self.path}.{name}")
+
+    def __or__(self, other):
+        return StubEnum(f"{self.path}|{getattr(other, 'path', other)}")
+
+    def __eq__(self, other):
+        return isinstance(other, StubEnum) and other.path == self.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+    def __repr__(self):
+        return self.path
+
+
+class _StubQtMeta(type):
+    # the enums of a class (Ex: QMessageBox.StandardButton.Ok)
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return StubEnum(f"{cls.__name__}.{name}")
+
+
+class StubQtObject(metaclass=_StubQtMeta):
+    """ Base of the Qt stand-ins, the methods that are not implemented do nothing """
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: None
+
+
+class StubSignal:
+    def __init__(self):
+        self.slots = []
+    def connect(self, slot): self.slots.append(slot)
+    def emit(self, *args):
+        for slot in list(self.slots):
+            slot(*args)
+
+
+class QObject(StubQtObject):
+    def __init__(self, parent=None):
+        self.qt_parent = parent
+
+
+class QTimer(QObject):
+    running = []  # the started timers, see run_timers()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.timeout = StubSignal()
+        self.interval = 0
+
+    def setInterval(self, ms): self.interval = ms
+    def isActive(self): return self in QTimer.running
+
+    def start(self, ms=None):
+        if ms is not None:
+            self.interval = ms
+        if self not in QTimer.running:
+            QTimer.running.append(self)
+
+    def stop(self):
+        if self in QTimer.running:
+            QTimer.running.remove(self)
+
+    @staticmethod
+    def singleShot(ms, callback):
+        pass  # only used to close the notices
+
+
+def run_timers(limit=1000000):
+    """ Fire the running timers until all are stopped, the intervals are not waited """
+    for _ in range(limit):
+        if not QTimer.running:
+            return
+        for timer in list(QTimer.running):
+            timer.timeout.emit()
+    raise RuntimeError("the timers are still running")
+
+
+class QProgressDialog(QObject):
+    def __init__(self, label="", cancel="", minimum=0, maximum=100, parent=None):
+        super().__init__(parent)
+        self.maximum = maximum
+        self.current = minimum
+        self.canceled = False
+        self.visible = False
+    def setValue(self, value): self.current = value
+    def value(self): return self.current
+    def wasCanceled(self): return self.canceled
+    def cancel(self): self.canceled = True
+    def show(self): self.visible = True
+    def close(self): self.visible = False
+
+
+class QFont(StubQtObject):
+    def __init__(self, family=""):
+        self.family_name = family
+        self.size = 12.0
+    def setPointSizeF(self, size): self.size = size
+    def pointSizeF(self): return self.size
+
+
+class QFontMetricsF(StubQtObject):
+    # the same rough widths as glyphs.ApproxMetrics would give, in px at 72 dpi
+    def __init__(self, font):
+        self.size = font.size
+    def horizontalAdvance(self, text): return len(text) * self.size * 0.55
+    def lineSpacing(self): return self.size * 1.2
+
+
+class StubScreen:
+    def logicalDotsPerInch(self): return 72.0
+
+
+class QGuiApplication(StubQtObject):
+    @staticmethod
+    def primaryScreen(): return StubScreen()
+
+
+class Qt(StubQtObject):
+    pass
+
+
+class StubQtModule(types.ModuleType):
+    """ PyQt5.QtCore etc. : the stand-ins above, a do-nothing class for any other name """
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = STUB_QT_CLASSES.get(name)
+        if value is None:
+            value = _StubQtMeta(name, (StubQtObject,), {})
+        setattr(self, name, value)
+        return value
+
+
+class QTransform(StubTransform):
+    """ QTransform(m11, m12, m21, m22, dx, dy) """
+    def __init__(self, *m):
+        super().__init__(m or (1.0, 0.0, 0.0, 1.0, 0.0, 0.0))
+
+
+STUB_QT_CLASSES = {cls.__name__: cls for cls in (QObject, QTimer, QProgressDialog, QFont, QFontMetricsF,
+                                                  QGuiApplication, Qt, QTransform)}
+
+
+def install_qt():
+    """ Register the Qt stand-ins as "PyQt5" (only when no PyQt is installed) """
+    if "PyQt5" in sys.modules or any(importlib.util.find_spec(name) for name in ("PyQt5", "PyQt6")):
+        return sys.modules.get("PyQt5")
+    package = StubQtModule("PyQt5")
+    package.__path__ = []
+    sys.modules["PyQt5"] = package
+    for name in ("QtCore", "QtGui", "QtWidgets", "uic"):
+        module = StubQtModule(f"PyQt5.{name}")
+        sys.modules[module.__name__] = module
+        setattr(package, name, module)
+    return package
+
+
+def install():
+    """ Register the stub as "krita" module (only when the real one is not loaded) """
+    install_qt()
+    if "krita" in sys.modules:
+        return sys.modules["krita"]
+    module = types.ModuleType("krita")
+    module.Krita = StubKrita
+    module.Extension = StubExtension
+    module.qVersion = lambda: "5.15.0"
+    module.__all__ = ["Krita", "Extension"]
+    sys.modules["krita"] = module
+    return module
+
+
+def set_selection(layers, document=None):
+    """ Make the layers the selected nodes of the stub Krita """
+    app = StubKrita.instance()
+    if document is not None:
+        app.document = document
+    app.window = StubWindow(StubView(layers))
+    return app
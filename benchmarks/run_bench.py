@@ -0,0 +1,213 @@
+# ======================================
+# Benchmarks of the split hot path (runs without Krita)
+# ======================================
+# Usage (from the repository root):
+#   python -m benchmarks.run_bench [--lines 10,100,1000] [--depth 2] [--shapes 50] [--json out.json]
+#
+# For each stage : throughput (lines/s), latency percentiles per call and peak memory.
+# The "main" stage runs the plug-in's main() with stand-in Krita objects, "main_per_shape" the same
+# with BATCH_ADD_SHAPES = False (one addShapesFromSvg() call per shape), both count the calls.
+# "parse_output" / "parse_compact" parse the plain / compact output (Krita parses it in
+# addShapesFromSvg()), with the output size in bytes.
+# The "resync" stage edits one word of each linked source and resyncs it (see live.py).
+# Without PyQt they run with the Qt stand-ins of krita_stub (no window, no real fonts).
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import krita_stub
+from benchmarks.corpus import make_corpus
+
+from split_text.core import clone_without, parse_css_property, split_svg
+from split_text.stream import iter_split_svg
+from split_text.compact import DEFAULT_DIGITS
+
+# A rotated text (the numbers of the output are not short)
+OUTPUT_TRANSFORM = (0.7071067811865476, 0.7071067811865475, -0.7071067811865475, 0.7071067811865476,
+                    28.346500000000002, 11.1)
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(p / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+def run_stage(name, func, items, lines, repeat=3):
+    """
+    Call func(item) for all items (repeat times) and measure it
+    - lines: number of text lines handled by one call
+    """
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            t0 = time.perf_counter()
+            func(item)
+            latencies.append(time.perf_counter() - t0)
+    total = time.perf_counter() - start
+
+    # Peak memory of one pass (separated, tracemalloc slows down the calls)
+    tracemalloc.start()
+    for item in items:
+        func(item)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    latencies.sort()
+    calls = len(latencies)
+    return {
+        "stage": name,
+        "calls": calls,
+        "lines_per_s": (calls * lines / total) if total > 0 else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "peak_kib": peak / 1024,
+    }
+
+
+def load_plugin():
+    """ The plug-in module with the stub Krita, or None """
+    # Installed after the headless modules, so the package itself is imported without Krita
+    krita_stub.install()
+    try:
+        # "split_text.split_text" is the Extension class in the package namespace, get the module
+        importlib.import_module("split_text.split_text")
+        plugin = sys.modules["split_text.split_text"]
+    except Exception as e:
+        print(f"main() stage skipped: {type(e).__name__}: {e}", file=sys.stderr)
+        return None
+    # The completion notice needs a real window
+    plugin.notice_autoclose_dialog = lambda *args, **kwargs: None
+    # The stages measure the split itself : no chunked runner (progress dialog, timer slices),
+    # and no QFont measuring (the Qt stand-ins have no real fonts), the approximated line spacing is used.
+    # The worker pool is off, the stage measures the split in this process (not the pool start up).
+    plugin.CHUNKED_MODE = False
+    plugin.LINE_METRICS = False
+    plugin.USE_WORKER_POOL = False
+    # The repeated calls would be cache hits
+    plugin.SPLIT_CACHE = None
+    return plugin
+
+
+def bench_main(plugin, corpus, lines, repeat, batch=True):
+    """ main() with batched (one call per layer) or per-shape addShapesFromSvg() calls """
+    calls = []
+
+    def run(_):
+        layer = krita_stub.StubVectorLayer([krita_stub.StubShape(svg) for svg in corpus])
+        krita_stub.set_selection([layer])
+        plugin.main()
+        if not layer.add_calls:
+            raise RuntimeError("main() did not add the split shapes")
+        calls.append((layer.add_calls, layer.add_seconds))
+
+    saved = plugin.BATCH_ADD_SHAPES
+    plugin.BATCH_ADD_SHAPES = batch
+    try:
+        result = run_stage("main" if batch else "main_per_shape", run, [None], lines * len(corpus), repeat)
+    finally:
+        plugin.BATCH_ADD_SHAPES = saved
+    result["add_calls"] = calls[-1][0]
+    result["add_ms"] = sorted(seconds for _, seconds in calls)[len(calls) // 2] * 1000
+    return result
+
+
+def bench_resync(plugin, corpus, lines, repeat):
+    # Live split once, then each call edits one word per source and resyncs
+    layer = krita_stub.StubVectorLayer([krita_stub.StubShape(svg) for svg in corpus], keep_shapes=True)
+    krita_stub.set_selection([layer])
+    sources = layer.shapes()
+    plugin.main_split_live()
+
+    def run(_):
+        for shape in sources:
+            if " EDIT</tspan>" in shape.svg:
+                shape.svg = shape.svg.replace(" EDIT</tspan>", "</tspan>", 1)
+            else:
+                shape.svg = shape.svg.replace("</tspan>", " EDIT</tspan>", 1)
+            shape.select()
+        plugin.main_resync()
+
+    return run_stage("resync", run, [None], lines * len(corpus), repeat)
+
+
+def run_all(line_counts, depth, extra_props, shapes, repeat):
+    plugin = load_plugin()
+    results = []
+    for lines in line_counts:
+        corpus = make_corpus(count=shapes, lines=lines, depth=depth, extra_props=extra_props)
+        roots = [ET.fromstring(svg) for svg in corpus]
+        tspans = [child for root in roots for child in root if child.tag == "tspan"]
+
+        stage_results = [
+            run_stage("parse_css_property", lambda r: (parse_css_property(r, "font-size"),
+                      parse_css_property(r, "line-height")), roots, 0, repeat),
+            run_stage("clone_without", clone_without, tspans, 1, repeat),
+            run_stage("split_svg", split_svg, corpus, lines, repeat),
+            run_stage("iter_split_svg", lambda s: sum(1 for _ in iter_split_svg(s)), corpus, lines, repeat),
+            run_stage("split_svg_compact", lambda s: split_svg(s, OUTPUT_TRANSFORM, compact=DEFAULT_DIGITS),
+                      corpus, lines, repeat),
+        ]
+        for name, compact in (("parse_output", None), ("parse_compact", DEFAULT_DIGITS)):
+            outputs = [split_svg(svg, OUTPUT_TRANSFORM, compact=compact) for svg in corpus]
+            r = run_stage(name, lambda o: ET.fromstring(f"<svg>{o}</svg>"), outputs, lines, repeat)
+            r["output_bytes"] = sum(len(o.encode("utf-8")) for o in outputs)
+            stage_results.append(r)
+        if plugin is not None:
+            stage_results.append(bench_main(plugin, corpus, lines, repeat))
+            stage_results.append(bench_main(plugin, corpus, lines, repeat, batch=False))
+            stage_results.append(bench_resync(plugin, corpus, lines, repeat))
+
+        for r in stage_results:
+            r.update(lines=lines, depth=depth, extra_props=extra_props, shapes=shapes)
+        results.extend(stage_results)
+    return results
+
+
+def print_table(results):
+    print(f"{'stage':<20} {'lines':>6} {'calls':>7} {'lines/s':>12} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KiB':>10}")
+    for r in results:
+        lps = f"{r['lines_per_s']:.0f}" if r["lines_per_s"] else "-"
+        print(f"{r['stage']:<20} {r['lines']:>6} {r['calls']:>7} {lps:>12} "
+              f"{r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} {r['p99_ms']:>9.3f} {r['peak_kib']:>10.1f}")
+    for r in results:
+        if "output_bytes" in r:
+            print(f"{r['stage']:<20} {r['lines']:>6} lines : output {r['output_bytes']} bytes")
+        if "add_calls" in r:
+            print(f"{r['stage']:<20} {r['lines']:>6} lines : {r['add_calls']} addShapesFromSvg call(s), "
+                  f"{r['add_ms']:.3f} ms in them, {r['p50_ms']:.3f} ms in total")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run_bench")
+    parser.add_argument("--lines", default="10,100,1000", help="line counts per shape (comma separated)")
+    parser.add_argument("--depth", type=int, default=2, help="<tspan> nesting depth per line")
+    parser.add_argument("--props", type=int, default=4, help="additional style declarations")
+    parser.add_argument("--shapes", type=int, default=20, help="shapes per corpus")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", default=None, help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    line_counts = [int(v) for v in args.lines.split(",") if v]
+    results = run_all(line_counts, args.depth, args.props, args.shapes, args.repeat)
+    print_table(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
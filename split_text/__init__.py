@@ -1 +1,8 @@
-from .split_text import split_text
\ No newline at end of file
+try:
+    import krita
+except ImportError:
+    # Headless use (batch tools, worker processes) : the Krita extension is not loaded
+    krita = None
+
+if krita is not None:
+    from .split_text import split_text
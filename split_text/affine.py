@@ -0,0 +1,123 @@
+# ======================================
+# Krita text split plug-in : affine transform of the split lines
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# "Bake" the absolute transform into each split line :
+# the line start (x, y) is mapped into the document coordinates, then the line gets
+# its own matrix(a b c d X Y) with x = y = 0.
+# The linear part (rotation, scale, skew) stays in the matrix, the glyphs need it.
+# All line positions are mapped in one matrix operation (NumPy when it is available).
+
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Below this number of points, pure Python is faster than building arrays
+NUMPY_MIN_POINTS = 32
+
+# (m11, m12, m21, m22, dx, dy)
+IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+def map_points(m, xs, ys):
+    """
+    Map points by the transform m (m11, m12, m21, m22, dx, dy), the same as QTransform.map()
+    Returns tuple (list of x, list of y)
+    """
+    if np is not None and len(xs) >= NUMPY_MIN_POINTS:
+        points = np.column_stack((np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)))
+        linear = np.array(((m[0], m[1]), (m[2], m[3])), dtype=float)
+        mapped = points @ linear + np.array((m[4], m[5]), dtype=float)
+        return mapped[:, 0].tolist(), mapped[:, 1].tolist()
+    return ([m[0] * x + m[2] * y + m[4] for x, y in zip(xs, ys)],
+            [m[1] * x + m[3] * y + m[5] for x, y in zip(xs, ys)])
+
+
+def coordinate(element, key):
+    try:
+        return float(element.get(key, 0.0))
+    except ValueError:
+        return 0.0
+
+
+def bake_lines(lines, m):
+    """
+    Put the position of each line (<text> element) into its own transform
+    - m: the absolute transform (m11, m12, m21, m22, dx, dy)
+    """
+    if not lines:
+        return lines
+    xs = [coordinate(line, "x") for line in lines]
+    ys = [coordinate(line, "y") for line in lines]
+    mapped_x, mapped_y = map_points(m, xs, ys)
+    linear = f"matrix({m[0]} {m[1]} {m[2]} {m[3]} "
+    for line, x, y in zip(lines, mapped_x, mapped_y):
+        line.set("transform", f"{linear}{x} {y})")
+        line.set("x", "0")
+        line.set("y", "0")
+    return lines
+
+
+def multiply_matrix(a, b):
+    """
+    Product of two 6 value matrices, same order as SVG (apply b at first, then a)
+    """
+    return (
+        a[0] * b[0] + a[2] * b[1],
+        a[1] * b[0] + a[3] * b[1],
+        a[0] * b[2] + a[2] * b[3],
+        a[1] * b[2] + a[3] * b[3],
+        a[0] * b[4] + a[2] * b[5] + a[4],
+        a[1] * b[4] + a[3] * b[5] + a[5],
+    )
+
+
+def parse_svg_transform(value):
+    """
+    SVG transform attribute -> 6 values (m11, m12, m21, m22, dx, dy)
+    Supports matrix, translate, scale, rotate, skewX, skewY (and the lists of them)
+    """
+    result = IDENTITY
+    if not value:
+        return result
+
+    for item in value.strip().split(")"):
+        if "(" not in item:
+            continue
+        name, args = item.split("(", 1)
+        name = name.strip(" ,\t\n").lower()
+        nums = [float(v) for v in args.replace(",", " ").split()]
+
+        if name == "matrix" and len(nums) == 6:
+            m = tuple(nums)
+        elif name == "translate" and nums:
+            m = (1.0, 0.0, 0.0, 1.0, nums[0], nums[1] if len(nums) > 1 else 0.0)
+        elif name == "scale" and nums:
+            sy = nums[1] if len(nums) > 1 else nums[0]
+            m = (nums[0], 0.0, 0.0, sy, 0.0, 0.0)
+        elif name == "rotate" and nums:
+            rad = math.radians(nums[0])
+            c, s = math.cos(rad), math.sin(rad)
+            m = (c, s, -s, c, 0.0, 0.0)
+            if len(nums) == 3:
+                # rotate(a cx cy) = translate(cx cy) rotate(a) translate(-cx -cy)
+                cx, cy = nums[1], nums[2]
+                m = multiply_matrix((1.0, 0.0, 0.0, 1.0, cx, cy), m)
+                m = multiply_matrix(m, (1.0, 0.0, 0.0, 1.0, -cx, -cy))
+        elif name == "skewx" and nums:
+            m = (1.0, 0.0, math.tan(math.radians(nums[0])), 1.0, 0.0, 0.0)
+        elif name == "skewy" and nums:
+            m = (1.0, math.tan(math.radians(nums[0])), 0.0, 1.0, 0.0, 0.0)
+        else:
+            raise ValueError(f"Unsupported transform: {item.strip()})")
+        result = multiply_matrix(result, m)
+
+    return result
@@ -0,0 +1,258 @@
+# ======================================
+# Krita text split plug-in : batch tool
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the 
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# Split every <text> of the SVG files in a directory without Krita.
+# The files are processed in a process pool (all cores by default)
+#
+# Usage:
+#   python -m split_text.batch <directory> [-o OUTPUT_DIR] [-j JOBS] [-r] [-g line|word|char]
+#                              [-b] [-c DIGITS]
+#
+# The output is written as "<name>.split.svg" next to the input (or into OUTPUT_DIR).
+# Note: The positions are computed like in Krita, 
+#       the text is placed by "transform" and the lines by "dy" (or font-size / line-height)
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+from .affine import parse_svg_transform
+from .core import split_svg
+from .glyphs import GRANULARITIES
+from .stream import iter_split_svg
+from .style import style_property
+
+SVG_NS = "http://www.w3.org/2000/svg"
+OUTPUT_SUFFIX = ".split.svg"
+# A <text> larger than this (serialized) is split by the streaming splitter (stream.py),
+# the new lines are made one by one instead of all of them at once
+STREAM_MIN_SIZE = 256 * 1024
+
+# Keep the usual prefixes when the documents are written again (Ex: Krita's content.svg)
+for _prefix, _uri in (("xlink", "http://www.w3.org/1999/xlink"),
+                      ("krita", "http://krita.org/namespaces/svg/krita"),
+                      ("sodipodi", "http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd")):
+    ET.register_namespace(_prefix, _uri)
+
+
+def local_name(tag):
+    """ "{namespace}text" -> "text" """
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def strip_namespace(element):
+    """
+    Remove the namespace from the tags of the element (and children) in place,
+    the split engine works with plain tag names like Krita's toSvg() output.
+    """
+    for el in element.iter():
+        if isinstance(el.tag, str) and el.tag.startswith("{"):
+            el.tag = local_name(el.tag)
+
+
+def add_namespace(element, ns):
+    for el in element.iter():
+        if isinstance(el.tag, str) and not el.tag.startswith("{"):
+            el.tag = f"{{{ns}}}{el.tag}"
+
+
+def unique_ids(elements, used_ids):
+    """ The split lines copy the id of the original <text>, the 2nd and later get a new one """
+    n = 0
+    for el in elements[1:]:
+        base = el.get("id")
+        if not base:
+            continue
+        n += 1
+        while f"{base}_{n}" in used_ids:
+            n += 1
+        el.set("id", f"{base}_{n}")
+        used_ids.add(f"{base}_{n}")
+
+
+def split_text_data(text, data, transform, granularity="line", bake=False, compact=None, group=False):
+    """
+    Split one <text> of the document
+    - text: the <text> element, data: its SVG string
+    Returns the new <text> elements as a string (joined with line break)
+    """
+    # stream.py has only the line split with the default options, and no area text wrap
+    if (len(data) >= STREAM_MIN_SIZE and granularity == "line" and not bake and compact is None
+            and not style_property(text.attrib, "inline-size")):
+        return "\n".join(iter_split_svg(data, transform))
+    return split_svg(data, transform, granularity=granularity, bake=bake, compact=compact, group=group)
+
+
+def split_svg_document(svg_data, granularity="line", bake=False, compact=None, group=False):
+    """
+    Split all <text> elements in a SVG document (string or bytes)
+    - granularity: "line", "word" or "char"
+    - bake: put the position of each line into its own transform (see affine.py)
+    - compact: digits of the numbers for the compact output (see compact.py), None : off
+    - group: with compact, the lines of each text are put in one <g> element
+    Returns tuple (svg string, number of split <text> elements)
+    """
+    root = ET.fromstring(svg_data)
+    ns = root.tag[1:].split("}", 1)[0] if root.tag.startswith("{") else ""
+
+    # Collect at first, the tree is modified while replacing
+    targets = []
+    for parent in root.iter():
+        for child in parent:
+            if local_name(child.tag) == "text":
+                targets.append((parent, child))
+
+    used_ids = {el.get("id") for el in root.iter() if el.get("id")}
+    count = 0
+    for parent, text in targets:
+        transform = parse_svg_transform(text.get("transform"))
+        strip_namespace(text)
+        output = split_text_data(text, ET.tostring(text, encoding="unicode"), transform, granularity,
+                                 bake, compact, group)
+        if not output:
+            continue
+
+        new_elements = list(ET.fromstring("<g>" + output + "</g>"))
+        unique_ids([el for new in new_elements for el in new.iter("text")], used_ids)
+        if ns:
+            for el in new_elements:
+                add_namespace(el, ns)
+
+        index = list(parent).index(text)
+        parent.remove(text)
+        for i, el in enumerate(new_elements):
+            parent.insert(index + i, el)
+        count += 1
+
+    if ns:
+        ET.register_namespace("", ns)
+    return ET.tostring(root, encoding="unicode"), count
+
+
+def output_path_for(path, output_dir=None):
+    base = os.path.basename(path)
+    name = base[:-4] if base.lower().endswith(".svg") else base
+    return os.path.join(output_dir or os.path.dirname(path), name + OUTPUT_SUFFIX)
+
+
+# The umask can only be read by setting it, so it is read once at the import
+# (set per write, another thread of the process could create files with umask 0)
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
+def write_atomic(path, text):
+    """ Write the text file through a temporary file, the readers never see a partial file """
+    fd, tmp = tempfile.mkstemp(suffix=".tmp", prefix=".", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.chmod(tmp, 0o666 & ~UMASK)  # mkstemp makes it private
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def process_file(job):
+    """
+    Worker : split one SVG file and write the result
+    job: tuple (input path, output path, granularity[, bake[, compact[, group]]])
+    Returns tuple (input path, number of split texts, error message or None)
+    """
+    src, dst, granularity, *rest = job
+    bake = rest[0] if rest else False
+    compact = rest[1] if len(rest) > 1 else None
+    group = rest[2] if len(rest) > 2 else False
+    try:
+        with open(src, "rb") as f:
+            data = f.read()
+        result, count = split_svg_document(data, granularity, bake, compact, group)
+        write_atomic(dst, result)
+        return src, count, None
+    except Exception as e:
+        return src, 0, f"{type(e).__name__}: {e}"
+
+
+def find_svg_files(directory, recursive=False):
+    files = []
+    for dirpath, dirnames, filenames in os.walk(directory):
+        for name in sorted(filenames):
+            if name.lower().endswith(".svg") and not name.endswith(OUTPUT_SUFFIX):
+                files.append(os.path.join(dirpath, name))
+        if not recursive:
+            break
+    return files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m split_text.batch",
+        description="Split every multiple line <text> of the SVG files in a directory.")
+    parser.add_argument("directory", help="directory that contains SVG files")
+    parser.add_argument("-o", "--output-dir", default=None,
+                        help="write results here (default: next to the input files)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: all cores)")
+    parser.add_argument("-r", "--recursive", action="store_true",
+                        help="also process the sub directories")
+    parser.add_argument("-g", "--granularity", choices=GRANULARITIES, default="line",
+                        help="split by line (default), word or character")
+    parser.add_argument("-b", "--bake", action="store_true",
+                        help="put the position of each line into its own transform")
+    parser.add_argument("-c", "--compact", type=int, default=None, metavar="DIGITS",
+                        help="compact output : round the numbers to DIGITS, drop the default attributes")
+    parser.add_argument("--group", action="store_true",
+                        help="with -c, put the lines of each text in one <g> (added as one group shape)")
+    args = parser.parse_args(argv)
+    if args.group and args.compact is None:
+        parser.error("--group needs -c DIGITS")
+
+    files = find_svg_files(args.directory, args.recursive)
+    if not files:
+        print(f"No SVG files in {args.directory}")
+        return 0
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    jobs = [(path, output_path_for(path, args.output_dir), args.granularity, args.bake, args.compact, args.group)
+            for path in files]
+    workers = max(1, min(args.jobs, len(jobs)))
+    start = time.perf_counter()
+    texts = errors = 0
+
+    if workers == 1:
+        results = map(process_file, jobs)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        # Small chunks keep all workers busy, large ones reduce the IPC overhead
+        results = executor.map(process_file, jobs, chunksize=max(1, len(jobs) // (workers * 4)))
+
+    try:
+        for src, count, error in results:
+            if error:
+                errors += 1
+                print(f"Error: {src}: {error}", file=sys.stderr)
+            texts += count
+    finally:
+        if workers > 1:
+            executor.shutdown()
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(jobs)} files, {texts} texts split, {errors} errors "
+          f"in {elapsed:.2f} s ({workers} workers)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+# ======================================
+# Krita text split plug-in : split result cache
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the 
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# Content addressed LRU cache of split outputs.
+# The same label (same SVG and options) is split only once, the next copies get the
+# ready output. The plug-in keeps templates without the position (see core.apply_transform),
+# so a label at another place is a hit too. It can be saved to / loaded from a JSON file.
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+
+CACHE_FILE_VERSION = 2
+
+
+class SplitCache:
+    """
+    LRU cache : key (hash of SVG + options) -> split output string
+    - max_entries: upper limit of the number of entries
+    - max_size:    upper limit of the total characters of the outputs (None : no limit)
+    - path:        JSON file for load() / save() (None : memory only)
+    """
+    def __init__(self, max_entries=2048, max_size=64 * 1024 * 1024, path=None):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.path = path
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.loaded = False
+
+    @staticmethod
+    def key(svg_data, *options):
+        """ Hash of the SVG and the options (Ex: granularity, a transform tuple when it is in the output) """
+        h = hashlib.sha1()
+        h.update(svg_data.encode("utf-8") if isinstance(svg_data, str) else svg_data)
+        for option in options:
+            h.update(b"\0" + str(option).encode("utf-8"))
+        return h.hexdigest()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        """ The cached output or None (it counts hits / misses) """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if value is None:
+            return
+        if self.max_size is not None and len(value) > self.max_size:
+            return  # never fits
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= len(old)
+        self.entries[key] = value
+        self.size += len(value)
+        self._evict()
+
+    def _evict(self):
+        while self.entries and (len(self.entries) > self.max_entries or
+                                (self.max_size is not None and self.size > self.max_size)):
+            _, value = self.entries.popitem(last=False)
+            self.size -= len(value)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
+    # --- persistence ---
+
+    def load(self, path=None):
+        """ Load the entries from the JSON file (missing or broken file is ignored) """
+        path = path or self.path
+        self.loaded = True
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print("split_text: cache file is not readable:", e)
+            return 0
+        if data.get("version") != CACHE_FILE_VERSION:
+            return 0
+        for key, value in data.get("entries", []):
+            self.put(key, value)
+        return len(self.entries)
+
+    def save(self, path=None):
+        """ Write the entries (oldest first) to the JSON file atomically """
+        path = path or self.path
+        if not path:
+            return
+        data = {"version": CACHE_FILE_VERSION, "entries": list(self.entries.items())}
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".split_cache", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
@@ -0,0 +1,178 @@
+# ======================================
+# Krita text split plug-in : compact output
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# Smaller split output, so Krita has less to parse in addShapesFromSvg() :
+#   - the numbers are rounded and written in the shortest form ("28.3465" not "28.346500000000002")
+#   - attributes equal to the default or to the inherited value are removed
+#     (x="0", writing-mode="horizontal-tb", a font-size attribute under a style font-size,
+#      <tspan> attributes that repeat the parent)
+#   - group (opt-in) : the transform and the inherited style shared by all lines of a shape
+#     are written once on a <g> element around the lines
+# Note: with the group, the lines of one text are added as one group shape (the split lines
+#       are not independent shapes then), so it is off by default.
+
+import re
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+
+from .style import parse_style
+
+# Digits after the decimal point (0.001 pt is far below one pixel)
+DEFAULT_DIGITS = 3
+# The linear part of a matrix (rotation, scale) is multiplied by the coordinates, it keeps more
+LINEAR_DIGITS = 6
+
+NUMERIC_KEYS = ("x", "y", "dx", "dy", "font-size")
+NUMBER_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+MATRIX_RE = re.compile(r"^\s*matrix\(([^)]*)\)\s*$")
+DEFAULT_ATTRIBUTES = {"x": "0", "y": "0", "writing-mode": "horizontal-tb"}
+
+# Properties inherited by the children (they can move to the group / be dropped on a <tspan>)
+INHERITED = frozenset((
+    "fill", "fill-opacity", "fill-rule", "stroke", "stroke-width", "stroke-opacity",
+    "stroke-linecap", "stroke-linejoin", "stroke-miterlimit", "stroke-dasharray", "stroke-dashoffset",
+    "paint-order", "font", "font-family", "font-size", "font-style", "font-weight", "font-variant",
+    "font-stretch", "font-kerning", "font-feature-settings", "letter-spacing", "word-spacing",
+    "line-height", "text-anchor", "text-align", "direction", "writing-mode", "text-orientation",
+    "dominant-baseline", "white-space", "visibility", "color",
+))
+
+
+def format_number(value, digits=DEFAULT_DIGITS):
+    """ Shortest string of the rounded value Ex: 28.346500000000002 -> "28.347", 12.0 -> "12" """
+    value = round(value, digits)
+    if value == 0:
+        return "0"  # also -0.0
+    text = repr(value)
+    return text[:-2] if text.endswith(".0") else text
+
+
+def format_numbers(text, digits=DEFAULT_DIGITS):
+    """ Round all numbers in an attribute (Ex: transform="matrix(...)") """
+    return NUMBER_RE.sub(lambda m: format_number(float(m.group()), digits), text)
+
+
+@lru_cache(maxsize=1024)
+def format_transform(text, digits=DEFAULT_DIGITS):
+    """ Round the numbers of a transform attribute, "matrix(a b c d e f)" keeps more digits for a - d """
+    m = MATRIX_RE.match(text)
+    values = NUMBER_RE.findall(m.group(1)) if m else ()
+    if len(values) != 6:
+        return format_numbers(text, digits)
+    linear = max(digits, LINEAR_DIGITS)
+    parts = [format_number(float(v), linear if i < 4 else digits) for i, v in enumerate(values)]
+    return f"matrix({' '.join(parts)})"
+
+
+@lru_cache(maxsize=4096)
+def format_value(text, digits=DEFAULT_DIGITS):
+    # the same values come again and again (font-size, the line steps)
+    try:
+        return format_number(float(text), digits)
+    except ValueError:
+        return text  # with unit or list, as it is
+
+
+def compact_numbers(element, digits=DEFAULT_DIGITS):
+    # the transform is the same string for all lines of a shape (cached)
+    for el in element.iter():
+        attrib = el.attrib
+        for k in NUMERIC_KEYS:
+            v = attrib.get(k)
+            if v is not None:
+                attrib[k] = format_value(v, digits)
+        if "transform" in attrib:
+            attrib["transform"] = format_transform(attrib["transform"], digits)
+
+
+def style_string(props):
+    return ";".join(f"{k}:{v}" for k, v in props.items())
+
+
+def drop_redundant(line):
+    """ Remove the default and inherited attributes of a line <text> element """
+    attrib = line.attrib
+    for k, v in DEFAULT_ATTRIBUTES.items():
+        if attrib.get(k) == v:
+            del attrib[k]
+    style = parse_style(attrib.get("style", ""))
+    for k in list(attrib):
+        if k in style and k in INHERITED:
+            del attrib[k]  # the style property wins over the attribute
+
+    # <tspan> attributes equal to the value of the parent
+    inherited = {k: v for k, v in attrib.items() if k in INHERITED}
+    inherited.update((k, v) for k, v in style.items() if k in INHERITED)
+    stack = [(child, inherited) for child in line]
+    while stack:
+        el, parent = stack.pop()
+        for k in [k for k, v in el.attrib.items() if parent.get(k) == v]:
+            del el.attrib[k]
+        if el.attrib:
+            current = dict(parent)
+            current.update((k, v) for k, v in el.attrib.items() if k in INHERITED)
+            current.update((k, v) for k, v in parse_style(el.get("style", "")).items() if k in INHERITED)
+        else:
+            current = parent
+        stack.extend((child, current) for child in el)
+
+
+def shared_attributes(lines):
+    """
+    The attributes and style properties of the first line that all lines have
+    Returns tuple (attributes, style properties), only transform and inherited properties
+    """
+    first = lines[0].attrib
+    attrs = {k: v for k, v in first.items() if k == "transform" or k in INHERITED}
+    props = {k: v for k, v in parse_style(first.get("style", "")).items() if k in INHERITED}
+    for line in lines[1:]:
+        attrib = line.attrib
+        attrs = {k: v for k, v in attrs.items() if attrib.get(k) == v}
+        style = parse_style(attrib.get("style", ""))
+        props = {k: v for k, v in props.items() if style.get(k) == v}
+        if not attrs and not props:
+            break
+    return attrs, props
+
+
+def group_lines(lines):
+    """ Move the shared attributes into a <g> element around the lines """
+    attrs, props = shared_attributes(lines)
+    if not attrs and not props:
+        return lines
+    group = ET.Element("g", attrs)
+    if props:
+        group.set("style", style_string(props))
+    for line in lines:
+        attrib = line.attrib
+        for k in attrs:
+            del attrib[k]
+        if props:
+            rest = {k: v for k, v in parse_style(attrib["style"]).items() if k not in props}
+            if rest:
+                attrib["style"] = style_string(rest)
+            else:
+                del attrib["style"]
+        group.append(line)
+    return [group]
+
+
+def compact_lines(lines, digits=DEFAULT_DIGITS, group=False):
+    """
+    Make the split lines (<text> elements) smaller, in place
+    - digits: digits after the decimal point of the numbers
+    - group:  True : the shared attributes go to a <g> element (2 or more lines)
+    Returns list of the elements to write (the lines, or one <g> element)
+    """
+    for line in lines:
+        compact_numbers(line, digits)
+        drop_redundant(line)
+    if group and len(lines) > 1:
+        return group_lines(lines)
+    return lines
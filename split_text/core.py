@@ -0,0 +1,444 @@
+# ======================================
+# Krita text split plug-in : split engine
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the 
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# The split logic without Krita (pure Python),
+# it can be used from the plug-in, batch tools and worker processes.
+
+import xml.etree.ElementTree as ET
+
+from .style import style_length, style_property, parse_length
+from .glyphs import GRANULARITIES, base_font_key, font_key, number_ids, split_line_pieces
+from .serialize import serialize_elements
+from .units import to_pt, from_pt, to_pt_array, UNIT_INDEX
+from .profiling import PROFILER
+from .wrap import wrap_width, wrap_lines
+from .affine import IDENTITY, bake_lines
+from .result import SplitResult
+from .compact import compact_lines
+
+# The transform attribute of a template output (split with transform=None), see apply_transform()
+TRANSFORM_PLACEHOLDER = "matrix(split_text)"
+
+def clone_without(element, remove_keys=("x", "y", "dy")):
+    """
+    Remove (x, y, dy) attribute,and the element make to cloning with recursive
+    """
+    new_el = ET.Element(element.tag)
+    for k, v in element.attrib.items():
+        if k not in remove_keys:
+            new_el.set(k, v)
+    new_el.text = element.text
+    for child in element:
+        cloned_child = clone_without(child, remove_keys)
+        new_el.append(cloned_child)
+        if child.tail:
+            if cloned_child.tail:
+                cloned_child.tail += child.tail
+            else:
+                cloned_child.tail = child.tail
+    return new_el
+
+def convert_to_pt(value, unit, base_font_size=12):
+    """
+    Conversion unit -> pt 
+    - value: number
+    - unit:  (pt, em, ex, %, lines, px, mm, cm, Q, in, pc)
+    - base_font_size: default 12pt
+    """
+    #print(f"{value} : {unit}")
+    if value is None or unit is None:
+        raise ValueError("Value or unit cannot be None")
+
+    if not isinstance(value, (int, float)):
+        raise TypeError("Value must be a number")
+
+    # Px -> px , PT ->pt  convert to lowercase
+    return to_pt(value, str(unit).lower(), base_font_size)
+
+
+def convert_pt_to_unit(value, unit, base_font_size=12):
+    """
+    Conversion pt -> unit 
+    - value: number
+    - unit:  (pt, em, ex, %, lines, px, mm, cm, Q, in, pc)
+    - base_font_size: default 12pt (fallback to 12pt when it is <= 0)
+    """
+
+    if value is None or unit is None:
+        raise ValueError("Value or unit cannot be None")
+
+    if not isinstance(value, (int, float)):
+        raise TypeError("Value must be a number")
+
+    return from_pt(value, str(unit).lower(), base_font_size)
+
+def parse_css_property(root, key, default_value=12.0, default_unit="pt"):
+    """
+    The helper function, general-purpose CSS property and unit getter 
+
+    Parameters:
+        root: node(it has attrib dictionary）
+        key: property name (Ex: "font-size", "line-height")
+        default_value: (Ex: 12.0)
+        default_unit:  (Ex: "pt")
+    
+    Returns:
+        Tuple (value, unit) float,string(all lower cases)
+    """
+    # The style attribute is tokenized once and cached (see style.py)
+    return style_length(root.attrib, key, default_value, default_unit)
+
+def text_properties(root):
+    """
+    Read the properties for splitting from the original <text> element
+    Returns tuple (preserved_attribs, font_size, line_shift, writing_mode) sizes are pt
+    """
+    # remove x, y, font-size  and keep others form original <text> element
+    preserved_attribs = {}
+    preserved_attribs = dict(root.attrib)
+
+    font_size = None
+    font_unit = None
+    line_shift = None
+    line_shift_unit = None
+
+    font_size, font_unit = parse_css_property(root, "font-size", 12.0, "pt")
+    #print("font-size =", font_size, ", font_unit =", font_unit)  # → 16, "pt"
+
+    if font_unit != "pt":
+        #print("font_unit_process:")
+        font_size = convert_to_pt(font_size, font_unit, base_font_size=font_size)
+
+    # The default line height is the font size (1em), a number without unit
+    # is a multiplier of the font size as in CSS (Ex: line-height:1.5 -> 1.5em)
+    line_shift, line_shift_unit = parse_css_property(root, "line-height", 1.0, "em")
+    #print("line-height =", line_shift, ", line-height unit =", line_shift_unit)  # → 1.5, "em"
+
+    if line_shift_unit != "pt":
+        #print("line_shift_unit_process:")
+        line_shift = convert_to_pt(line_shift, line_shift_unit, base_font_size=font_size or 12.0)
+
+    # if vertical text, add  writing-mode to style attribute(if already it extist)
+
+    if preserved_attribs.get("writing-mode") is None:
+        preserved_attribs["writing-mode"] = "horizontal-tb"
+    writing_mode = preserved_attribs["writing-mode"]
+
+    return preserved_attribs, font_size, line_shift, writing_mode
+
+def plain_text_lines(text):
+    """ Lines of the plain text at <text> (split with line break) """
+    if not text or not text.strip():
+        return []
+    return [line.strip() for line in text.strip().splitlines() if line.strip()]
+
+def parse_dy(dy_val):
+    """
+    dy attribute -> tuple (value, unit)  or (None, None) if it is not usable
+    A plain number (the most case) is float() directly, "1.2em" etc use parse_length
+    """
+    try:
+        return float(dy_val), "pt"
+    except (TypeError, ValueError):
+        pass
+    value, unit = parse_length(dy_val) if dy_val else (None, None)
+    if value is None or (unit or "pt") not in UNIT_INDEX:
+        return None, None
+    return value, unit or "pt"
+
+def line_step(child, writing_mode="horizontal-tb"):
+    """
+    (value, unit) of the line step of a <tspan> line : dy attribute,
+    for vertical text without dy, dx (the columns go to the left in vertical-rl)
+    """
+    attrib = child.attrib
+    if writing_mode != "horizontal-tb" and "dy" not in attrib and "dx" in attrib:
+        value, unit = parse_dy(attrib["dx"])
+        if value is not None and writing_mode == "vertical-rl":
+            value = -value
+        return value, unit
+    return parse_dy(attrib.get("dy"))
+
+def line_keys(writing_mode):
+    """ Position attributes removed from a <tspan> line """
+    return ("x", "y", "dy") if writing_mode == "horizontal-tb" else ("x", "y", "dy", "dx")
+
+def tspan_increment(child, font_size, writing_mode="horizontal-tb"):
+    """ Get the value from dy attribute itself,if not font size. """
+    value, unit = line_step(child, writing_mode)
+    if value is None:
+        return font_size
+    return value if unit == "pt" else to_pt(value, unit, font_size)
+
+def tspan_increments(children, font_size, writing_mode="horizontal-tb", line_spacing=None):
+    """
+    The increments (pt) of many <tspan> lines, the units are converted in one batch call
+    - line_spacing: function(child) -> pt, the step of a line without dy (None : font size)
+    """
+    values = []
+    units = []
+    for child in children:
+        value, unit = line_step(child, writing_mode)
+        if value is None:
+            value, unit = (font_size if line_spacing is None else line_spacing(child)), "pt"
+        values.append(value)
+        units.append(unit)
+    return to_pt_array(values, units, font_size)
+
+def new_line_element(transform_attr, size, preserved_attribs, writing_mode, offset):
+    """
+    Create a new <text> element for a line at the offset
+    (y direction for horizontal-tb, x direction for vertical text)
+    """
+    # Use transform attribute so (0,0)
+    base_x = 0
+    base_y = 0
+
+    new_text_node = ET.Element("text", {
+        "transform": transform_attr,
+        "font-size": str(size)
+    })
+    for k, v in preserved_attribs.items():
+        new_text_node.set(k, v)
+    if writing_mode == "horizontal-tb":
+        new_text_node.set("x", str(base_x))
+        new_text_node.set("y", str(offset))
+    else:
+        new_text_node.set("x", str(offset * (-1 if writing_mode == "vertical-rl" else 1)  ))
+        new_text_node.set("y", str(base_y))
+    return new_text_node
+
+def move_tspan_line(new_text_node, child, remove_keys=("x", "y", "dy")):
+    """
+    Copy-free version of fill_tspan_line
+    The <tspan> subtree itself is re-parented into new <text> element (the original tree is
+    consumed), (x, y, dy) are removed and line breaks are trimmed in the same single pass.
+    """
+    tail = child.tail
+    child.tail = None
+    for el in child.iter():
+        attrib = el.attrib
+        for k in remove_keys:
+            if k in attrib:
+                del attrib[k]
+        if el is child:
+            if el.text:
+                el.text = el.text.rstrip("\n")  # At first for parent text
+        elif el.tag == "tspan":
+            if el.text:
+                el.text = el.text.rstrip("\n")  # for nested <tspan> text
+            if el.tail:
+                el.tail = el.tail.rstrip("\n")  # remove tail(tag after) line brake 
+
+    new_text_node.append(child)
+    if tail and tail.strip():
+        extra_tspan = ET.Element("tspan")
+        extra_tspan.text = tail.strip()
+        new_text_node.append(extra_tspan)
+    return new_text_node
+
+def fill_tspan_line(new_text_node, child, copy=True, remove_keys=("x", "y", "dy")):
+    """
+    Put the contents of a <tspan> line (and the text after it) into new <text> element
+    - copy: False : move the subtree (see move_tspan_line), True : clone it
+    - remove_keys: position attributes to remove (see line_keys)
+    """
+    if not copy:
+        return move_tspan_line(new_text_node, child, remove_keys)
+
+    # Remove unused attribute of <tspan> element, and it makes clone
+    new_tspan = clone_without(child, remove_keys=remove_keys)
+    if new_tspan.text:
+        new_tspan.text = new_tspan.text.rstrip("\n")  # At first for parent text
+
+    for tspan in new_tspan.findall(".//tspan"):
+        if tspan.text:
+            tspan.text = tspan.text.rstrip("\n")  # for nested <tspan> text
+    
+        if tspan.tail:
+            tspan.tail = tspan.tail.rstrip("\n")  # remove tail(tag after) line brake 
+
+    new_text_node.append(new_tspan)
+    #print(f"child.tail : {repr(child.tail)}")
+    if child.tail and child.tail.strip():
+        extra_tspan = ET.Element("tspan")
+        extra_tspan.text = child.tail.strip()
+        new_text_node.append(extra_tspan)
+    return new_text_node
+
+def split_svg_elements(svg_data, transform=IDENTITY, copy=False, granularity="line", metrics=None, bake=False,
+                       compact=None, group=False):
+    """
+    Split a multiple line <text> element (SVG string) into single line <text> elements
+    - svg_data:  SVG string of one <text> element (Ex: output of shape.toSvg())
+    - transform: 6 values (m11, m12, m21, m22, dx, dy) of the absolute transformation
+                 None : a template, the lines get TRANSFORM_PLACEHOLDER (see apply_transform)
+    - copy: True : clone each <tspan> line (clone_without),
+            False: move the parsed subtrees into the new elements (no second copy)
+    - granularity: "line", "word" or "char" (one <text> element per line, word or character)
+    - metrics: font metrics for the line spacing and the word / char positions (see glyphs.py)
+               None : one em per line (or dy, line-height) and approximated advances
+    - bake: True : map each line start by the transform, every line gets its own matrix
+            with the position (x = y = 0), see affine.py
+    - compact: digits of the numbers for the compact output (see compact.py), None : as it is
+    - group: with compact, the lines of the shape are wrapped in one <g> element (2 or more lines)
+    Returns list of the new <text> elements (ET.Element), or [<g>] with group
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+    if transform is None and bake:
+        raise ValueError("A template can not be baked")
+
+    # each <text> elements use local coordinate(0 0) 
+    if transform is None:
+        transform_attr = TRANSFORM_PLACEHOLDER
+    else:
+        transform_attr = matrix_to_svg_transform(transform)  # Ex: "matrix(1.0 0.0 0.0 1.0 tx ty)"
+    
+    # In XML perser, make SVG data(<text> element)
+    try:
+        with PROFILER.stage("parse"):
+            root, shapes = parse_text_root(svg_data)
+    except ET.ParseError as e:
+        print("XML Parse Error:", e)
+        return []
+
+    with PROFILER.stage("split"):
+        new_text_elements = _split_root(root, transform_attr, copy, granularity, metrics, shapes)
+        if bake:
+            bake_lines(new_text_elements, transform)
+    PROFILER.count("lines", len(new_text_elements))
+    if compact is not None:
+        with PROFILER.stage("compact"):
+            new_text_elements = compact_lines(new_text_elements, compact, group)
+    return new_text_elements
+
+def parse_text_root(svg_data):
+    """
+    Parse SVG string of a <text> element
+    The shapes of shape-inside may come with the text (Ex: "<defs>...</defs><text>...</text>"),
+    then the fragment is parsed again inside a wrapper element.
+    Returns tuple (<text> element, dict id -> element of the other elements)
+    """
+    try:
+        return ET.fromstring(svg_data), None
+    except ET.ParseError as e:
+        error = e
+    try:
+        wrapper = ET.fromstring(f"<g>{svg_data}</g>")
+    except ET.ParseError:
+        raise error
+    root = next((el for el in wrapper if el.tag.rsplit("}", 1)[-1] == "text"), None)
+    if root is None:
+        raise error
+    shapes = {el.get("id"): el for el in wrapper.iter() if el.get("id")}
+    return root, shapes
+
+def has_line_height(attrib):
+    """ True if line-height is given as a length or a number (not "normal") """
+    raw = style_property(attrib, "line-height")
+    return raw is not None and (parse_length(raw)[0] or 0) > 0
+
+def root_font_key(svg_data, chunk_size=512):
+    """
+    FontKey of the <text> element of SVG string, only the start tag is parsed
+    Returns None if it is not readable
+    """
+    parser = ET.XMLPullParser(("start",))
+    try:
+        for i in range(0, len(svg_data), chunk_size):
+            parser.feed(svg_data[i:i + chunk_size])
+            for _, root in parser.read_events():
+                font_size, font_unit = parse_css_property(root, "font-size", 12.0, "pt")
+                if font_unit != "pt":
+                    font_size = convert_to_pt(font_size, font_unit, base_font_size=font_size)
+                return base_font_key(root.attrib, font_size)
+    except ET.ParseError:
+        pass
+    return None
+
+def _split_root(root, transform_attr, copy, granularity, metrics, shapes=None):
+    preserved_attribs, font_size, line_shift, writing_mode = text_properties(root)
+    base_font = base_font_key(root.attrib, font_size)
+
+    # With font metrics, a line without dy (or line-height) steps by the measured line spacing
+    plain_step = line_shift
+    line_spacing = None
+    if metrics is not None:
+        if not has_line_height(root.attrib):
+            plain_step = metrics.line_spacing(base_font)
+        line_spacing = lambda child: metrics.line_spacing(font_key(child.attrib, base_font))
+
+    # Generate new <text> element per each line (or each <tspan> segments)
+    new_text_elements = []
+    cumulative_offset = 0.0  # y direction (horizontal-tb) or x direction (vertical)
+
+    # If exist plain text at <text>,generate each line by split with line break
+    for line in plain_text_lines(root.text):
+        cumulative_offset += plain_step#font_size
+        new_text_node = new_line_element(transform_attr, line_shift, preserved_attribs, writing_mode, cumulative_offset)
+        new_text_node.text = line
+        new_text_elements.append(new_text_node)
+    
+    # The chilren elements <tspan>
+    lines = [child for child in root if child.tag == "tspan"]
+    remove_keys = line_keys(writing_mode)
+    for child, increment in zip(lines, tspan_increments(lines, font_size, writing_mode, line_spacing)):
+        cumulative_offset += increment
+        new_text_node = new_line_element(transform_attr, font_size, preserved_attribs, writing_mode, cumulative_offset)
+        new_text_elements.append(fill_tspan_line(new_text_node, child, copy, remove_keys))
+    
+    # Area text : the lines wrapped by Krita are made here again
+    width = wrap_width(root, font_size, shapes, writing_mode)
+    if width:
+        new_text_elements = wrap_lines(new_text_elements, width, writing_mode, base_font, plain_step, metrics)
+
+    if granularity != "line":
+        # Divide each line again into words or characters
+        pieces = []
+        for line in new_text_elements:
+            pieces.extend(split_line_pieces(line, granularity, writing_mode, base_font, metrics))
+        new_text_elements = number_ids(pieces)
+
+    return new_text_elements
+
+def split_svg(svg_data, transform=IDENTITY, copy=False, granularity="line", metrics=None, bake=False,
+              compact=None, group=False):
+    """
+    Split a multiple line <text> element, the same as split_svg_elements()
+    Returns the new <text> elements as a string (joined with line break)
+    """
+    # return contents as each <text> elements, serialized in a single pass
+    elements = split_svg_elements(svg_data, transform, copy, granularity, metrics, bake, compact, group)
+    with PROFILER.stage("serialize"):
+        return serialize_elements(elements)
+
+def split_svg_result(svg_data, transform=IDENTITY, granularity="line", metrics=None, bake=False):
+    """
+    Split a multiple line <text> element, the same as split_svg_elements()
+    Returns result.SplitResult (line records for scripts, SVG is made by to_svg() when needed)
+    """
+    elements = split_svg_elements(svg_data, transform, False, granularity, metrics, bake)
+    return SplitResult.from_elements(elements, tuple(transform))
+
+def apply_transform(template, transform):
+    """
+    The output of split_svg(svg_data, transform) from the template split_svg(svg_data, None)
+    A <text> with its own transform attribute keeps it, as in the split.
+    """
+    if not template:
+        return template
+    return template.replace(f'transform="{TRANSFORM_PLACEHOLDER}"',
+                            f'transform="{matrix_to_svg_transform(transform)}"')
+
+def matrix_to_svg_transform(m):
+    """
+    6 values (m11, m12, m21, m22, dx, dy) -> SVG transform attribute "matrix(...)"
+    """
+    return f"matrix({m[0]} {m[1]} {m[2]} {m[3]} {m[4]} {m[5]})"
@@ -0,0 +1,241 @@
+# ======================================
+# Krita text split plug-in : word / character split
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the 
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# A split line is divided again into words or characters.
+# The line is walked once into "runs" (text + inherited <tspan> attributes), and the
+# position of each piece is the sum of the measured advances before it.
+# Each run / gap is measured once, so the cost is linear in the glyph count.
+#
+# Note: a word that crosses a <tspan> boundary becomes one piece per <tspan>.
+
+import re
+import unicodedata
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+from functools import lru_cache
+
+from .style import parse_style, style_property, style_length
+from .units import to_pt, UNIT_INDEX
+
+GRANULARITIES = ("line", "word", "char")
+
+FontKey = namedtuple("FontKey", "family size weight style")
+
+WORD_RE = re.compile(r"\S+")
+
+ZWJ = "\u200d"
+EXTEND_CATEGORIES = ("Mn", "Me", "Mc")
+
+
+def is_extend(ch):
+    """ The character belongs to the cluster of the character before it """
+    cp = ord(ch)
+    return (unicodedata.category(ch) in EXTEND_CATEGORIES
+            or 0xFE00 <= cp <= 0xFE0F or 0xE0100 <= cp <= 0xE01EF  # variation selectors
+            or 0x1F3FB <= cp <= 0x1F3FF                             # emoji skin tone modifiers
+            or 0xE0020 <= cp <= 0xE007F                             # tags (subdivision flags)
+            or 0x1160 <= cp <= 0x11FF)                              # Hangul jamo V / T
+
+
+def is_regional_indicator(ch):
+    return 0x1F1E6 <= ord(ch) <= 0x1F1FF
+
+
+def grapheme_spans(text):
+    """
+    (start, end) of the user perceived characters (simplified grapheme clusters) :
+    combining marks, variation selectors, emoji modifiers, ZWJ sequences
+    and regional indicator pairs (flags) stay with their base character
+    """
+    spans = []
+    i = 0
+    n = len(text)
+    while i < n:
+        start = i
+        ch = text[i]
+        i += 1
+        if is_regional_indicator(ch) and i < n and is_regional_indicator(text[i]):
+            i += 1
+        while i < n:
+            if is_extend(text[i]):
+                i += 1
+            elif text[i] == ZWJ:
+                i += 2 if i + 1 < n else 1  # ZWJ and the next character
+            else:
+                break
+        spans.append((start, min(i, n)))
+    return spans
+
+
+class ApproxMetrics:
+    """
+    Metrics without Qt (headless use)
+    Approximate advance : 0.5em for narrow glyphs, 1em for wide (CJK) glyphs
+    """
+    narrow = 0.5
+
+    def advance(self, text, font):
+        # one glyph per cluster (a combining mark or a ZWJ sequence has no own width)
+        total = 0.0
+        for start, _ in grapheme_spans(text):
+            total += 1.0 if unicodedata.east_asian_width(text[start]) in ("W", "F") else self.narrow
+        return total * font.size
+
+    def vertical_advance(self, text, font):
+        # Vertical text : one em per glyph (cluster)
+        return len(grapheme_spans(text)) * font.size
+
+    def line_spacing(self, font):
+        # The distance between the lines : one em
+        return font.size
+
+
+class SpacingTable(ApproxMetrics):
+    """
+    Line spacings measured elsewhere (Ex: by Qt on Krita's main thread), it can be sent to workers
+    - spacings: dict FontKey -> line spacing (pt)
+    A font not in the table uses the ratio (spacing / size) of the same font in another size,
+    else one em. The advances are approximated (see ApproxMetrics).
+    """
+    def __init__(self, spacings):
+        self.spacings = dict(spacings)
+        self.ratios = {}
+        for font, spacing in self.spacings.items():
+            if font.size > 0:
+                self.ratios.setdefault((font.family, font.weight, font.style), spacing / font.size)
+
+    def line_spacing(self, font):
+        spacing = self.spacings.get(font)
+        if spacing is None:
+            ratio = self.ratios.get((font.family, font.weight, font.style), 1.0)
+            spacing = self.spacings[font] = ratio * font.size
+        return spacing
+
+
+DEFAULT_METRICS = ApproxMetrics()
+
+
+@lru_cache(maxsize=1024)
+def merge_style(parent, child):
+    """ Merge two style attributes (the child wins) """
+    if not parent:
+        return child
+    if not child:
+        return parent
+    props = dict(parse_style(parent))
+    props.update(parse_style(child))
+    return ";".join(f"{k}:{v}" for k, v in props.items())
+
+
+def merge_attrib(parent, child):
+    merged = dict(parent)
+    for k, v in child.items():
+        if k == "style" and "style" in parent:
+            v = merge_style(parent["style"], v)
+        merged[k] = v
+    return merged
+
+
+def iter_runs(line, attrs=None):
+    """
+    Walk a split line element once
+    Yields tuple (text, attrs) : attrs is the merged attributes of the enclosing <tspan>s
+    """
+    attrs = attrs if attrs is not None else {}
+    if line.text:
+        yield line.text, attrs
+    for child in line:
+        child_attrs = merge_attrib(attrs, child.attrib) if child.attrib else attrs
+        yield from iter_runs(child, child_attrs)
+        if child.tail:
+            yield child.tail, attrs
+
+
+def font_key(attrs, base):
+    """ FontKey of a run, not specified properties are taken from base (FontKey) """
+    if not attrs:
+        return base
+    size, unit = style_length(attrs, "font-size", base.size, "pt")
+    if unit != "pt":
+        size = to_pt(size, unit, base.size) if unit in UNIT_INDEX else base.size
+    return FontKey(
+        style_property(attrs, "font-family", base.family),
+        size,
+        style_property(attrs, "font-weight", base.weight),
+        style_property(attrs, "font-style", base.style),
+    )
+
+
+def base_font_key(attrib, font_size):
+    """ FontKey of the original <text> element (font_size is pt) """
+    return FontKey(
+        style_property(attrib, "font-family", "sans-serif"),
+        font_size,
+        style_property(attrib, "font-weight", "normal"),
+        style_property(attrib, "font-style", "normal"),
+    )
+
+
+def split_line_pieces(line, granularity, writing_mode, base_font, metrics=None):
+    """
+    Divide a split line (<text> element) into words or characters
+    - granularity: "word" or "char"
+    - base_font:   FontKey of the original <text>
+    - metrics:     object with advance(text, font) / vertical_advance(text, font)
+    Returns list of new <text> elements, the position on the line is given by x (or y)
+    """
+    metrics = metrics or DEFAULT_METRICS
+    vertical = writing_mode != "horizontal-tb"
+    measure = metrics.vertical_advance if vertical else metrics.advance
+    axis = "y" if vertical else "x"
+
+    pieces = []
+    position = 0.0
+    for text, attrs in iter_runs(line):
+        font = font_key(attrs, base_font)
+        if granularity == "word":
+            tokens = ((m.start(), m.end()) for m in WORD_RE.finditer(text))
+        else:
+            tokens = ((start, end) for start, end in grapheme_spans(text) if not text[start].isspace())
+
+        cursor = 0
+        for start, end in tokens:
+            if start > cursor:
+                position += measure(text[cursor:start], font)  # the gap (white spaces)
+            piece_text = text[start:end]
+
+            node = ET.Element("text", line.attrib)
+            node.set(axis, str(position))
+            if attrs:
+                # the id of a <tspan> would be copied into every piece of it
+                tspan = ET.SubElement(node, "tspan", {k: v for k, v in attrs.items() if k != "id"})
+                tspan.text = piece_text
+            else:
+                node.text = piece_text
+            pieces.append(node)
+
+            position += measure(piece_text, font)
+            cursor = end
+        if cursor < len(text):
+            position += measure(text[cursor:], font)
+    return pieces
+
+
+def number_ids(pieces):
+    """ The pieces copy the id of their line, the 2nd and later get "<id>_<n>" (in place) """
+    counts = {}
+    for piece in pieces:
+        base = piece.get("id")
+        if not base:
+            continue
+        n = counts.get(base, 0)
+        counts[base] = n + 1
+        if n:
+            piece.set("id", f"{base}_{n}")
+    return pieces
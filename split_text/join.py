@@ -0,0 +1,214 @@
+# ======================================
+# Krita text split plug-in : join
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# The reverse of the split : many text shapes -> one <text> element with <tspan> lines.
+#
+# Each shape is split into its lines first (so multi line shapes can be joined too),
+# and every line gets its anchor point in the document : transform x (x, y) of the line. The anchors are sorted once by the
+# reading direction of the writing-mode (O(n log n)), then the lines on the same row
+# (Ex: the output of the word split) are collected in a single pass.
+# Each row becomes a <tspan> line, the distance to the previous row is its dy
+# (dx for vertical text), so the result stays at the place of the original shapes.
+
+import xml.etree.ElementTree as ET
+
+from .core import IDENTITY, split_svg_elements, matrix_to_svg_transform
+from .serialize import serialize_elements
+
+# Lines closer than this (x font size) in the block direction are on the same row
+ROW_TOLERANCE = 0.5
+
+# These attributes of a line are rebuilt by the join
+POSITION_KEYS = ("transform", "x", "y", "dx", "dy", "writing-mode")
+
+
+def float_attrib(element, key):
+    try:
+        return float(element.attrib.get(key, 0.0))
+    except ValueError:
+        return 0.0
+
+
+def invert_linear(m):
+    """ Inverse of the linear part (m11, m12, m21, m22) of a transform, None if it is singular """
+    det = m[0] * m[3] - m[1] * m[2]
+    if abs(det) < 1e-12:
+        return None
+    return (m[3] / det, -m[1] / det, -m[2] / det, m[0] / det)
+
+
+def reading_key(writing_mode):
+    """
+    (block, inline) coordinates of a point in the text frame
+    block : the direction of the line progression, inline : the direction of the glyphs
+    """
+    if writing_mode == "vertical-rl":
+        return lambda x, y: (-x, y)
+    if writing_mode == "vertical-lr":
+        return lambda x, y: (x, y)
+    return lambda x, y: (y, x)
+
+
+def root_position(svg_data, chunk_size=512):
+    """ (x, y) of the <text> element if it has x or y (Ex: a split line), else None """
+    parser = ET.XMLPullParser(("start",))
+    try:
+        for i in range(0, len(svg_data), chunk_size):
+            parser.feed(svg_data[i:i + chunk_size])
+            for _, element in parser.read_events():
+                if element.tag.rsplit("}", 1)[-1] != "text":
+                    continue  # Ex: <defs> of shape-inside
+                if "x" not in element.attrib and "y" not in element.attrib:
+                    return None
+                return (float_attrib(element, "x"), float_attrib(element, "y"))
+    except ET.ParseError:
+        pass
+    return None
+
+
+def collect_lines(snapshots):
+    """
+    Split the snapshots into lines
+    - snapshots: list of tuple (svg_data, transform) of the text shapes
+    Returns list of tuple (line element, anchor x, anchor y, linear part, font size)
+    The anchor is the line start mapped by the transform of the shape.
+    A <text> with its own x / y (Ex: the output of the split) has its first line there,
+    the split would place it one line step below the origin.
+    """
+    lines = []
+    for svg_data, transform in snapshots:
+        transform = tuple(transform or IDENTITY)
+        position = root_position(svg_data)
+        shift = None
+        for line in split_svg_elements(svg_data, transform):
+            x = float_attrib(line, "x")
+            y = float_attrib(line, "y")
+            if position is not None:
+                if shift is None:
+                    shift = (position[0] - x, position[1] - y)
+                x += shift[0]
+                y += shift[1]
+            ax = transform[0] * x + transform[2] * y + transform[4]
+            ay = transform[1] * x + transform[3] * y + transform[5]
+            lines.append((line, ax, ay, transform[:4], float_attrib(line, "font-size") or 12.0))
+    return lines
+
+
+def order_rows(lines, writing_mode, linear=(1.0, 0.0, 0.0, 1.0)):
+    """
+    Order the lines by the reading direction and group them into rows
+    - linear: linear part of the transform of the joined text, the reading direction follows it
+    Returns list of rows, a row is a list of tuple (line element, local x, local y)
+    local x, y are relative to the anchor of the first line
+    """
+    if not lines:
+        return []
+    inverse = invert_linear(linear) or (1.0, 0.0, 0.0, 1.0)
+    key = reading_key(writing_mode)
+
+    # The anchors in the frame of the joined text
+    placed = []
+    for line, ax, ay, _, size in lines:
+        lx = inverse[0] * ax + inverse[2] * ay
+        ly = inverse[1] * ax + inverse[3] * ay
+        block, inline = key(lx, ly)
+        placed.append((block, inline, lx, ly, size, line))
+    placed.sort(key=lambda p: (p[0], p[1]))
+
+    # Consecutive lines within the tolerance share a row (one pass)
+    rows = []
+    row = [placed[0]]
+    for p in placed[1:]:
+        if p[0] - row[0][0] <= row[0][4] * ROW_TOLERANCE:
+            row.append(p)
+        else:
+            rows.append(row)
+            row = [p]
+    rows.append(row)
+
+    origin_x, origin_y = rows[0][0][2], rows[0][0][3]
+    ordered = []
+    for row in rows:
+        row.sort(key=lambda p: p[1])  # by the inline direction
+        ordered.append([(p[5], p[2] - origin_x, p[3] - origin_y) for p in row])
+    return ordered
+
+
+def line_content(line, attrib):
+    """ <tspan> with the contents of a split line (the children are moved) """
+    if not line.text and len(line) == 1 and line[0].tag == "tspan" and not line[0].tail:
+        # A single <tspan> (the most case) : its attributes go to the line <tspan>
+        inner = line[0]
+        merged = dict(inner.attrib)
+        merged.update(attrib)
+        line = inner
+        attrib = merged
+    tspan = ET.Element("tspan", attrib)
+    tspan.text = line.text
+    for child in list(line):
+        tspan.append(child)
+    return tspan
+
+
+def number(value):
+    # short and stable numbers for the positions
+    value = round(value, 4)
+    return str(int(value)) if value == int(value) else str(value)
+
+
+def join_elements(snapshots, writing_mode=None):
+    """
+    Join text shapes into one <text> element
+    - snapshots:    list of tuple (svg_data, transform) of the text shapes
+    - writing_mode: reading direction, None : the writing-mode of the first shape
+    Returns the new <text> element, or None if there is no text
+    """
+    lines = collect_lines(snapshots)
+    if not lines:
+        return None
+
+    first_line, linear = lines[0][0], lines[0][3]
+    writing_mode = writing_mode or first_line.attrib.get("writing-mode", "horizontal-tb")
+    vertical = writing_mode != "horizontal-tb"
+    rows = order_rows(lines, writing_mode, linear)
+
+    # The joined text is placed at the anchor of the first line (in the reading order)
+    top_line = rows[0][0][0]
+    top = next(item for item in lines if item[0] is top_line)
+    matrix = (*linear, top[1], top[2])
+
+    root_attrib = {k: v for k, v in top_line.attrib.items() if k not in POSITION_KEYS}
+    root_attrib["transform"] = matrix_to_svg_transform(matrix)
+    root_attrib["writing-mode"] = writing_mode
+    root = ET.Element("text", root_attrib)
+
+    # inline axis (absolute in each row) and block axis (relative to the previous row)
+    inline_axis, block_axis = ("y", "dx") if vertical else ("x", "dy")
+    previous_block = 0.0
+    for row in rows:
+        for index, (line, lx, ly) in enumerate(row):
+            # only the attributes that differ from the joined <text> element
+            attrib = {k: v for k, v in line.attrib.items()
+                      if k not in POSITION_KEYS and root_attrib.get(k) != v}
+            attrib[inline_axis] = number(ly if vertical else lx)
+            if index == 0:
+                block = lx if vertical else ly
+                attrib[block_axis] = number(block - previous_block)
+                previous_block = block
+            root.append(line_content(line, attrib))
+    return root
+
+
+def join_svg(snapshots, writing_mode=None):
+    """
+    Join text shapes, the same as join_elements()
+    Returns the joined <text> element as a string ("" if there is no text)
+    """
+    root = join_elements(snapshots, writing_mode)
+    return serialize_elements([root]) if root is not None else ""
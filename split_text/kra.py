@@ -0,0 +1,184 @@
+# ======================================
+# Krita text split plug-in : .kra document tool
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# Split the text shapes of the vector layers inside .kra files without Krita.
+# A .kra is a zip archive, each vector layer is an SVG member
+# ("<name>/layers/layerN.shapelayer/content.svg"). The members are read from the archive
+# in memory (nothing is extracted to disk), split like split_text.batch, and a new archive
+# is written member by member. The files are processed in a process pool.
+#
+# Usage:
+#   python -m split_text.kra <file.kra | directory> ... [-o OUTPUT_DIR] [-j JOBS] [-r]
+#                            [-g line|word|char] [-b] [-c DIGITS [--group]] [--in-place]
+#
+# The output is written as "<name>.split.kra" next to the input (or into OUTPUT_DIR).
+# Note: mergedimage.png / preview.png are not rendered again, Krita updates them on the next save.
+
+import argparse
+import copy
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from .batch import split_svg_document
+from .glyphs import GRANULARITIES
+
+OUTPUT_SUFFIX = ".split.kra"
+VECTOR_MEMBER_RE = re.compile(r"/layers/[^/]+\.shapelayer/content\.svg$")
+
+
+def is_vector_member(name):
+    return VECTOR_MEMBER_RE.search(name) is not None
+
+
+def split_archive(src, dst, granularity="line", bake=False, compact=None, group=False):
+    """
+    Split the text of all vector layers of a .kra file
+    - src: input .kra path, dst: output path (written atomically, it can be the same as src)
+    Returns number of split <text> elements (the output is not written if it is 0)
+    """
+    count = 0
+    directory = os.path.dirname(os.path.abspath(dst))
+    fd, tmp = tempfile.mkstemp(suffix=".kra", dir=directory)
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(src) as zin, zipfile.ZipFile(tmp, "w") as zout:
+            infos = zin.infolist()
+            # "mimetype" must be the first member and not compressed
+            infos.sort(key=lambda info: info.filename != "mimetype")
+            for info in infos:
+                out_info = info
+                if info.filename == "mimetype":
+                    # a copy : the input member is still read with its own compression
+                    out_info = copy.copy(info)
+                    out_info.compress_type = zipfile.ZIP_STORED
+                if not is_vector_member(info.filename):
+                    # Pixel layers etc. : copied in chunks (not held in memory)
+                    with zin.open(info) as r, zout.open(out_info, "w", force_zip64=info.file_size > 0x7fffffff) as w:
+                        shutil.copyfileobj(r, w, 1024 * 1024)
+                    continue
+                data = zin.read(info)
+                output, n = split_svg_document(data, granularity, bake, compact, group)
+                if n:
+                    data = output.encode("utf-8")
+                    count += n
+                zout.writestr(info, data)
+        if count:
+            shutil.copymode(src, tmp)  # mkstemp makes it private
+            os.replace(tmp, dst)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return count
+
+
+def output_path_for(path, output_dir=None, in_place=False):
+    if in_place:
+        return path
+    base = os.path.basename(path)
+    name = base[:-4] if base.lower().endswith(".kra") else base
+    return os.path.join(output_dir or os.path.dirname(path), name + OUTPUT_SUFFIX)
+
+
+def process_file(job):
+    """
+    Worker : split one .kra file
+    job: tuple (input path, output path, granularity, bake, compact, group)
+    Returns tuple (input path, number of split texts, error message or None)
+    """
+    src, dst, granularity, bake, compact, group = job
+    try:
+        return src, split_archive(src, dst, granularity, bake, compact, group), None
+    except Exception as e:
+        return src, 0, f"{type(e).__name__}: {e}"
+
+
+def find_kra_files(paths, recursive=False):
+    files = []
+    for path in paths:
+        if os.path.isfile(path):
+            files.append(path)
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            for name in sorted(filenames):
+                if name.lower().endswith(".kra") and not name.endswith(OUTPUT_SUFFIX):
+                    files.append(os.path.join(dirpath, name))
+            if not recursive:
+                break
+    return files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m split_text.kra",
+        description="Split every multiple line text of the vector layers in .kra files.")
+    parser.add_argument("paths", nargs="+", help=".kra files or directories")
+    parser.add_argument("-o", "--output-dir", default=None,
+                        help="write results here (default: next to the input files)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: all cores)")
+    parser.add_argument("-r", "--recursive", action="store_true",
+                        help="also process the sub directories")
+    parser.add_argument("-g", "--granularity", choices=GRANULARITIES, default="line",
+                        help="split by line (default), word or character")
+    parser.add_argument("-b", "--bake", action="store_true",
+                        help="put the position of each line into its own transform")
+    parser.add_argument("-c", "--compact", type=int, default=None, metavar="DIGITS",
+                        help="compact output : round the numbers to DIGITS, drop the default attributes")
+    parser.add_argument("--group", action="store_true",
+                        help="with -c, put the lines of each text in one <g> (added as one group shape)")
+    parser.add_argument("--in-place", action="store_true",
+                        help="replace the input files (default: write <name>.split.kra)")
+    args = parser.parse_args(argv)
+    if args.group and args.compact is None:
+        parser.error("--group needs -c DIGITS")
+
+    files = find_kra_files(args.paths, args.recursive)
+    if not files:
+        print("No .kra files")
+        return 0
+    if args.output_dir and not args.in_place:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    jobs = [(path, output_path_for(path, args.output_dir, args.in_place), args.granularity, args.bake,
+             args.compact, args.group) for path in files]
+    workers = max(1, min(args.jobs, len(jobs)))
+    start = time.perf_counter()
+    texts = errors = 0
+
+    if workers == 1:
+        results = map(process_file, jobs)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        # One document per task, the documents are large
+        results = executor.map(process_file, jobs)
+
+    try:
+        for src, count, error in results:
+            if error:
+                errors += 1
+                print(f"Error: {src}: {error}", file=sys.stderr)
+            texts += count
+    finally:
+        if workers > 1:
+            executor.shutdown()
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(jobs)} files, {texts} texts split, {errors} errors "
+          f"in {elapsed:.2f} s ({workers} workers)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
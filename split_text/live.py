@@ -0,0 +1,165 @@
+# ======================================
+# Krita text split plug-in : live (linked) split
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# The live split keeps the source text (hidden) and links the split shapes to it by their names :
+#   source : "split-source-<link>"
+#   lines  : "split-line-<link>-<hash>-<n>"   (the SVG id, Krita uses it as the shape name)
+# <hash> is the hash of the line content without its position (x, y).
+# When the source is edited, it is split again and the lines are matched by the hashes :
+# the unchanged lines keep their shapes, only the changed lines are removed / added.
+# So a small fix in a long text is resynced with a few shapes.
+# A kept line that moved (Ex: a line inserted or wrapped above it) gets a new transform,
+# its content is not changed.
+
+import hashlib
+import re
+import uuid
+import xml.etree.ElementTree as ET
+from collections import defaultdict, deque
+
+from .core import IDENTITY, clone_without, split_svg_elements
+from .affine import bake_lines, coordinate, multiply_matrix, parse_svg_transform
+from .serialize import serialize_elements
+
+SOURCE_PREFIX = "split-source-"
+LINE_PREFIX = "split-line-"
+NAME_RE = re.compile(r"^split-(source|line)-([0-9a-f]+)(?:-([0-9a-f]+)-\d+)?$")
+# A kept line moves when its transform changes more than this
+MOVE_TOLERANCE = 1e-6
+
+
+def new_link_id():
+    return uuid.uuid4().hex[:12]
+
+
+def source_name(link):
+    return SOURCE_PREFIX + link
+
+
+def parse_name(name):
+    """
+    Link of a shape name
+    Returns tuple ("source", link, None) / ("line", link, hash), or None for the other shapes
+    """
+    m = NAME_RE.match(name or "")
+    if m is None or (m.group(1) == "line") != (m.group(3) is not None):
+        return None
+    return m.group(1), m.group(2), m.group(3)
+
+
+def line_hash(line):
+    """ Hash of a split line (<text> element), the position is not a part of it """
+    data = serialize_elements([clone_without(line, ("x", "y", "id"))])
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()[:16]
+
+
+def linked_lines(svg_data, link, transform=IDENTITY, metrics=None, bake=False):
+    """
+    Split the source text, each line gets its linked id
+    Returns list of tuple (hash, line element)
+    """
+    lines = split_svg_elements(svg_data, transform, metrics=metrics)
+    hashes = [line_hash(line) for line in lines]  # before the bake, it moves the position
+    if bake:
+        bake_lines(lines, transform)
+    name_lines(link, zip(hashes, lines))
+    return list(zip(hashes, lines))
+
+
+def name_lines(link, lines):
+    # the same lines get the numbers 0, 1, 2 ...
+    seen = defaultdict(int)
+    for h, line in lines:
+        line.set("id", f"{LINE_PREFIX}{link}-{h}-{seen[h]}")
+        seen[h] += 1
+
+
+class LinkedText:
+    """ A source shape and its split line shapes (the shapes are Krita shapes or anything) """
+    __slots__ = ("source", "lines")
+
+    def __init__(self):
+        self.source = None
+        self.lines = []  # (shape, hash)
+
+
+def index_links(shapes, name_of=lambda shape: shape.name()):
+    """
+    Index the linked shapes of a layer in one pass
+    Returns dict link -> LinkedText
+    """
+    links = defaultdict(LinkedText)
+    for shape in shapes:
+        parsed = parse_name(name_of(shape))
+        if parsed is None:
+            continue
+        kind, link, h = parsed
+        if kind == "source":
+            links[link].source = shape
+        else:
+            links[link].lines.append((shape, h))
+    return dict(links)
+
+
+def line_position(line):
+    """ (x, y) of a line : the first x / y of the <text> element or of its <tspan> """
+    for element in line.iter():
+        if "x" in element.attrib or "y" in element.attrib:
+            return coordinate(element, "x"), coordinate(element, "y")
+    return 0.0, 0.0
+
+
+def svg_position(svg_data):
+    """ line_position() of the SVG of a line shape, (0, 0) if it is not readable """
+    try:
+        return line_position(ET.fromstring(svg_data))
+    except ET.ParseError:
+        return 0.0, 0.0
+
+
+def placed_transform(line, position):
+    """
+    The transform of a line shape whose content is at position (x, y),
+    so that it is drawn at the place of the new line element
+    """
+    x, y = line_position(line)
+    return multiply_matrix(parse_svg_transform(line.get("transform")),
+                           (1.0, 0.0, 0.0, 1.0, x - position[0], y - position[1]))
+
+
+def plan_resync(new_lines, old_lines, placement_of=None):
+    """
+    Match the lines of the edited source with the existing line shapes by their hashes
+    - new_lines: list of tuple (hash, line element) (see linked_lines)
+    - old_lines: list of tuple (shape, hash)
+    - placement_of: function(shape) -> tuple (transform, (x, y)) : the absolute transform of a line
+                    shape and the position of its content, None : the kept shapes are not moved
+    Returns tuple (kept shapes, line elements to add, shapes to remove, moves)
+    moves: list of tuple (shape, transform) of the kept shapes whose line is at another place
+    """
+    available = defaultdict(deque)
+    for shape, h in old_lines:
+        available[h].append(shape)
+    kept = []
+    added = []
+    moves = []
+    for h, line in new_lines:
+        if not available[h]:
+            added.append(line)
+            continue
+        shape = available[h].popleft()
+        kept.append(shape)
+        if placement_of is None:
+            continue
+        transform, position = placement_of(shape)
+        m = placed_transform(line, position)
+        if any(abs(a - b) > MOVE_TOLERANCE for a, b in zip(m, transform)):
+            moves.append((shape, m))
+    removed = [shape for shapes in available.values() for shape in shapes]
+    return kept, added, removed, moves
@@ -0,0 +1,105 @@
+# ======================================
+# Krita text split plug-in : worker pool
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the 
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# Split snapshots (SVG string + transform) in worker processes.
+# Only shape.toSvg() / absoluteTransformation() need Krita's main thread,
+# the parsing, offset calculation and serialization are pure Python (core.py).
+
+import atexit
+import multiprocessing
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from .core import split_svg
+
+WORKERS = os.cpu_count() or 1
+
+_executor = None
+
+
+def split_job(job):
+    """
+    Worker : job is tuple (svg_data, transform, granularity[, metrics[, bake[, compact[, group]]]])
+    metrics is a picklable metrics object (Ex: glyphs.SpacingTable) or None,
+    transform None gives a template (see core.apply_transform)
+    Returns the split output string
+    """
+    svg_data, transform, granularity, *rest = job
+    metrics = rest[0] if rest else None
+    bake = rest[1] if len(rest) > 1 else False
+    compact = rest[2] if len(rest) > 2 else None
+    group = rest[3] if len(rest) > 3 else False
+    return split_svg(svg_data, transform, granularity=granularity, metrics=metrics, bake=bake, compact=compact,
+                     group=group)
+
+
+def find_interpreter():
+    """
+    A Python interpreter of the same version as this one, or None
+    In Krita (embedded Python), sys.executable is the application itself.
+    """
+    version = f"{sys.version_info[0]}.{sys.version_info[1]}"
+    candidates = [
+        os.path.join(sys.base_exec_prefix, "python.exe"),  # Windows
+        os.path.join(sys.base_exec_prefix, "bin", f"python{version}"),
+        shutil.which(f"python{version}"),
+    ]
+    for path in candidates:
+        if path and os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+    return None
+
+
+def pool_context():
+    """
+    The multiprocessing context for the workers, or None if processes can not be used here
+    The workers are always spawned : Krita is a multi threaded Qt process, a fork of it
+    can deadlock in the child. Inside Krita a real Python interpreter is needed for
+    the workers, without it the split runs serially.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    name = os.path.basename(sys.executable or "").lower()
+    if name.startswith("python"):
+        return ctx
+    interpreter = find_interpreter()
+    if interpreter is None:
+        return None
+    ctx.set_executable(interpreter)
+    return ctx
+
+
+def shared_executor(workers=None):
+    """
+    The process pool shared by all runs (the start up cost is paid once), or None
+    """
+    global _executor
+    if _executor is None:
+        workers = workers or WORKERS
+        ctx = pool_context()
+        if workers <= 1 or ctx is None:
+            return None
+        try:
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+        except (OSError, ValueError) as e:
+            print("split_text: worker pool is not available:", e)
+            return None
+    return _executor
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+atexit.register(shutdown_executor)
+
@@ -0,0 +1,158 @@
+# ======================================
+# Krita text split plug-in : timing / profiling
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the 
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# Per stage timings and counters of each run.
+#
+#   SPLIT_TEXT_PROFILE=1         record the stages, write a JSON trace after each run
+#   SPLIT_TEXT_PROFILE=cprofile  and also a cProfile report
+#   SPLIT_TEXT_PROFILE_DIR=...   output directory (default: temp directory)
+#
+# When it is off, stage() returns one shared no-op context, and count() returns at once.
+
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import tempfile
+import time
+
+ENV_VAR = "SPLIT_TEXT_PROFILE"
+ENV_DIR = "SPLIT_TEXT_PROFILE_DIR"
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class _Stage:
+    __slots__ = ("recorder", "name", "start")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Recorder:
+    """
+    Records stage timings (sec.) and counters (shapes, lines, bytes ...) of a run
+    mode: "" (off), "trace" or "cprofile"
+    """
+    def __init__(self, mode="", output_dir=None):
+        self.output_dir = output_dir
+        self.configure(mode)
+        self.runs = []
+        self._reset()
+
+    @classmethod
+    def from_env(cls):
+        return cls(os.environ.get(ENV_VAR, ""), os.environ.get(ENV_DIR) or None)
+
+    def configure(self, mode):
+        mode = (mode or "").strip().lower()
+        if mode in ("", "0", "off", "false", "no"):
+            mode = ""
+        elif mode != "cprofile":
+            mode = "trace"
+        self.mode = mode
+        self.enabled = bool(mode)
+
+    def _reset(self):
+        self.label = None
+        self.started = None
+        self.times = {}
+        self.calls = {}
+        self.counts = {}
+        self.profile = None
+
+    # --- recording ---
+
+    def stage(self, name):
+        """ with recorder.stage("parse"): ... """
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return _Stage(self, name)
+
+    def add_time(self, name, seconds):
+        self.times[name] = self.times.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counts[name] = self.counts.get(name, 0) + n
+
+    # --- runs ---
+
+    def begin_run(self, label="split"):
+        if not self.enabled:
+            return
+        self._reset()
+        self.label = label
+        self.started = time.perf_counter()
+        if self.mode == "cprofile":
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    def end_run(self):
+        """ Finish the run, write the trace (and report). Returns the summary dict or None """
+        if not self.enabled or self.started is None:
+            return None
+        if self.profile is not None:
+            self.profile.disable()
+
+        summary = {
+            "label": self.label,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "total_ms": (time.perf_counter() - self.started) * 1000,
+            "stages": {
+                name: {"ms": t * 1000, "calls": self.calls[name]}
+                for name, t in sorted(self.times.items(), key=lambda item: -item[1])
+            },
+            "counts": dict(self.counts),
+        }
+        self.runs.append(summary)
+
+        base = self._output_base()
+        self.dump_json(base + ".json", summary)
+        print(f"split_text: trace {base}.json")
+        if self.profile is not None:
+            self.dump_profile(base + ".prof.txt")
+            print(f"split_text: cProfile report {base}.prof.txt")
+        self.started = None
+        return summary
+
+    def _output_base(self):
+        directory = self.output_dir or tempfile.gettempdir()
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return os.path.join(directory, f"split_text_{self.label}_{stamp}_{len(self.runs)}")
+
+    def dump_json(self, path, summary=None):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary if summary is not None else self.runs, f, indent=2)
+
+    def dump_profile(self, path, limit=40):
+        if self.profile is None:
+            return
+        out = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=out)
+        stats.sort_stats("cumulative").print_stats(limit)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(out.getvalue())
+
+
+# The recorder of this process
+PROFILER = Recorder.from_env()
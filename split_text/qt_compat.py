@@ -18,49 +18,92 @@ except AttributeError:
     # Krita 6.x -> qVersion() does NOT exist
     qt_major = 6
 
-if qt_major >= 6:
-    # --- PyQt6 Branch ---#Qt6 QAction -> QtGui
-    from PyQt6 import QtCore, QtGui, QtWidgets, uic
-    from PyQt6.QtCore import (
-            Qt, QEvent, QObject, pyqtSignal, pyqtSlot, QTimer, QPointF, QRectF, QSize,QPoint, QFile,QIODevice
-        )
-
-    from PyQt6.QtCore import QSignalBlocker
-    from PyQt6.QtGui import QCursor, QPalette, QFont, QFontMetrics,QColor, QIcon,QClipboard,QTextCursor,QGuiApplication, QAction , QPainter, QPen,QTransform, QIntValidator,QImage, QPixmap
-    QFontMetricsF = QFontMetrics
-    from PyQt6.QtWidgets import (
-            QApplication, QDialog, QTextEdit, QVBoxLayout, QPushButton, QSlider,QLineEdit,QFormLayout,
-            QRadioButton, QButtonGroup, QLabel, QHBoxLayout, QMessageBox,QSpinBox,QCheckBox,QComboBox,
-            QFrame, QSizePolicy, QAbstractSpinBox, QColorDialog,QDockWidget,QWidget,QFileDialog,QDoubleSpinBox
-        )
-    try:
-        from PyQt6.QtCore import QMimeDatabase # Does it found in PyQt6 QtCore?
-    except ImportError:
-        try:
-            from PyQt6.QtGui import QMimeDatabase
-        except ImportError:
-            QMimeDatabase = None
+# The Qt symbols are resolved lazily on first use (module __getattr__),
+# so loading the plug-in does not import uic, QMimeDatabase ... at Krita startup.
+# After the first access a symbol is a plain module global.
+
+import importlib
+from functools import lru_cache
+
+QT_PACKAGE = "PyQt6" if qt_major >= 6 else "PyQt5"
+
+_CORE = (
+    "Qt", "QEvent", "QObject", "pyqtSignal", "pyqtSlot", "QTimer", "QPointF", "QRectF", "QSize",
+    "QSignalBlocker", "QPoint", "QFile", "QIODevice",
+)
+_GUI = (
+    "QCursor", "QPalette", "QFont", "QFontMetrics", "QFontMetricsF", "QColor", "QIcon", "QClipboard",
+    "QTextCursor", "QGuiApplication", "QPainter", "QPen", "QTransform", "QIntValidator", "QImage", "QPixmap",
+)
+_WIDGETS = (
+    "QApplication", "QDialog", "QTextEdit", "QVBoxLayout", "QPushButton", "QSlider", "QLineEdit", "QFormLayout",
+    "QRadioButton", "QButtonGroup", "QLabel", "QHBoxLayout", "QMessageBox", "QSpinBox", "QCheckBox", "QComboBox",
+    "QFrame", "QSizePolicy", "QAbstractSpinBox", "QColorDialog", "QDockWidget", "QWidget", "QFileDialog",
+    "QDoubleSpinBox", "QProgressDialog",
+)
+
+# name -> candidate (submodule, attribute), the first one found is used
+_SYMBOLS = {}
+for _name in _CORE:
+    _SYMBOLS[_name] = (("QtCore", _name),)
+for _name in _GUI:
+    _SYMBOLS[_name] = (("QtGui", _name),)
+for _name in _WIDGETS:
+    _SYMBOLS[_name] = (("QtWidgets", _name),)
 
+if qt_major >= 6:
+    # Qt6 QAction -> QtGui
+    _SYMBOLS["QAction"] = (("QtGui", "QAction"),)
+    _SYMBOLS["QFontMetricsF"] = (("QtGui", "QFontMetrics"),)
+    _SYMBOLS["QMimeDatabase"] = (("QtCore", "QMimeDatabase"), ("QtGui", "QMimeDatabase"))
 else:
-    # --- PyQt5 Branch ---
-    from PyQt5 import QtCore, QtGui, QtWidgets
-    from PyQt5 import uic # PyQt5 uic 
-    from PyQt5.QtCore import (
-            Qt, QEvent, QObject, pyqtSignal, pyqtSlot, QTimer, QPointF, QRectF, QSize,
-            QSignalBlocker,QPoint, QFile,QIODevice
-        )
-    # PyQt5 has QFontMetrics and -F
-    from PyQt5.QtGui import QCursor, QPalette, QFont,QFontMetrics, QFontMetricsF, QColor, QIcon,QClipboard,QTextCursor, QGuiApplication,QPainter, QPen,QTransform, QIntValidator,QImage, QPixmap
     # PyQt5  QAction exist in QtWidgets
-    from PyQt5.QtWidgets import (
-            QApplication, QDialog, QTextEdit, QVBoxLayout, QPushButton, QSlider,QLineEdit,QFormLayout,
-            QRadioButton, QButtonGroup, QLabel, QHBoxLayout, QMessageBox,QSpinBox,QCheckBox,QComboBox,
-            QAction, QFrame, QSizePolicy, QAbstractSpinBox, QColorDialog,QDockWidget,QWidget,QFileDialog,QDoubleSpinBox
-        )
+    _SYMBOLS["QAction"] = (("QtWidgets", "QAction"),)
+    _SYMBOLS["QMimeDatabase"] = (("QtCore", "QMimeDatabase"),)
+
+_MODULES = ("QtCore", "QtGui", "QtWidgets", "uic")
+
+
+def _resolve(name):
+    if name in _MODULES:
+        return importlib.import_module(f"{QT_PACKAGE}.{name}")
+    if name == "SafeQtWidgets":
+        # Use SafeQtWidgets to avoid polluting the global QtWidgets
+        return CompatQtWidgets(_symbol("QtWidgets"), _symbol("QAction"))
+    for module_name, attr in _SYMBOLS[name]:
+        try:
+            return getattr(importlib.import_module(f"{QT_PACKAGE}.{module_name}"), attr)
+        except (ImportError, AttributeError):
+            continue
+    if name == "QMimeDatabase":
+        return None
+    raise ImportError(f"cannot import {name} from {QT_PACKAGE}")
+
+
+def __getattr__(name):
+    if name not in _SYMBOLS and name not in _MODULES and name != "SafeQtWidgets":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = _resolve(name)
+    globals()[name] = value  # the next access does not come here
+    return value
+
+
+def _symbol(name):
+    """ Resolved symbol (from the module globals after the first time) """
     try:
-        from PyQt5.QtCore import QMimeDatabase
-    except ImportError:
-        QMimeDatabase = None
+        return globals()[name]
+    except KeyError:
+        return __getattr__(name)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SYMBOLS) | set(_MODULES) | {"SafeQtWidgets"})
+
+
+def preload():
+    """ Resolve all symbols at once (the old eager behavior, for the import benchmark) """
+    for name in (*_MODULES, *_SYMBOLS, "SafeQtWidgets"):
+        _symbol(name)
 
 # ---  Compatibility Core ---
 def qt_event(name):
@@ -73,7 +116,7 @@ def qt_event(name):
         if name in map_qt5_to_qt6:
             name = map_qt5_to_qt6[name]
 
-        return qt_enum(QEvent, "Type", name)
+        return qt_enum(_symbol("QEvent"), "Type", name)
 
     else:
         # Qt6 → Qt5 （Qt5 has not ApplicationActivate  ）
@@ -84,12 +127,13 @@ def qt_event(name):
         if name in map_qt6_to_qt5:
             name = map_qt6_to_qt5[name]
 
-        return getattr(QEvent, name)
+        return getattr(_symbol("QEvent"), name)
 
 
 
+@lru_cache(maxsize=None)
 def qt_enum(base, group, name):
-    """Bridge for Enum differences between Qt5 and Qt6"""
+    """Bridge for Enum differences between Qt5 and Qt6 (memoized)"""
     if hasattr(base, group):  # Qt6 (Nested Enums)
         res = getattr(getattr(base, group), name)
     else:                     # Qt5 (Flat Enums)
@@ -105,22 +149,33 @@ class CompatQtWidgets:
         self.__dict__.update(real_widgets.__dict__)
         self.QAction = qaction_class
 
-# Use SafeQtWidgets to avoid polluting the global QtWidgets
-SafeQtWidgets = CompatQtWidgets(QtWidgets, QAction)
-
 class QtConstant:
-    """Helper to access Enums with dot notation"""
+    """
+    Helper to access Enums with dot notation
+    base is the name of the Qt class, it is resolved on first use.
+    A resolved enum is stored on the instance, so the next access is a plain attribute.
+    """
     def __init__(self, base, group):
-        self.base = base
+        self.base_name = base
         self.group = group
 
     def __getattr__(self, name):
-        return qt_enum(self.base, self.group, name)
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name == "base":
+            res = _symbol(self.base_name)
+        else:
+            res = qt_enum(self.base, self.group, name)
+        self.__dict__[name] = res
+        return res
 
     def __call__(self, value):
         """Return Enum class(value) for Qt6, or raw int for Qt5"""
-        if hasattr(self.base, self.group):  # Qt6
-            enum_class = getattr(self.base, self.group)
+        enum_class = self.__dict__.get("_enum_class", False)
+        if enum_class is False:
+            enum_class = getattr(self.base, self.group, None)  # None : Qt5
+            self.__dict__["_enum_class"] = enum_class
+        if enum_class is not None:  # Qt6
             return enum_class(value)
         else:  # Qt5
             return value
@@ -128,32 +183,29 @@ class QtConstant:
 # ---   Unified Constants (QC) ---
 class QtEnums:
     """Namespace for Enums to prevent naming conflicts"""
-    Policy = QtConstant(QSizePolicy, "Policy")
-    Role   = QtConstant(QPalette, "ColorRole")
-    Cursor = QtConstant(Qt, "CursorShape")
-    Window = QtConstant(Qt, "WindowType")
-    Shape  = QtConstant(QFrame, "Shape")
-    Shadow = QtConstant(QFrame, "Shadow")
-    SpinButton = QtConstant(QAbstractSpinBox, "ButtonSymbols")
-    StdBtn = QtConstant(QMessageBox, "StandardButton")# Ok button etc
-    BtnRole = QtConstant(QMessageBox, "ButtonRole")# yes/no buttona
-    CheckState = QtConstant(Qt, "CheckState")
-    DockArea = QtConstant(Qt, "DockWidgetArea")
-    TransformMode = QtConstant(Qt, "TransformationMode")
-    FontWeight = QtConstant(QFont, "Weight")
-    Align = QtConstant(Qt, "AlignmentFlag")
-    ImgFormat = QtConstant(QImage, "Format")
-    TextMove = QtConstant(QTextCursor, "MoveOperation")
-    IO = QtConstant(QIODevice, "OpenModeFlag") # Qt6:OpenModeFlag、Qt5:QIODevice
+    Policy = QtConstant("QSizePolicy", "Policy")
+    Role   = QtConstant("QPalette", "ColorRole")
+    Cursor = QtConstant("Qt", "CursorShape")
+    Window = QtConstant("Qt", "WindowType")
+    Shape  = QtConstant("QFrame", "Shape")
+    Shadow = QtConstant("QFrame", "Shadow")
+    SpinButton = QtConstant("QAbstractSpinBox", "ButtonSymbols")
+    StdBtn = QtConstant("QMessageBox", "StandardButton")# Ok button etc
+    BtnRole = QtConstant("QMessageBox", "ButtonRole")# yes/no buttona
+    CheckState = QtConstant("Qt", "CheckState")
+    DockArea = QtConstant("Qt", "DockWidgetArea")
+    TransformMode = QtConstant("Qt", "TransformationMode")
+    FontWeight = QtConstant("QFont", "Weight")
+    Align = QtConstant("Qt", "AlignmentFlag")
+    ImgFormat = QtConstant("QImage", "Format")
+    TextMove = QtConstant("QTextCursor", "MoveOperation")
+    IO = QtConstant("QIODevice", "OpenModeFlag") # Qt6:OpenModeFlag、Qt5:QIODevice
+    Modality = QtConstant("Qt", "WindowModality")
+    WidgetAttr = QtConstant("Qt", "WidgetAttribute")
 
 QC = QtEnums()
 
 # ---  Helper Functions ---
-def qt_exec(dialog):
-    """Unified exec() for Dialogs"""
-    return int(dialog.exec()) if hasattr(dialog, "exec") else int(dialog.exec_())
-
-
 def qt_exec(dialog):
     """Unified exec() for Dialogs (Python 3.10 - 3.13 compatible)"""
     # Handle the rename of exec_() to exec() in PyQt6
@@ -222,30 +274,8 @@ def get_text_height(metrics, text):
 
 def qt_load_ui(ui_path):
     """Compatibility loader for .ui files"""
-    import krita
     try:
-        from PyQt6 import uic
-        form_class, base_class = uic.loadUiType(ui_path)
-        widget = base_class()
-        form = form_class()
-        form.setupUi(widget)
-        return widget
-    except ImportError:
-        # Fallback for Krita 5.x / Qt5
-        form_class, _ = krita.Krita.instance().loadUI(ui_path)
-        return form_class()
-
-
-def qt_load_ui(ui_path):
-    """Compatibility loader for .ui files"""
-    from .qt_compat import qt_major
-    
-    try:
-        if qt_major >= 6:
-            from PyQt6 import uic
-        else:
-            from PyQt5 import uic
-        return uic.loadUi(ui_path)
+        return _symbol("uic").loadUi(ui_path)
         
     except Exception as e:
         print(f"Failed to load UI: {ui_path}, error: {e}")
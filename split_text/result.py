@@ -0,0 +1,239 @@
+# ======================================
+# Krita text split plug-in : split result
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# A compact form of the split lines for scripts (positions, texts, bounding boxes)
+# without parsing the SVG output again. SVG is made from it only when it is asked.
+# The records are made from the split <text> elements (SplitResult.from_elements) and
+# to_svg() builds the elements again : it does not lower the peak memory of a split,
+# the plug-in and the batch tools use the elements directly.
+#
+# One LineRecord (__slots__) per line :
+#   x, y    : position attributes (strings as written, x_value / y_value for floats)
+#   attrs   : attribute items of the line, shared by the lines with the same attributes
+#   content : the text and <tspan> tree as nested tuples (tag, attrs, text, children, tail)
+# The attribute items are interned in the result, so the lines of one text share one copy.
+
+import xml.etree.ElementTree as ET
+
+from .affine import IDENTITY, parse_svg_transform
+from .glyphs import DEFAULT_METRICS, FontKey, font_key, merge_attrib
+from .serialize import serialize_elements, write_elements
+from .style import style_length, style_property
+from .units import to_pt
+
+# The position attributes are kept in the records, the items only keep their order
+POSITION = None
+
+
+class LineRecord:
+    __slots__ = ("x", "y", "attrs", "content")
+
+    def __init__(self, x, y, attrs, content):
+        self.x = x
+        self.y = y
+        self.attrs = attrs
+        self.content = content
+
+    @property
+    def x_value(self):
+        return float(self.x) if self.x is not None else 0.0
+
+    @property
+    def y_value(self):
+        return float(self.y) if self.y is not None else 0.0
+
+    @property
+    def attrib(self):
+        """ The attributes of the line <text> element (a new dict) """
+        attrib = dict(self.attrs)
+        if self.x is not None:
+            attrib["x"] = self.x
+        if self.y is not None:
+            attrib["y"] = self.y
+        return attrib
+
+    @property
+    def text(self):
+        """ The plain text of the line """
+        parts = []
+        _collect_text(self.content, parts)
+        return "".join(parts)
+
+    def runs(self):
+        """ Yields tuple (text, merged <tspan> attributes) like glyphs.iter_runs """
+        yield from _iter_runs(self.content, {})
+
+    def bbox(self, metrics=None, base_font=None):
+        """
+        Bounding box (x0, y0, x1, y1) of the line in the coordinates of the text (before transform)
+        - metrics: object with advance(text, font) (see glyphs.py), None : approximation
+        The height is one em above the baseline (ascent) and 0.2 em below it.
+        """
+        metrics = metrics or DEFAULT_METRICS
+        attrib = self.attrib
+        if base_font is None:
+            # the attribute or the style, with unit (Ex: "16px")
+            size, unit = style_length(attrib, "font-size", 12.0, "pt")
+            if unit != "pt":
+                size = to_pt(size, unit, size)
+            base_font = FontKey(style_property(attrib, "font-family", "sans-serif"), size, "normal", "normal")
+        vertical = attrib.get("writing-mode", "horizontal-tb") != "horizontal-tb"
+        measure = metrics.vertical_advance if vertical else metrics.advance
+        advance = 0.0
+        size = base_font.size
+        for text, attrs in self.runs():
+            font = font_key(attrs, base_font)
+            advance += measure(text, font)
+            size = max(size, font.size)
+        x, y = self.x_value, self.y_value
+        if vertical:
+            return (x - size * 0.5, y, x + size * 0.5, y + advance)
+        return (x, y - size, x + advance, y + size * 0.2)
+
+    def to_element(self):
+        """ The line as a new <text> element """
+        node = ET.Element("text", {k: (self.x if k == "x" else self.y) if v is POSITION else v
+                                   for k, v in self.attrs})
+        text, children = self.content
+        node.text = text
+        for child in children:
+            node.append(_build(child))
+        return node
+
+    def __repr__(self):
+        return f"LineRecord(x={self.x!r}, y={self.y!r}, text={self.text!r})"
+
+
+class SplitResult:
+    """
+    The lines of one split text
+    - transform: 6 values (m11, m12, m21, m22, dx, dy) given to the split
+    Use to_svg() for the same string as core.split_svg()
+    """
+    __slots__ = ("lines", "transform", "_interned")
+
+    def __init__(self, transform=None):
+        self.lines = []
+        self.transform = transform
+        self._interned = {}
+
+    @classmethod
+    def from_elements(cls, elements, transform=None):
+        """ Build from split <text> elements (the elements are not kept) """
+        result = cls(transform)
+        for element in elements:
+            result.add_element(element)
+        return result
+
+    def intern(self, items):
+        return self._interned.setdefault(items, items)
+
+    def add_element(self, element):
+        items = self.intern(tuple((k, POSITION if k in ("x", "y") else v) for k, v in element.attrib.items()))
+        content = (element.text, tuple(self._node(child) for child in element))
+        self.lines.append(LineRecord(element.get("x"), element.get("y"), items, content))
+
+    def _node(self, element):
+        attrs = self.intern(tuple(element.attrib.items()))
+        return (element.tag, attrs, element.text,
+                tuple(self._node(child) for child in element), element.tail)
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __iter__(self):
+        return iter(self.lines)
+
+    def __getitem__(self, index):
+        return self.lines[index]
+
+    def __bool__(self):
+        return bool(self.lines)
+
+    @property
+    def texts(self):
+        return [line.text for line in self.lines]
+
+    @property
+    def positions(self):
+        """ list of tuple (x, y) of the lines in the coordinates of the text """
+        return [(line.x_value, line.y_value) for line in self.lines]
+
+    def document_positions(self):
+        """
+        The positions in the document coordinates
+        A line is mapped by its own transform attribute (the absolute transform, or the baked
+        matrix with the position), the transform of the result is used for a line without it.
+        """
+        default = self.transform or IDENTITY
+        matrices = {}  # the lines of one text share the transform string
+        positions = []
+        for line in self.lines:
+            value = dict(line.attrs).get("transform")
+            if value is None:
+                m = default
+            else:
+                m = matrices.get(value)
+                if m is None:
+                    m = matrices[value] = parse_svg_transform(value)
+            x, y = line.x_value, line.y_value
+            positions.append((m[0] * x + m[2] * y + m[4], m[1] * x + m[3] * y + m[5]))
+        return positions
+
+    def bboxes(self, metrics=None):
+        return [line.bbox(metrics) for line in self.lines]
+
+    def to_elements(self):
+        return [line.to_element() for line in self.lines]
+
+    def to_svg(self, separator="\n"):
+        return serialize_elements(self.to_elements(), separator)
+
+    def write(self, write, separator="\n"):
+        """ Serialize with write(str) (Ex: into a SvgDocumentWriter buffer) """
+        write_elements(self.to_elements(), write, separator)
+
+    def __str__(self):
+        return self.to_svg()
+
+
+def _build(node):
+    tag, attrs, text, children, tail = node
+    element = ET.Element(tag, dict(attrs))
+    element.text = text
+    element.tail = tail
+    for child in children:
+        element.append(_build(child))
+    return element
+
+
+def _text_children(content):
+    # line content : (text, children), node : (tag, attrs, text, children, tail)
+    return (content[0], content[1]) if len(content) == 2 else (content[2], content[3])
+
+
+def _collect_text(content, parts):
+    text, children = _text_children(content)
+    if text:
+        parts.append(text)
+    for child in children:
+        _collect_text(child, parts)
+        if child[4]:
+            parts.append(child[4])
+
+
+def _iter_runs(content, attrs):
+    text, children = _text_children(content)
+    if text:
+        yield text, attrs
+    for child in children:
+        child_attrs = merge_attrib(attrs, dict(child[1])) if child[1] else attrs
+        yield from _iter_runs(child, child_attrs)
+        if child[4]:
+            yield child[4], attrs
@@ -0,0 +1,170 @@
+# ======================================
+# Krita text split plug-in : SVG serializer
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the 
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# Write split <text> elements straight into one buffer (or any writer) in a single pass.
+# The output is the same as ET.tostring(), but the repeated attribute values
+# (transform, style ...) are escaped once and reused.
+
+import io
+import re
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+
+ATTRIB_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=ATTRIB_CACHE_SIZE)
+def escape_attrib(value):
+    """ Escaped attribute value (cached, same rule as ElementTree) """
+    if "&" in value:
+        value = value.replace("&", "&amp;")
+    if "<" in value:
+        value = value.replace("<", "&lt;")
+    if ">" in value:
+        value = value.replace(">", "&gt;")
+    if "\"" in value:
+        value = value.replace("\"", "&quot;")
+    if "\r" in value:
+        value = value.replace("\r", "&#13;")
+    if "\n" in value:
+        value = value.replace("\n", "&#10;")
+    if "\t" in value:
+        value = value.replace("\t", "&#09;")
+    return value
+
+
+def escape_text(text):
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def write_element(elem, write):
+    """
+    Serialize an element (and children) with write(str)
+    The tail of elem is not written (same as the top element of ET.tostring)
+    """
+    tag = elem.tag
+    if not isinstance(tag, str) or tag.startswith("{") or \
+            any(k.startswith("{") for k in elem.attrib):
+        # Comment, namespaced tag / attribute (Ex: krita:useRichText) etc. : leave it to ElementTree
+        tail, elem.tail = elem.tail, None
+        write(ET.tostring(elem, encoding="unicode"))
+        elem.tail = tail
+        return
+
+    write("<" + tag)
+    for k, v in elem.attrib.items():
+        write(" " + k + "=\"" + escape_attrib(v) + "\"")
+    text = elem.text
+    if text or len(elem):
+        write(">")
+        if text:
+            write(escape_text(text))
+        for child in elem:
+            write_element(child, write)
+            if child.tail:
+                write(escape_text(child.tail))
+        write("</" + tag + ">")
+    else:
+        write(" />")
+
+
+def write_elements(elements, write, separator="\n"):
+    """ Serialize the elements with separator between them """
+    first = True
+    for elem in elements:
+        if not first:
+            write(separator)
+        first = False
+        write_element(elem, write)
+
+
+def serialize_elements(elements, separator="\n"):
+    """ The elements -> one string """
+    buffer = io.StringIO()
+    write_elements(elements, buffer.write, separator)
+    return buffer.getvalue()
+
+
+TEXT_START_RE = re.compile(r'<text[\s/>]')
+
+def count_text_elements(part):
+    """ Number of <text> elements in a serialized output (they are never nested) """
+    return len(TEXT_START_RE.findall(part))
+
+
+class SvgDocumentWriter:
+    """
+    Write split outputs into <svg> documents for addShapesFromSvg()
+    - svg_scale: attributes of <svg> element (width, height, viewBox)
+    - max_size:  upper limit of characters per document (None : no limit, 0 : one document per group)
+    A group (the output of one shape) is never divided between documents.
+    """
+    def __init__(self, svg_scale="", max_size=None):
+        self.head = "<svg " + svg_scale + ">"
+        self.tail = "</svg>"
+        self.max_size = max_size
+        self.completed = []
+        self.buffer = None
+        self.size = 0
+        self.groups = 0
+        self.elements = 0  # number of written <text> elements (for the stats)
+
+    def _begin_group(self, size_hint):
+        if self.buffer is not None and self.max_size is not None and \
+                self.size + size_hint > self.max_size:
+            self._finish()
+        if self.buffer is None:
+            self.buffer = io.StringIO()
+            self.buffer.write(self.head)
+            self.size = len(self.head) + len(self.tail)
+        elif self.groups:
+            self._write("\n")
+
+    def _write(self, s):
+        self.size += len(s)
+        self.buffer.write(s)
+
+    def _finish(self):
+        self.buffer.write(self.tail)
+        self.completed.append(self.buffer.getvalue())
+        self.buffer = None
+        self.groups = 0
+
+    def write_elements(self, elements):
+        """ Add the elements of one shape """
+        if not elements:
+            return
+        # The size is unknown before writing, the limit is checked with the current size
+        self._begin_group(0)
+        write_elements(elements, self._write)
+        self.groups += 1
+        # the lines of a grouped compact output are in a <g> element
+        self.elements += sum(len(el) if el.tag == "g" else 1 for el in elements)
+
+    def write_text(self, part):
+        """ Add an already serialized output of one shape """
+        if not part:
+            return
+        self._begin_group(len(part) + 1)
+        self._write(part)
+        self.groups += 1
+        self.elements += count_text_elements(part)
+
+    def documents(self):
+        """ Finish and return list of SVG document strings """
+        if self.buffer is not None:
+            self._finish()
+        documents, self.completed = self.completed, []
+        return documents
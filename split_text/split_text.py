@@ -16,355 +16,640 @@
 
 # v0.7 : Qt6 / Qt5 Compatible(alpha)
 
-import xml.etree.ElementTree as ET
-import re, math, time
+import math, time, os
+from concurrent.futures import Future
 
 import krita
 from krita import *
-from .qt_compat import qt_exec,QC
-from .qt_compat import (
-    QEvent, QColor, QPalette, 
-    QDialog, QVBoxLayout, QSlider, QSpinBox, 
-    QPushButton, QColorDialog, QMessageBox
-)
-
-def clone_without(element, remove_keys=("x", "y", "dy")):
+# The Qt classes are imported in the functions using them (qt_compat resolves them then),
+# so loading the plug-in at Krita startup imports no Qt module
+from .qt_compat import qt_exec, QC, get_text_width
+from .core import split_svg_elements, matrix_to_svg_transform, root_font_key, apply_transform
+from .glyphs import SpacingTable, grapheme_spans
+from .serialize import SvgDocumentWriter
+from .pool import shared_executor, shutdown_executor, split_job
+from .serialize import serialize_elements
+from .cache import SplitCache
+from .join import join_svg
+from .live import new_link_id, source_name, parse_name, linked_lines, index_links, plan_resync, svg_position
+from .profiling import PROFILER, ENV_VAR
+
+# Add all split outputs with a few addShapesFromSvg() calls (False : one call per shape)
+BATCH_ADD_SHAPES = True
+# Upper limit of one batched SVG document (characters), it bounds the peak memory
+MAX_BATCH_SIZE = 8 * 1024 * 1024
+# Process large selections in time slices with a progress dialog (it can be canceled)
+CHUNKED_MODE = True
+CHUNKED_MIN_SHAPES = 20
+CHUNK_TIME_SLICE = 0.03  # sec. per slice, the UI is updated between the slices
+POLL_INTERVAL_MS = 20
+# Place the lines without dy / line-height by the line spacing of the font (Qt),
+# False : one em per line
+LINE_METRICS = True
+# Put the absolute transform into each line : every line shape gets its own position
+# (its origin is the line start), False : all lines share the transform of the original
+BAKE_TRANSFORM = False
+# Compact output (see compact.py) : digits of the numbers, None : off
+COMPACT_OUTPUT = None
+# With COMPACT_OUTPUT, add the lines of each split shape as one group (shared transform and style)
+GROUP_OUTPUT = False
+# Split large selections in worker processes (line split only)
+USE_WORKER_POOL = True
+POOL_MIN_SHAPES = 50
+# Cache of split results for repeated labels (None : disabled)
+# Set SPLIT_CACHE.path to a JSON file for keeping it between the sessions
+SPLIT_CACHE = SplitCache(max_entries=4096, max_size=64 * 1024 * 1024)
+# Completion notice : "floating" (message on the canvas), "dialog" (auto close popup) or "quiet"
+# The Krita setting [split_text] notice=... overrides it. Neither blocks the next split.
+NOTICE_MODE = "floating"
+NOTICE_TIMEOUT_MS = 1500
+# shape.type() of the text shapes, the other shapes are not split
+TEXT_SHAPE_TYPE = "KoSvgTextShapeID"
+
+def split_txt_elements(shape, granularity="line", metrics=None, bake=False, compact=None, group=False):
+    # get SVG data and absolute transformation from Krita, then split it
+    # granularity: "line", "word" or "char"
+    # Returns the new <text> elements (not serialized yet)
+    with PROFILER.stage("toSvg"):
+        svg_data = shape.toSvg()
+    return split_svg_elements(svg_data, qtransform_values(shape.absoluteTransformation()),
+                              granularity=granularity, metrics=metrics, bake=bake, compact=compact, group=group)
+
+class QtTextMetrics:
     """
-    Remove (x, y, dy) attribute,and the element make to cloning with recursive
+    Font metrics by Qt for the line spacing and word / char split (see glyphs.ApproxMetrics)
+    One QFontMetricsF per font (glyphs.FontKey : family, size, weight, style) in a run,
+    so each font is measured once. The sizes are returned in pt.
     """
-    new_el = ET.Element(element.tag)
-    for k, v in element.attrib.items():
-        if k not in remove_keys:
-            new_el.set(k, v)
-    new_el.text = element.text
-    for child in element:
-        cloned_child = clone_without(child, remove_keys)
-        new_el.append(cloned_child)
-        if child.tail:
-            if cloned_child.tail:
-                cloned_child.tail += child.tail
-            else:
-                cloned_child.tail = child.tail
-    return new_el
-
-def convert_to_pt(value, unit, base_font_size=12):
-    """
-    Conversion unit -> pt 
-    - value: number
-    - unit:  (pt, em, ex, %, lines, px, mm, cm, Q, in, pc)
-    - base_font_size: default 12pt
-    """
-    #print(f"{value} : {unit}")
-    if value is None or unit is None:
-        raise ValueError("Value or unit cannot be None")
-
-    if not isinstance(value, (int, float)):
-        raise TypeError("Value must be a number")
-
-    unit = str(unit).lower()  # Px -> px , PT ->pt  convert to lowercase
-
-    conversion_rates = {
-        "pt": 1,
-        "em": base_font_size,
-        "ex": base_font_size * 0.5,  # x-height
-        "%": base_font_size / 100,
-        "lines": base_font_size,
-        "px": 1, #0.75,  # 1px = 0.75pt
-        "mm": 2.83465,  # 1mm = 2.83465pt
-        "cm": 28.3465,  # 1cm = 28.3465pt
-        "q": 0.709,  # 1Q = 0.709pt
-        "in": 72,  # 1in = 72pt
-        "pc": 12,  # 1pc = 12pt
-    }
-
-    if unit in conversion_rates:
-        return value * conversion_rates[unit]
-    else:
-        raise ValueError(f"Unsuppored unit: {unit}")
-
-
-def convert_pt_to_unit(value, unit, base_font_size=12):
-    """
-    Conversion pt -> unit 
-    - value: number
-    - unit:  (pt, em, ex, %, lines, px, mm, cm, Q, in, pc)
-    - base_font_size: default 12pt
-    """
-
-    if value is None or unit is None:
-        raise ValueError("Value or unit cannot be None")
-
-    if not isinstance(value, (int, float)):
-        raise TypeError("Value must be a number")
-
-    unit = str(unit).lower() 
-
-    # fallback： value
-    value = value if value >= 0 else 12.0
-
-    conversion_rates = {
-        "pt": 1,
-        "em": 1 / safe_base_font_size,
-        "ex": 2 / safe_base_font_size,  # x-height
-        "%": 100 / safe_base_font_size,
-        "lines": 1 / safe_base_font_size,
-        "px": 1, # 1 / 0.75,  # 1pt = ca1.333px
-        "mm": 1 / 2.83465,  # 1pt = ca0.3528mm
-        "cm": 1 / 28.3465,  # 1pt = ca0.0353cm
-        "q": 1 / 0.709,  # 1pt = ca1.41Q
-        "in": 1 / 72,  # 1pt = ca0.0139in
-        "pc": 1 / 12,  # 1pt = ca0.0833pc
-    }
-
-    if unit in conversion_rates:
-        return value * conversion_rates[unit]
-    else:
-        raise ValueError(f"Undefined unit: {unit}")
-
-def parse_css_property(root, key, default_value=12.0, default_unit="pt"):
-    """
-    The helper function, general-purpose CSS property and unit getter 
-
-    Parameters:
-        root: node(it has attrib dictionary）
-        key: property name (Ex: "font-size", "line-height")
-        default_value: (Ex: 12.0)
-        default_unit:  (Ex: "pt")
-    
-    Returns:
-        Tuple (value, unit) float,string(all lower cases)f
-    """
-    value, unit = None, None
-
-    # get from attrib directly(for no unit)
-    if key in root.attrib:
+    def __init__(self):
+        self.metrics = {}
+        self.spacings = {}  # FontKey -> line spacing
+        self.table = None
+        from .qt_compat import QGuiApplication
+        dpi = 72.0
         try:
-            value = float(root.attrib[key])
-        except ValueError:
-            value = default_value
-
-    # Extract by regular expression from style attribute
-    if value is None and "style" in root.attrib:
-        # For example "font-size: 14px" or "line-height: 1.2em"
-        pattern = rf'{key}:\s*([\d.]+)([a-zA-Z%]+)?'
-        m = re.search(pattern, root.attrib["style"])
-        if m:
-            try:
-                value = float(m.group(1))
-            except ValueError:
-                value = default_value
-            # Use default_unit
-            unit = m.group(2) if m.group(2) is not None else default_unit
-
-    # Fallback routine: if value <= 0 or None,then set default_value to it
-    # Remove unnessesary white spaces and change to lower case）
-    if value is None or value <= 0:
-        value = default_value
-    unit = (unit or default_unit).strip().lower()
-
-    return value, unit
-
-def split_txt(shape):
-    # get SVG data and debug 
-    svg_data = shape.toSvg()
-    #print("original:")
-    #print(svg_data)
-    
-    # get absolute transformation 
-    absolute_transform = shape.absoluteTransformation()
-    abst_mat = qtransform_to_svg_transform(absolute_transform)
-    #print("Absolute transform:", abst_mat)
+            dpi = QGuiApplication.primaryScreen().logicalDotsPerInch() or 72.0
+        except Exception:
+            pass
+        self.scale = 72.0 / dpi  # px -> pt
+        self.signature = f"qt:{dpi}"  # the cached results depend on it
+
+    def font_metrics(self, font):
+        fm = self.metrics.get(font)
+        if fm is None:
+            from .qt_compat import QFont, QFontMetricsF
+            qfont = QFont(font.family.split(",")[0].strip().strip("'\""))
+            qfont.setPointSizeF(font.size)
+            weight = str(font.weight).strip().lower()
+            qfont.setBold(weight in ("bold", "bolder") or (weight.isdigit() and int(weight) >= 600))
+            qfont.setItalic(font.style in ("italic", "oblique"))
+            fm = self.metrics[font] = QFontMetricsF(qfont)
+        return fm
+
+    def advance(self, text, font):
+        return get_text_width(self.font_metrics(font), text) * self.scale
+
+    def vertical_advance(self, text, font):
+        # Vertical text : one em per glyph (cluster)
+        return len(grapheme_spans(text)) * font.size
+
+    def line_spacing(self, font):
+        spacing = self.spacings.get(font)
+        if spacing is None:
+            spacing = self.spacings[font] = self.font_metrics(font).lineSpacing() * self.scale
+        return spacing
+
+    def spacing_table(self):
+        """ The measured line spacings for the worker processes (glyphs.SpacingTable) """
+        if self.table is None or len(self.table.spacings) < len(self.spacings):
+            self.table = SpacingTable(self.spacings)
+        return self.table
+
+def qtransform_values(transform):
+    return (transform.m11(), transform.m12(), transform.m21(), transform.m22(), transform.m31(), transform.m32())
 
-    # each <text> elements use local coordinate(0 0) 
-    transform_attr = abst_mat  # Ex: "matrix(1.0 0.0 0.0 1.0 tx ty)"
-    
-    # Use transform attribute so (0,0)
-    base_x = 0
-    base_y = 0
-    
-    # In XML perser, make SVG data(<text> element)
-    try:
-        root = ET.fromstring(svg_data)
-    except ET.ParseError as e:
-        print("XML Parse Error:", e)
-        return ""
-    
-    # remove x, y, font-size  and keep others form original <text> element
-    preserved_attribs = {}
-    preserved_attribs = dict(root.attrib)
+def qtransform_to_svg_transform(transform):
+    return matrix_to_svg_transform(qtransform_values(transform))
 
-    font_size = None
-    font_unit = None
-    line_shift = None
-    line_shift_unit = None
+# -------
+# main
+# -------
 
-    font_size, font_unit = parse_css_property(root, "font-size", 12.0, "pt")
-    #print("font-size =", font_size, ", font_unit =", font_unit)  # → 16, "pt"
+def main():
+    run_split("line")
 
-    line_shift, line_shift_unit = parse_css_property(root, "line-height", font_size, "pt")
-    #print("line-height =", line_shift, ", line-height unit =", line_shift_unit)  # → 12.0, "pt"
+def main_split_words():
+    run_split("word")
 
-    # if vertical text, add  writing-mode to style attribute(if already it extist)
+def main_split_chars():
+    run_split("char")
 
-    if preserved_attribs.get("writing-mode") is None:
-        preserved_attribs["writing-mode"] = "horizontal-tb"
-    writing_mode = preserved_attribs["writing-mode"]
+def main_join():
+    # Join the selected text shapes into one text (the reverse of the split)
+    app = Krita.instance()
+    doc = app.activeDocument()
+    view = app.activeWindow().activeView()
 
+    items = selected_shapes(view)
+    if len(items) < 2:
+        return
 
-    if font_unit != "pt":
-        #print("font_unit_process:")
-        font_size = convert_to_pt(font_size, font_unit, base_font_size=font_size)
- 
-    if line_shift_unit != "pt":
-        #print("line_shift_unit_process:")
-        line_shift = convert_to_pt(line_shift, line_shift_unit, base_font_size=font_size or 12.0)
+    start = time.perf_counter()
+    snapshots = [(shape.toSvg(), qtransform_values(shape.absoluteTransformation())) for _, shape in items]
+    output = join_svg(snapshots)
+    if not output:
+        return
 
+    svg_scale = document_svg_scale(doc)
 
-    # Generate new <text> element per each line (or each <tspan> segments)
-    new_text_elements = []
-    if writing_mode == "horizontal-tb":
-        cumulative_offset = 0.0  # y direction  
-    else:
-        cumulative_offset = 0.0  # x direction
-
-    # If exist plain text at <text>,generate each line by split with line break
-    if root.text and root.text.strip():
-        lines = [line.strip() for line in root.text.strip().splitlines() if line.strip()]
-        for line in lines:
-            cumulative_offset += line_shift#font_size
-            new_text_node = ET.Element("text", {
-                "transform": transform_attr,
-                "font-size": str(line_shift)#font_size
-            })
-            for k, v in preserved_attribs.items():
-                new_text_node.set(k, v)
-            if writing_mode == "horizontal-tb":
-                new_text_node.set("x", str(base_x))
-                new_text_node.set("y", str(cumulative_offset))
-            else:
-                new_text_node.set("x", str(cumulative_offset* (-1 if writing_mode == "vertical-rl" else 1)   ))
-                new_text_node.set("y", str(base_y))
-            new_text_node.text = line
-            new_text_elements.append(new_text_node)
-    
-    # The chilren elements <tspan>
-    for child in root:
-        if child.tag != "tspan":
-            continue
-        # Get the value from dy attribute itself,if not font size.
-        dy_val = child.attrib.get("dy")
-        try:
-            increment = float(dy_val) if dy_val is not None else font_size
-        except Exception:
-            increment = font_size
-        cumulative_offset += increment
-        
-        new_text_node = ET.Element("text", {
-            "transform": transform_attr,
-            "font-size": str(font_size)
-        })
-        for k, v in preserved_attribs.items():
-            new_text_node.set(k, v)
-        if writing_mode == "horizontal-tb":
-            new_text_node.set("x", str(base_x))
-            new_text_node.set("y", str(cumulative_offset))
-        else:
-            new_text_node.set("x", str(cumulative_offset * (-1 if writing_mode == "vertical-rl" else 1)  ))
-            new_text_node.set("y", str(base_y))
-        
-        # Remove unused attribute of <tspan> element, and it makes clone
-        new_tspan = clone_without(child, remove_keys=("x", "y", "dy"))
-        #print("----Dump -----")
-        #ET.dump(new_text_node) 
-        #print("----↑ rawdata -----")
-        if new_tspan.text:
-            new_tspan.text = new_tspan.text.rstrip("\n")  # At first for parent text
-
-        for tspan in new_tspan.findall(".//tspan"):
-            if tspan.text:
-                tspan.text = tspan.text.rstrip("\n")  # for nested <tspan> text
-        
-            if tspan.tail:
-                tspan.tail = tspan.tail.rstrip("\n")  # remove tail(tag after) line brake 
-
-        #ET.dump(new_text_node)
-        #print("----↑ tspan.restrip -----")
-
-        #print("-----------")
-        new_text_node.append(new_tspan)
-        #print(f"child.tail : {repr(child.tail)}")
-        if child.tail and child.tail.strip():
-            extra_tspan = ET.Element("tspan")
-            extra_tspan.text = child.tail.strip()
-            new_text_node.append(extra_tspan)
-        
-        new_text_elements.append(new_text_node)
-    
-    # return contents as each <text> elements
-    result_parts = [ET.tostring(elem, encoding="unicode") for elem in new_text_elements]
-    result = "\n".join(result_parts)
+    app.action('InteractionTool').trigger()
+    for layer, shape in items:
+        shape.remove()
+    # The joined text goes to the layer of the first selected shape
+    items[0][0].addShapesFromSvg(f"<svg {svg_scale}>{output}</svg>")
+    print(f"split_text: {len(items)} shapes joined in {(time.perf_counter() - start) * 1000:.1f} ms")
 
+def text_shape_index(nodes):
+    """
+    Index of the selected text shapes : dict id(layer) -> (layer, list of shapes)
+    Only isSelected() and type() are asked, so the paths, images etc. in the layers
+    are never serialized (toSvg) and stay as they are.
+    """
+    index = {}
+    for node in nodes:
+        if node.type() != "vectorlayer":
+            continue
+        shapes = [shape for shape in node.shapes() if shape.isSelected() and shape.type() == TEXT_SHAPE_TYPE]
+        if shapes:
+            index[id(node)] = (node, shapes)
+    return index
 
-    if result.endswith('\n'):
-        #print("LineBreak Detect")
-        result = result.rstrip('\n')  # remove it
+def selected_shapes(view):
+    # (layer, shape) of the selected text shapes in the selected vector layers
+    return [(layer, shape) for layer, shapes in text_shape_index(view.selectedNodes()).values() for shape in shapes]
 
-    return result
+def document_svg_scale(doc):
+    # Set corrected scaling. 1pt = 72 dpi
+    wpt = doc.width()*0.72
+    hpt = doc.height()*0.72
+    return f' width="{wpt}pt" height="{hpt}pt" viewBox="0 0 {wpt} {hpt}" '
 
-def qtransform_to_svg_transform(transform):
-    return f"matrix({transform.m11()} {transform.m12()} {transform.m21()} {transform.m22()} {transform.m31()} {transform.m32()})"
+def main_split_live():
+    # Split by line, the source stays hidden and linked to the lines (see live.py)
+    app = Krita.instance()
+    view = app.activeWindow().activeView()
+    items = [(layer, shape) for layer, shape in selected_shapes(view) if parse_name(shape.name()) is None]
+    if not items:
+        return
+
+    start = time.perf_counter()
+    metrics = QtTextMetrics() if LINE_METRICS else None
+    svg_scale = document_svg_scale(app.activeDocument())
+    writers = {}  # id(layer) -> (layer, SvgDocumentWriter)
+    linked = 0
+    for layer, shape in items:
+        link = new_link_id()
+        lines = linked_lines(shape.toSvg(), link, qtransform_values(shape.absoluteTransformation()),
+                             metrics, BAKE_TRANSFORM)
+        if not lines:
+            continue  # no text, the shape stays as it is
+        if id(layer) not in writers:
+            writers[id(layer)] = (layer, SvgDocumentWriter(svg_scale, MAX_BATCH_SIZE))
+        writers[id(layer)][1].write_elements([line for _, line in lines])
+        shape.setName(source_name(link))
+        shape.setVisible(False)
+        shape.deselect()
+        linked += 1
 
-# -------
-# main
-# -------
+    app.action('InteractionTool').trigger()
+    for layer, writer in writers.values():
+        for s in writer.documents():
+            layer.addShapesFromSvg(s)
+    notice_split_done({"shapes": linked, "lines": sum(w.elements for _, w in writers.values()),
+                       "ms": (time.perf_counter() - start) * 1000})
+
+def selected_links(view):
+    # (layer, LinkedText) of the links that have a selected source or line
+    result = []
+    for layer in {id(layer): layer for layer, _ in selected_shapes(view)}.values():
+        links = index_links(layer.shapes())
+        selected = set()
+        for shape in layer.shapes():
+            parsed = parse_name(shape.name()) if shape.isSelected() else None
+            if parsed is not None:
+                selected.add(parsed[1])
+        result.extend((layer, links[link]) for link in selected if links[link].source is not None)
+    return result
 
-def main():
+def main_edit_linked():
+    # Show the source text of the selected split lines for editing (the lines are hidden)
+    app = Krita.instance()
+    view = app.activeWindow().activeView()
+    for layer, linked in selected_links(view):
+        for shape, _ in linked.lines:
+            shape.deselect()
+            shape.setVisible(False)
+        linked.source.setVisible(True)
+        linked.source.select()
+
+def main_resync():
+    # Split the edited source again, only the changed lines are replaced
+    from .qt_compat import QTransform
+    app = Krita.instance()
+    view = app.activeWindow().activeView()
+    links = selected_links(view)
+    if not links:
+        return
+
+    start = time.perf_counter()
+    metrics = QtTextMetrics() if LINE_METRICS else None
+    svg_scale = document_svg_scale(app.activeDocument())
+    kept_count = added_count = 0
+    writers = {}  # id(layer) -> (layer, SvgDocumentWriter)
+    app.action('InteractionTool').trigger()
+    for layer, linked in links:
+        source = linked.source
+        link = parse_name(source.name())[1]
+        new_lines = linked_lines(source.toSvg(), link, qtransform_values(source.absoluteTransformation()),
+                                 metrics, BAKE_TRANSFORM)
+        kept, added, removed, moves = plan_resync(new_lines, linked.lines, line_placement)
+        for shape in removed:
+            shape.remove()
+        for shape in kept:
+            shape.setVisible(True)
+        for shape, m in moves:
+            # the line shapes are not grouped, their local transform is the absolute one
+            shape.setTransformation(QTransform(*m))
+        source.deselect()
+        source.setVisible(False)
+        if added:
+            if id(layer) not in writers:
+                writers[id(layer)] = (layer, SvgDocumentWriter(svg_scale, MAX_BATCH_SIZE))
+            writers[id(layer)][1].write_elements(added)
+        kept_count += len(kept)
+        added_count += len(added)
+
+    for layer, writer in writers.values():
+        for s in writer.documents():
+            layer.addShapesFromSvg(s)
+    notice_split_done({"shapes": len(links), "lines": kept_count + added_count,
+                       "ms": (time.perf_counter() - start) * 1000})
+
+def line_placement(shape):
+    # absolute transform of a line shape and the position of its content (see live.plan_resync)
+    return qtransform_values(shape.absoluteTransformation()), svg_position(shape.toSvg())
+
+def run_split(granularity="line"):
     app = Krita.instance()
     doc = app.activeDocument()
     view = app.activeWindow().activeView()
     selected_vector_layer = view.selectedNodes()
-    
-    
-    # Set corrected scaling. 1pt = 72 dpi
-    wpt = doc.width()*0.72
-    hpt = doc.height()*0.72
-    svg_scale = f' width="{wpt}pt" height="{hpt}pt" viewBox="0 0 {wpt} {hpt}" '
-    
-    output_shapes = []
-    rm_shapes = []
-    target_layer = None
-    # Get selected shapes and apply path effect to the shapes
-    for node in selected_vector_layer:
-        if node.type() == "vectorlayer":
-            shapes = node.shapes()
-            target_layer = node
-            for shape in shapes:
-                if shape.isSelected():
-                    # main (get an output_element string)
-                    #print()
-                    output_elements = split_txt(shape)
-
-                    #print(output_elements)
-                    rm_shapes.append(shape)
-                    # When adding to Krita vector layer, you don't need to describes the DTD or XMLNS parts.
-                    output_shapes.append("<svg "+svg_scale+">"+output_elements+"</svg>")
+    svg_scale = document_svg_scale(doc)
+
+    # Profiling : SPLIT_TEXT_PROFILE or the Krita setting [split_text] profile=1 / cprofile
+    if not os.environ.get(ENV_VAR):
+        PROFILER.configure(app.readSetting("split_text", "profile", ""))
+    PROFILER.begin_run(granularity)
 
+    job = SplitJob(selected_vector_layer, svg_scale, granularity)
+
+    if CHUNKED_MODE and job.total >= CHUNKED_MIN_SHAPES:
+        # Large selection : time-sliced in the Qt event loop with a progress dialog
+        chunked_runner_class()(job).start()
+    else:
+        job.run()
+        finish_split(job)
 
+def finish_split(job):
+    app = Krita.instance()
     app.action('InteractionTool').trigger()
     #print()
-    if len(output_shapes) > 0:
-        # Add shapes to the layer 
-        for s in rm_shapes:s.remove()
-        for s in output_shapes:
-            target_layer.addShapesFromSvg(s)
-        
-    notice_autoclose_dialog('The Text were splited')
+    stats = job.commit()
+    PROFILER.end_run()
+    notice_split_done(stats)
+
+
+class SplitJob:
+    """
+    Split the selected shapes of all selected vector layers,
+    the document is not changed until commit()
+    So the job can be processed step by step, and can be dropped (canceled) at any time.
+
+    Each step takes a snapshot (toSvg + transform) on the main thread. For a large
+    selection the snapshots are split in the worker pool (see pool.py), and the
+    results go back to their own source layers.
+    """
+    def __init__(self, nodes, svg_scale, granularity="line"):
+        self.svg_scale = svg_scale
+        self.granularity = granularity
+        self.metrics = QtTextMetrics() if granularity != "line" or LINE_METRICS else None
+        self.index = 0
+        self.started = time.perf_counter()
+
+        # Get selected text shapes (the other shapes are skipped before toSvg)
+        index = text_shape_index(nodes)
+        self.items = [(layer, shape) for layer, shapes in index.values() for shape in shapes]  # (layer, shape)
+        self.total = len(self.items)
+        self.empty = set()  # indices of the items without output, they are not removed
+
+        # When adding to Krita vector layer, you don't need to describes the DTD or XMLNS parts.
+        # The split elements are written straight into the <svg> documents (single pass)
+        self.writers = {}  # id(layer) -> (layer, SvgDocumentWriter)
+        for key, (layer, _) in index.items():
+            self.writers[key] = (layer, SvgDocumentWriter(svg_scale, MAX_BATCH_SIZE if BATCH_ADD_SHAPES else 0))
+
+        # Word / char split measures with Qt, it stays on the main thread
+        self.executor = None
+        if USE_WORKER_POOL and granularity == "line" and self.total >= POOL_MIN_SHAPES:
+            self.executor = shared_executor()
+        self.futures = []
+        self.snapshots = []
+        self.keys = []
+        self.transforms = []  # the transform to apply to a template output, or None
+        self.pending = {}  # key -> future, for the same labels in this job
+        # The cache keeps templates without the position (see core.apply_transform),
+        # the baked and the compact outputs have it in their numbers, their key has the transform
+        self.templates = not BAKE_TRANSFORM and COMPACT_OUTPUT is None
+        if SPLIT_CACHE is not None and SPLIT_CACHE.path and not SPLIT_CACHE.loaded:
+            SPLIT_CACHE.load()
+
+    def writer_for(self, layer):
+        return self.writers[id(layer)][1]
+
+    def write_output(self, index, output, transform=None):
+        """
+        Write the split output of the item, an empty output keeps the original shape
+        - transform: the output is a template, put this transform into it
+        """
+        if transform is not None:
+            output = apply_transform(output, transform)
+        if not output:
+            self.empty.add(index)
+            return
+        self.writer_for(self.items[index][0]).write_text(output)
+
+    @property
+    def submitted(self):
+        return self.index >= self.total
+
+    @property
+    def done(self):
+        return self.submitted and all(f.done() for f in self.futures)
+
+    def completed(self):
+        """ Number of finished shapes (for progress) """
+        if self.executor is None:
+            return self.index
+        return sum(1 for f in self.futures if f.done())
+
+    def step(self):
+        """ Split the next shape (or send its snapshot to the worker pool) """
+        index = self.index
+        layer, shape = self.items[index]
+        self.index += 1
+        cache = SPLIT_CACHE
+        if self.executor is None and cache is None:
+            elements = split_txt_elements(shape, self.granularity, self.metrics, BAKE_TRANSFORM, COMPACT_OUTPUT,
+                                          GROUP_OUTPUT)
+            if not elements:
+                self.empty.add(index)
+                return
+            with PROFILER.stage("serialize"):
+                self.writer_for(layer).write_elements(elements)
+            return
+
+        with PROFILER.stage("toSvg"):
+            svg_data = shape.toSvg()
+        transform = qtransform_values(shape.absoluteTransformation())
+        # split without the position, it is put into the output at the end
+        template = transform if cache is not None and self.templates else None
+        split_transform = None if template is not None else transform
+        signature = self.metrics.signature if self.metrics is not None else ""
+        key = None
+        if cache is not None:
+            options = (self.granularity, signature) if self.templates else \
+                (transform, self.granularity, signature, BAKE_TRANSFORM, COMPACT_OUTPUT, GROUP_OUTPUT)
+            key = cache.key(svg_data, *options)
+        if key is not None and key in self.pending:
+            cache.hits += 1
+            output = None
+        else:
+            output = cache.get(key) if key is not None else None
+
+        # Area text is wrapped with the Qt widths, it stays on the main thread
+        serial = self.executor is None or "inline-size" in svg_data or "shape-inside" in svg_data
+        if serial and output is None and key not in self.pending:
+            elements = split_svg_elements(svg_data, split_transform, granularity=self.granularity,
+                                          metrics=self.metrics, bake=BAKE_TRANSFORM, compact=COMPACT_OUTPUT,
+                                          group=GROUP_OUTPUT)
+            with PROFILER.stage("serialize"):
+                output = serialize_elements(elements)
+            if cache is not None:
+                cache.put(key, output)
+
+        if self.executor is None:
+            self.write_output(index, output, template)
+            return
+
+        metrics = None
+        if self.metrics is not None:
+            # Measure the font of this text here (Qt is only on the main thread),
+            # the workers get the spacings as a table
+            font = root_font_key(svg_data)
+            if font is not None:
+                self.metrics.line_spacing(font)
+            metrics = self.metrics.spacing_table()
+        snapshot = (svg_data, split_transform, self.granularity, metrics, BAKE_TRANSFORM, COMPACT_OUTPUT,
+                    GROUP_OUTPUT)
+        self.snapshots.append(snapshot)
+        self.keys.append(key)
+        self.transforms.append(template)
+        if key in self.pending:
+            # The same label is already in the pool (counted as a hit)
+            self.futures.append(self.pending[key])
+            return
+        if output is not None:
+            # Cache hit : a ready result, it keeps the order with the others
+            future = Future()
+            future.set_result(output)
+            self.futures.append(future)
+            return
+        try:
+            future = self.executor.submit(split_job, snapshot)
+            self.futures.append(future)
+            if key is not None:
+                self.pending[key] = future
+        except Exception as e:
+            # The pool is broken, continue serially
+            print("split_text: worker pool failed, split serially:", e)
+            shutdown_executor()
+            self.executor = None
+            # a finished result is used, a failed / unfinished one is split here again
+            done = [f.result() if f.done() and not f.cancelled() and f.exception() is None else split_job(job)
+                    for f, job in zip(self.futures, self.snapshots)]
+            for i, (output, t) in enumerate(zip(done, self.transforms)):
+                self.write_output(i, output, t)
+            self.futures = []
+            self.snapshots = []
+            self.keys = []
+            self.transforms = []
+            self.pending = {}
+            # and this snapshot
+            self.write_output(index, split_job(snapshot), template)
+
+    def run(self):
+        while not self.submitted:
+            self.step()
+
+    def collect(self):
+        """ Write the results of the worker pool in the original order """
+        for i, (future, job, key, template) in enumerate(zip(self.futures, self.snapshots, self.keys,
+                                                             self.transforms)):
+            try:
+                # the stages in the workers are not recorded, only the waiting time
+                with PROFILER.stage("pool_wait"):
+                    output = future.result()
+            except Exception as e:
+                print("split_text: worker failed, split serially:", e)
+                output = split_job(job)
+            if SPLIT_CACHE is not None and key is not None and key not in SPLIT_CACHE:
+                SPLIT_CACHE.put(key, output)
+            self.write_output(i, output, template)
+        self.futures = []
+        self.snapshots = []
+        self.keys = []
+        self.transforms = []
+        self.pending = {}
+
+    def cancel(self):
+        for f in self.futures:
+            f.cancel()
+        self.futures = []
+        self.snapshots = []
+        self.keys = []
+        self.transforms = []
+        self.pending = {}
+        PROFILER.end_run()
+
+    def commit(self):
+        """
+        Remove the original shapes and add the split shapes to their own layers
+        Returns the stats dict (shapes, lines, layers, calls, ms), or None if nothing was selected
+        """
+        if self.total == 0:
+            return None
+        if self.futures:
+            self.collect()
+
+        start = time.perf_counter()
+        split = self.total - len(self.empty)
+        # One undo step per removed shape, Krita's Python API can not group them (no undo macro)
+        with PROFILER.stage("remove"):
+            for i, (layer, shape) in enumerate(self.items):
+                if i not in self.empty:
+                    shape.remove()
+
+        calls = 0
+        lines = sum(writer.elements for _, writer in self.writers.values())
+        for layer, writer in self.writers.values():
+            for s in writer.documents():
+                with PROFILER.stage("addShapesFromSvg"):
+                    layer.addShapesFromSvg(s)
+                calls += 1
+                PROFILER.count("svg_bytes", len(s))
+        PROFILER.count("shapes", split)
+        PROFILER.count("add_calls", calls)
+
+        elapsed = (time.perf_counter() - start) * 1000
+        if self.empty:
+            print(f"split_text: {len(self.empty)} shapes without text are kept")
+        print(f"split_text: {split} shapes added to {len(self.writers)} layer(s) by {calls} call(s) in {elapsed:.1f} ms")
+
+        if SPLIT_CACHE is not None:
+            stats = SPLIT_CACHE.stats()
+            print(f"split_text: cache {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+            if SPLIT_CACHE.path:
+                try:
+                    SPLIT_CACHE.save()
+                except OSError as e:
+                    print("split_text: cache file is not writable:", e)
+
+        return {
+            "shapes": split,
+            "lines": lines,
+            "layers": len(self.writers),
+            "calls": calls,
+            "ms": (time.perf_counter() - self.started) * 1000,
+        }
+
+
+# Made by chunked_runner_class() on first use : the base class QObject is imported then
+ChunkedSplitRunner = None
+
+def chunked_runner_class():
+    """ The ChunkedSplitRunner class (defined at the first call) """
+    global ChunkedSplitRunner
+    if ChunkedSplitRunner is not None:
+        return ChunkedSplitRunner
+
+    from .qt_compat import QObject, QTimer, QProgressDialog
+
+    class ChunkedSplitRunner(QObject):
+        """
+        Process a SplitJob in time slices driven by the Qt event loop
+        The UI keeps responding, and Cancel leaves the document unchanged.
+        """
+        active = set()  # keep the running instances alive
+
+        def __init__(self, job, parent=None):
+            super().__init__(parent)
+            self.job = job
+            self.progress = QProgressDialog("Splitting the text...", "Cancel", 0, job.total)
+            self.progress.setWindowTitle("Split text")
+            self.progress.setWindowModality(QC.Modality.WindowModal)
+            self.progress.setMinimumDuration(0)
+            self.timer = QTimer(self)
+            self.timer.setInterval(0)
+            self.timer.timeout.connect(self.run_slice)
+
+        def start(self):
+            ChunkedSplitRunner.active.add(self)
+            self.progress.setValue(0)
+            self.progress.show()
+            self.timer.start()
+
+        def stop(self):
+            self.timer.stop()
+            self.progress.close()
+            ChunkedSplitRunner.active.discard(self)
+
+        def run_slice(self):
+            if self.progress.wasCanceled():
+                self.stop()
+                self.job.cancel()
+                print(f"split_text: canceled ({self.job.completed()}/{self.job.total}), the document is unchanged")
+                return
+
+            deadline = time.perf_counter() + CHUNK_TIME_SLICE
+            while not self.job.submitted and time.perf_counter() < deadline:
+                self.job.step()
+            self.progress.setValue(self.job.completed())
+            if self.job.submitted:
+                # Only waiting for the worker pool, no need to spin the event loop
+                self.timer.setInterval(POLL_INTERVAL_MS)
+
+            if self.job.done:
+                self.stop()
+                finish_split(self.job)
+
+    return ChunkedSplitRunner
 
 # ====================
 # Utilities
 # ====================
 
 def message(mes):
+    from .qt_compat import QMessageBox
     mb = QMessageBox()
     mb.setText(str(mes))
     mb.setWindowTitle('Message')
@@ -376,8 +661,32 @@ def message(mes):
         pass # OK clicked
 
 
-# create dialog  and show it
-def notice_autoclose_dialog(message_text):
+def notice_split_done(stats):
+    """
+    Tell the result of the split without blocking (see NOTICE_MODE)
+    - stats: return value of SplitJob.commit()
+    """
+    if stats is None:
+        return
+    app = Krita.instance()
+    mode = app.readSetting("split_text", "notice", NOTICE_MODE) or NOTICE_MODE
+    if mode == "quiet":
+        return
+
+    text = f"The Text were splited : {stats['shapes']} shape(s) -> {stats['lines']} text(s), {stats['ms']:.0f} ms"
+    if mode == "floating":
+        from .qt_compat import QIcon
+        try:
+            # priority 1 : medium
+            app.activeWindow().activeView().showFloatingMessage(text, QIcon(), NOTICE_TIMEOUT_MS, 1)
+            return
+        except Exception:
+            pass  # no floating message (older Krita), use the popup
+    notice_autoclose_dialog(text, NOTICE_TIMEOUT_MS)
+
+# create dialog  and show it (non-modal, the control returns at once)
+def notice_autoclose_dialog(message_text, timeout=1500):
+    from .qt_compat import QDialog, QLabel, QHBoxLayout, QTimer
     app = Krita.instance()
     qwin = app.activeWindow().qwindow()
     qq = qwin.size()
@@ -385,9 +694,12 @@ def notice_autoclose_dialog(message_text):
     wpos = math.ceil(qq.width() * 0.45)
     hpos = math.ceil(qq.height() * 0.45)
 
-    noticeDialog = QDialog()
+    # The main window is the parent, it keeps the dialog alive until it is closed
+    noticeDialog = QDialog(qwin)
 
-    noticeDialog.setWindowFlags(QC.Window.FramelessWindowHint)
+    noticeDialog.setWindowFlags(QC.Window.FramelessWindowHint | QC.Window.Tool)
+    noticeDialog.setAttribute(QC.WidgetAttr.WA_DeleteOnClose)
+    noticeDialog.setAttribute(QC.WidgetAttr.WA_ShowWithoutActivating)
 
     label = QLabel(message_text)
     hboxd = QHBoxLayout()
@@ -398,9 +710,9 @@ def notice_autoclose_dialog(message_text):
     noticeDialog.move(qwin.x() + wpos, qwin.y() + hpos)
     
     # Close window
-    QtCore.QTimer.singleShot(1500, noticeDialog.close)
+    QTimer.singleShot(timeout, noticeDialog.close)
 
-    qt_exec(noticeDialog)
+    noticeDialog.show()
 
 
 
@@ -423,6 +735,24 @@ class split_text(Extension):
         action = window.createAction("split_text", "Split the multi line text", "tools/scripts")
         action.triggered.connect(main)
 
+        action = window.createAction("split_text_words", "Split the text by word", "tools/scripts")
+        action.triggered.connect(main_split_words)
+
+        action = window.createAction("split_text_chars", "Split the text by character", "tools/scripts")
+        action.triggered.connect(main_split_chars)
+
+        action = window.createAction("join_text", "Join the text shapes", "tools/scripts")
+        action.triggered.connect(main_join)
+
+        action = window.createAction("split_text_live", "Split the text (linked to the source)", "tools/scripts")
+        action.triggered.connect(main_split_live)
+
+        action = window.createAction("edit_linked_text", "Edit the source of the linked split", "tools/scripts")
+        action.triggered.connect(main_edit_linked)
+
+        action = window.createAction("resync_split_text", "Resync the linked split", "tools/scripts")
+        action.triggered.connect(main_resync)
+
         pass
 
 
@@ -0,0 +1,109 @@
+# ======================================
+# Krita text split plug-in : streaming splitter
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the 
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# Streaming version of core.split_svg for very large text shapes (thousands of lines),
+# batch.py uses it for the <text> elements larger than batch.STREAM_MIN_SIZE.
+# The <text> is read with an incremental pull parser, each line is emitted as soon as
+# its <tspan> (and the text after it) is complete, and then it is dropped from the tree.
+# So the memory stays about one line, not the whole document.
+# Only the line split with the default options is supported (no font metrics, area text wrap,
+# word / char split, bake or compact output), use core.split_svg for them.
+
+import xml.etree.ElementTree as ET
+
+from .core import (
+    IDENTITY, matrix_to_svg_transform, text_properties, plain_text_lines,
+    tspan_increment, new_line_element, fill_tspan_line, line_keys
+)
+
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_chunks(source, chunk_size=CHUNK_SIZE):
+    """ str / bytes / file object -> chunks """
+    if isinstance(source, (str, bytes)):
+        for i in range(0, len(source), chunk_size):
+            yield source[i:i + chunk_size]
+        return
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_split_svg(source, transform=IDENTITY, chunk_size=CHUNK_SIZE):
+    """
+    Split a multiple line <text> element, and yield the new <text> elements one by one
+    - source:    SVG string/bytes of one <text> element, or a file object of it
+    - transform: 6 values (m11, m12, m21, m22, dx, dy) of the absolute transformation
+    The output is the same as split_svg() with the default options (line split, no metrics,
+    bake or compact), when it joined with line break. Area text is not wrapped here.
+    If the XML is broken, the error is printed and the generator stops there.
+    """
+    transform_attr = matrix_to_svg_transform(transform)
+    parser = ET.XMLPullParser(events=("start", "end"))
+
+    root = None
+    props = None
+    plain_done = False
+    pending = None  # top level child, waiting until its tail is known
+    offset = 0.0
+    depth = 0
+
+    def emit_plain():
+        nonlocal offset
+        preserved_attribs, font_size, line_shift, writing_mode = props
+        for line in plain_text_lines(root.text):
+            offset += line_shift
+            node = new_line_element(transform_attr, line_shift, preserved_attribs, writing_mode, offset)
+            node.text = line
+            yield ET.tostring(node, encoding="unicode")
+        root.text = None
+
+    def emit_pending():
+        nonlocal offset, pending
+        child, pending = pending, None
+        root.remove(child)
+        if child.tag != "tspan":
+            return
+        preserved_attribs, font_size, line_shift, writing_mode = props
+        offset += tspan_increment(child, font_size, writing_mode)
+        node = new_line_element(transform_attr, font_size, preserved_attribs, writing_mode, offset)
+        yield ET.tostring(fill_tspan_line(node, child, False, line_keys(writing_mode)), encoding="unicode")
+
+    try:
+        for chunk in iter_chunks(source, chunk_size):
+            parser.feed(chunk)
+            for event, el in parser.read_events():
+                if event == "start":
+                    depth += 1
+                    if depth == 1:
+                        root = el
+                        props = text_properties(root)
+                    elif depth == 2:
+                        # root.text and the tail of previous child are fixed here
+                        if not plain_done:
+                            plain_done = True
+                            yield from emit_plain()
+                        if pending is not None:
+                            yield from emit_pending()
+                else:
+                    if depth == 2:
+                        pending = el
+                    elif depth == 1:
+                        if not plain_done:
+                            plain_done = True
+                            yield from emit_plain()
+                        if pending is not None:
+                            yield from emit_pending()
+                    depth -= 1
+        parser.close()
+    except ET.ParseError as e:
+        print("XML Parse Error:", e)
@@ -0,0 +1,97 @@
+# ======================================
+# Krita text split plug-in : style engine
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the 
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# A style attribute is tokenized once into a property map.
+# The same style strings repeat in many labels, so the maps (and the parsed lengths)
+# are cached by the raw string.
+
+import re
+from functools import lru_cache
+from types import MappingProxyType
+
+STYLE_CACHE_SIZE = 4096
+
+# "14px" -> ("14", "px")  ,  "1.2" -> ("1.2", "") ,  "-2em" -> ("-2", "em")
+LENGTH_RE = re.compile(r'\s*([+-]?[\d.]+)([a-zA-Z%]+)?')
+
+EMPTY_STYLE = MappingProxyType({})
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def parse_style(style):
+    """
+    Tokenize a style attribute into a read only property map
+    Ex: "font-size: 14px; fill:#000" -> {"font-size": "14px", "fill": "#000"}
+    The property names are lower case, the later declaration wins (same as CSS)
+    """
+    if not style:
+        return EMPTY_STYLE
+    props = {}
+    for declaration in style.split(";"):
+        name, sep, value = declaration.partition(":")
+        if not sep:
+            continue
+        name = name.strip().lower()
+        if name:
+            props[name] = value.strip()
+    return MappingProxyType(props)
+
+
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def parse_length(text):
+    """
+    Parse a length value
+    Returns tuple (value, unit)  value is float or None, unit is lower case string or None
+    """
+    m = LENGTH_RE.match(text)
+    if not m:
+        return None, None
+    try:
+        value = float(m.group(1))
+    except ValueError:
+        return None, None
+    return value, (m.group(2).lower() if m.group(2) else None)
+
+
+def style_property(attrib, key, default=None):
+    """
+    Get a property as string from an attrib dictionary
+    The attribute itself (Ex: font-size="12") is used at first, and then the style attribute
+    """
+    if key in attrib:
+        return attrib[key]
+    style = attrib.get("style")
+    if style:
+        return parse_style(style).get(key, default)
+    return default
+
+
+def style_length(attrib, key, default_value=12.0, default_unit="pt"):
+    """
+    Typed lookup of a length property
+    - attrib: attrib dictionary of the element
+    - key: property name (Ex: "font-size", "line-height")
+    Returns tuple (value, unit) float,string(all lower cases)
+    When it is not found, not a number or <= 0, default_value is used.
+    """
+    raw = style_property(attrib, key)
+    value, unit = (None, None) if raw is None else parse_length(raw)
+    if value is None or value <= 0:
+        value = default_value
+    return value, (unit or default_unit).strip().lower()
+
+
+def clear_style_cache():
+    parse_style.cache_clear()
+    parse_length.cache_clear()
+
+
+def style_cache_info():
+    """ Tuple (parse_style info, parse_length info) of the LRU caches """
+    return parse_style.cache_info(), parse_length.cache_info()
@@ -0,0 +1,108 @@
+# ======================================
+# Krita text split plug-in : unit conversion
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the 
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# Precomputed conversion tables, a scalar fast path and a batch (array) conversion.
+# 1 unit = FIXED_PT[unit] + RELATIVE_PT[unit] * base_font_size  (pt)
+# The batch conversion uses NumPy for long arrays when it is available (Krita may not ship it),
+# otherwise the same tables are used in pure Python.
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Below this number of values, pure Python is faster than building arrays
+# (a text has a few <tspan> usually, see affine.NUMPY_MIN_POINTS)
+NUMPY_MIN_VALUES = 128
+
+# Absolute units -> pt
+FIXED_PT = {
+    "pt": 1.0,
+    "px": 1.0, #0.75,  # 1px = 0.75pt
+    "mm": 2.83465,  # 1mm = 2.83465pt
+    "cm": 28.3465,  # 1cm = 28.3465pt
+    "q": 0.709,  # 1Q = 0.709pt
+    "in": 72.0,  # 1in = 72pt
+    "pc": 12.0,  # 1pc = 12pt
+}
+
+# Font relative units -> multiplier of the base font size
+RELATIVE_PT = {
+    "em": 1.0,
+    "ex": 0.5,  # x-height
+    "%": 0.01,
+    "lines": 1.0,
+}
+
+UNITS = tuple(FIXED_PT) + tuple(RELATIVE_PT)
+UNIT_INDEX = {unit: i for i, unit in enumerate(UNITS)}
+
+if np is not None:
+    FIXED_TABLE = np.array([FIXED_PT.get(u, 0.0) for u in UNITS])
+    RELATIVE_TABLE = np.array([RELATIVE_PT.get(u, 0.0) for u in UNITS])
+
+
+def unit_rate(unit, base_font_size=12.0):
+    """ 1 unit in pt (unit: lower case) """
+    rate = FIXED_PT.get(unit)
+    if rate is not None:
+        return rate
+    rate = RELATIVE_PT.get(unit)
+    if rate is not None:
+        return rate * base_font_size
+    raise ValueError(f"Unsuppored unit: {unit}")
+
+
+def to_pt(value, unit, base_font_size=12.0):
+    """ Scalar conversion unit -> pt  (unit: lower case) """
+    return value * unit_rate(unit, base_font_size)
+
+
+def from_pt(value, unit, base_font_size=12.0):
+    """ Scalar conversion pt -> unit  (unit: lower case) """
+    if base_font_size <= 0:
+        base_font_size = 12.0  # fallback
+    return value / unit_rate(unit, base_font_size)
+
+
+def to_pt_array(values, units, base_font_sizes=12.0):
+    """
+    Batch conversion unit -> pt
+    - values: sequence of numbers
+    - units:  sequence of units (lower case), or one unit for all values
+    - base_font_sizes: sequence of base font sizes, or one size for all values
+    Returns list of float (pt)
+    """
+    count = len(values)
+    if isinstance(units, str):
+        units = (units,) * count
+    if isinstance(base_font_sizes, (int, float)):
+        bases = None
+        base = base_font_sizes
+    else:
+        bases = base_font_sizes
+        if len(bases) != count:
+            raise ValueError("values and base_font_sizes must have the same length")
+    if len(units) != count:
+        raise ValueError("values and units must have the same length")
+
+    try:
+        index = [UNIT_INDEX[u] for u in units]
+    except KeyError as e:
+        raise ValueError(f"Unsuppored unit: {e.args[0]}") from None
+
+    if np is not None and count >= NUMPY_MIN_VALUES:
+        idx = np.asarray(index, dtype=np.intp)
+        rates = FIXED_TABLE[idx] + RELATIVE_TABLE[idx] * (base if bases is None else np.asarray(bases, dtype=float))
+        return (np.asarray(values, dtype=float) * rates).tolist()
+
+    if bases is None:
+        rates = [unit_rate(u, base) for u in UNITS]
+        return [v * rates[i] for v, i in zip(values, index)]
+    return [v * unit_rate(UNITS[i], b) for v, i, b in zip(values, index, bases)]
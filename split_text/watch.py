@@ -0,0 +1,331 @@
+# ======================================
+# Krita text split plug-in : watch folder service
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# Watch a drop directory and split the SVG files put there, without Krita.
+#
+# Usage:
+#   python -m split_text.watch <directory> [-j JOBS] [-g line|word|char] [-b] [-c DIGITS]
+#                              [--interval SEC] [--settle SEC] [--queue N] [--stats-file PATH] [--once]
+#
+# The directory is polled (no extra package, it works on any file system, also network shares).
+# A file is taken when its size and mtime did not change for --settle seconds, so files that
+# are still being written (copied, exported) are not read half way.
+# The files go through a bounded queue to a process pool (asyncio + run_in_executor),
+# the result is written atomically as "<name>.split.svg" next to the input.
+# A changed input is split again, an input older than its result is skipped at the start.
+# Counters (queue depth, in flight, done, failed, files/s, texts/s) are printed
+# every --stats-interval seconds and written to --stats-file as JSON.
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .batch import OUTPUT_SUFFIX, output_path_for, process_file, write_atomic
+from .glyphs import GRANULARITIES
+
+
+class WatchStats:
+    """ Counters of the service """
+    def __init__(self):
+        self.started = time.monotonic()
+        self.queued = 0     # files put into the queue (total)
+        self.in_flight = 0  # files in the workers now
+        self.done = 0
+        self.failed = 0
+        self.texts = 0
+        self.busy = 0.0     # sum of the split times (sec.)
+
+    def snapshot(self, queue_depth):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return {
+            "queue_depth": queue_depth,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "done": self.done,
+            "failed": self.failed,
+            "texts": self.texts,
+            "files_per_s": self.done / elapsed,
+            "texts_per_s": self.texts / elapsed,
+            "avg_ms": self.busy / self.done * 1000 if self.done else 0.0,
+            "uptime_s": elapsed,
+        }
+
+
+def is_candidate(name):
+    # the results, hidden and temporary files are not inputs
+    return name.lower().endswith(".svg") and not name.endswith(OUTPUT_SUFFIX) and not name.startswith(".")
+
+
+def file_signature(path):
+    st = os.stat(path)
+    return (st.st_size, st.st_mtime_ns)
+
+
+def scan(directory):
+    """ dict path -> (size, mtime) of the input files in the directory """
+    found = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and is_candidate(entry.name):
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue  # removed while scanning
+                found[entry.path] = (st.st_size, st.st_mtime_ns)
+    return found
+
+
+def is_up_to_date(path, signature):
+    # the result is newer than the input (Ex: split before the service was restarted)
+    try:
+        return os.stat(output_path_for(path)).st_mtime_ns >= signature[1]
+    except FileNotFoundError:
+        return False
+
+
+class Debouncer:
+    """
+    Stable files of the successive scans
+    - settle: seconds without change of (size, mtime) before a file is ready
+    """
+    def __init__(self, settle=1.0):
+        self.settle = settle
+        self.seen = {}  # path -> (signature, time of the last change)
+        self.taken = {}  # path -> signature of the split version
+
+    def update(self, found, now):
+        """ Returns list of tuple (path, signature) that are ready to split """
+        for path in list(self.seen):
+            if path not in found:
+                del self.seen[path]
+                self.taken.pop(path, None)
+        ready = []
+        for path, signature in found.items():
+            previous = self.seen.get(path)
+            if previous is None or previous[0] != signature:
+                self.seen[path] = (signature, now)
+                continue
+            if self.taken.get(path) == signature or now - previous[1] < self.settle:
+                continue
+            self.taken[path] = signature
+            ready.append((path, signature))
+        return ready
+
+    def skip_existing(self, found):
+        """ Mark the inputs that have an up to date result (at the start) """
+        for path, signature in found.items():
+            if is_up_to_date(path, signature):
+                self.taken[path] = signature
+
+
+class WatchService:
+    """
+    - directory: the watched directory
+    - options: tuple (granularity, bake, compact, group) for batch.process_file
+    - jobs: number of worker processes, queue_size: upper limit of the waiting files
+    """
+    def __init__(self, directory, options=("line", False, None, False), jobs=1, queue_size=64,
+                 interval=0.5, settle=1.0, stats_interval=10.0, stats_file=None):
+        self.directory = directory
+        self.options = options
+        self.jobs = max(1, jobs)
+        self.queue_size = queue_size
+        self.interval = interval
+        self.stats_interval = stats_interval
+        self.stats_file = stats_file
+        self.debouncer = Debouncer(settle)
+        self.stats = WatchStats()
+        self.queue = None
+        self.stopping = None
+        self.executor = None
+
+    def counters(self):
+        return self.stats.snapshot(self.queue.qsize() if self.queue is not None else 0)
+
+    def report(self):
+        c = self.counters()
+        print(f"split_text watch: queue {c['queue_depth']}, in flight {c['in_flight']}, done {c['done']}, "
+              f"failed {c['failed']}, {c['files_per_s']:.2f} files/s, {c['texts_per_s']:.1f} texts/s", flush=True)
+        if self.stats_file:
+            try:
+                write_atomic(self.stats_file, json.dumps(c, indent=2))
+            except OSError as e:
+                print("split_text watch: stats file is not writable:", e, file=sys.stderr)
+
+    async def scanner(self, once=False):
+        loop = asyncio.get_running_loop()
+        first = True
+        while not self.stopping.is_set():
+            try:
+                found = await loop.run_in_executor(None, scan, self.directory)
+            except OSError as e:
+                print("split_text watch: scan failed:", e, file=sys.stderr)
+                found = {}
+            if first:
+                self.debouncer.skip_existing(found)
+                first = False
+            for path, _ in self.debouncer.update(found, time.monotonic()):
+                if not await self.enqueue(path):
+                    return  # stopped while the queue was full
+                self.stats.queued += 1
+            if once and not any(path not in self.debouncer.taken for path in found):
+                break  # every file is taken
+            try:
+                await asyncio.wait_for(self.stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def enqueue(self, path):
+        """ Put the path into the queue (waits while it is full), False if the service stops first """
+        if self.stopping.is_set():
+            return False
+        if not self.queue.full():
+            self.queue.put_nowait(path)
+            return True
+        put = asyncio.ensure_future(self.queue.put(path))
+        stop = asyncio.ensure_future(self.stopping.wait())
+        await asyncio.wait((put, stop), return_when=asyncio.FIRST_COMPLETED)
+        stop.cancel()
+        if put.done():
+            return True
+        put.cancel()
+        return False
+
+    def replace_executor(self, broken):
+        # the other workers see the same broken pool, it is replaced once
+        if self.executor is broken:
+            self.executor = ProcessPoolExecutor(max_workers=self.jobs)
+            broken.shutdown(wait=False, cancel_futures=True)
+
+    async def worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            path = await self.queue.get()
+            if path is None:
+                self.queue.task_done()
+                return  # stopped
+            try:
+                self.stats.in_flight += 1
+                start = time.perf_counter()
+                job = (path, output_path_for(path), *self.options)
+                executor = self.executor
+                try:
+                    src, count, error = await loop.run_in_executor(executor, process_file, job)
+                except BrokenProcessPool as e:
+                    # a worker process died (Ex: out of memory), the files in it are lost
+                    src, count, error = path, 0, f"worker process died: {e}"
+                    self.replace_executor(executor)
+                except Exception as e:
+                    src, count, error = path, 0, f"{type(e).__name__}: {e}"
+                self.stats.busy += time.perf_counter() - start
+                if error:
+                    self.stats.failed += 1
+                    print(f"Error: {src}: {error}", file=sys.stderr, flush=True)
+                else:
+                    self.stats.done += 1
+                    self.stats.texts += count
+            finally:
+                self.stats.in_flight -= 1
+                self.queue.task_done()
+
+    async def reporter(self):
+        while not self.stopping.is_set():
+            try:
+                await asyncio.wait_for(self.stopping.wait(), self.stats_interval)
+            except asyncio.TimeoutError:
+                self.report()
+
+    async def run(self, once=False):
+        """ Watch until stop() (or until all files are split with once=True) """
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass  # not on the main thread / Windows
+
+        self.executor = ProcessPoolExecutor(max_workers=self.jobs)
+        try:
+            # one consumer per process, the pool never has more than "jobs" files
+            workers = [asyncio.create_task(self.worker()) for _ in range(self.jobs)]
+            reporter = asyncio.create_task(self.reporter())
+            await self.scanner(once)
+            # the files in the queue are finished, unless stop() comes first
+            finished = asyncio.ensure_future(self.queue.join())
+            stop = asyncio.ensure_future(self.stopping.wait())
+            await asyncio.wait((finished, stop), return_when=asyncio.FIRST_COMPLETED)
+            finished.cancel()
+            stop.cancel()
+            self.stopping.set()
+            while not self.queue.empty():
+                self.queue.get_nowait()  # not started
+                self.queue.task_done()
+            # the files in the workers are finished and counted, then the workers end (None)
+            for _ in workers:
+                await self.queue.put(None)
+            await asyncio.gather(*workers, return_exceptions=True)
+            await reporter
+        finally:
+            # the files in the worker processes are finished (atomic writes), the waiting ones are cancelled
+            self.executor.shutdown(wait=True, cancel_futures=True)
+        self.report()
+        return self.counters()
+
+    def stop(self):
+        if self.stopping is not None:
+            self.stopping.set()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m split_text.watch",
+        description="Watch a directory and split the SVG files put into it.")
+    parser.add_argument("directory", help="directory to watch")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: all cores)")
+    parser.add_argument("-g", "--granularity", choices=GRANULARITIES, default="line",
+                        help="split by line (default), word or character")
+    parser.add_argument("-b", "--bake", action="store_true",
+                        help="put the position of each line into its own transform")
+    parser.add_argument("-c", "--compact", type=int, default=None, metavar="DIGITS",
+                        help="compact output : round the numbers to DIGITS, drop the default attributes")
+    parser.add_argument("--group", action="store_true",
+                        help="with -c, put the lines of each text in one <g> (added as one group shape)")
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between the scans (default: 0.5)")
+    parser.add_argument("--settle", type=float, default=1.0,
+                        help="seconds without change before a file is split (default: 1.0)")
+    parser.add_argument("--queue", type=int, default=64, help="upper limit of the waiting files (default: 64)")
+    parser.add_argument("--stats-interval", type=float, default=10.0,
+                        help="seconds between the counter reports (default: 10)")
+    parser.add_argument("--stats-file", default=None, help="also write the counters to this JSON file")
+    parser.add_argument("--once", action="store_true", help="split the files there now and exit")
+    args = parser.parse_args(argv)
+
+    if args.group and args.compact is None:
+        parser.error("--group needs -c DIGITS")
+    if not os.path.isdir(args.directory):
+        print(f"Not a directory: {args.directory}", file=sys.stderr)
+        return 2
+    service = WatchService(args.directory, (args.granularity, args.bake, args.compact, args.group), args.jobs,
+                           args.queue, args.interval, args.settle, args.stats_interval, args.stats_file)
+    print(f"split_text watch: {os.path.abspath(args.directory)} ({service.jobs} workers)", flush=True)
+    counters = asyncio.run(service.run(args.once))
+    return 1 if counters["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
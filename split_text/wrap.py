@@ -0,0 +1,241 @@
+# ======================================
+# Krita text split plug-in : auto wrap (area text)
+# ======================================
+# Copyright (C) 2025 L.Sumireneko.M
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# See split_text.py for the full license notice.
+
+# Area text (inline-size / shape-inside) has no line breaks in SVG, Krita wraps it when drawing.
+# Here the wrapped lines are computed again, so the split can make one shape per visual line.
+#
+# Greedy line breaker : the line is walked once into words and white spaces,
+# each (text, font) is measured once (WidthCache), so the cost is linear in the text length.
+# A word longer than the width is broken between the characters.
+#
+# Note: the width of a shape-inside shape is its bounding box (rect, circle, ellipse),
+#       text-align / hyphenation are not considered.
+
+import re
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+
+from .glyphs import DEFAULT_METRICS, iter_runs, font_key
+from .style import style_property, parse_style, parse_length
+from .units import to_pt, UNIT_INDEX
+
+TOKEN_RE = re.compile(r"\s+|\S+")
+URL_RE = re.compile(r"url\(\s*['\"]?#([^'\")\s]+)['\"]?\s*\)")
+# The wrapped lines are single lines, these properties are removed from them
+AREA_PROPERTIES = ("inline-size", "shape-inside", "shape-subtract", "shape-padding", "shape-margin")
+
+
+class WidthCache:
+    """
+    Measured advances by (text, font), the same word in the same font is measured once
+    - metrics: object with advance(text, font) / vertical_advance(text, font)
+    """
+    def __init__(self, metrics=None, vertical=False):
+        metrics = metrics or DEFAULT_METRICS
+        self.measure = metrics.vertical_advance if vertical else metrics.advance
+        self.widths = {}
+
+    def __call__(self, text, font):
+        key = (text, font)
+        width = self.widths.get(key)
+        if width is None:
+            width = self.widths[key] = self.measure(text, font)
+        return width
+
+
+def length_pt(raw, font_size):
+    value, unit = parse_length(raw) if raw else (None, None)
+    if value is None or value <= 0:
+        return None
+    unit = (unit or "pt").lower()
+    if unit == "pt":
+        return value
+    return to_pt(value, unit, font_size) if unit in UNIT_INDEX else None
+
+
+def shape_extent(element, vertical=False):
+    """ Width (height for vertical text) of the bounding box of a basic shape, or None """
+    tag = element.tag.rsplit("}", 1)[-1]
+    attrib = element.attrib
+    if tag == "rect":
+        return length_pt(attrib.get("height" if vertical else "width"), 12.0)
+    if tag == "circle":
+        r = length_pt(attrib.get("r"), 12.0)
+        return r * 2 if r else None
+    if tag == "ellipse":
+        r = length_pt(attrib.get("ry" if vertical else "rx"), 12.0)
+        return r * 2 if r else None
+    return None
+
+
+def wrap_width(root, font_size, shapes=None, writing_mode="horizontal-tb"):
+    """
+    The wrapping width (pt) of area text, None if the text is not wrapped
+    - root:   the <text> element
+    - shapes: dict id -> element, the shapes that shape-inside can refer to
+    """
+    width = length_pt(style_property(root.attrib, "inline-size"), font_size)
+    if width:
+        return width
+    shape_inside = style_property(root.attrib, "shape-inside")
+    m = URL_RE.search(shape_inside) if shape_inside else None
+    if m and shapes and m.group(1) in shapes:
+        return shape_extent(shapes[m.group(1)], writing_mode != "horizontal-tb")
+    return None
+
+
+def break_tokens(tokens, limit, measure):
+    """
+    Greedy line breaking
+    - tokens: list of tuple (text, attrs, font) of a line, text is a word or white spaces
+    - limit:  width of a line (pt)
+    - measure: function(text, font) -> advance
+    Returns list of visual lines (lists of tuple (text, attrs))
+    """
+    lines = []
+    current = []
+    width = 0.0
+    spaces = []
+    spaces_width = 0.0
+    word = []
+    word_width = 0.0
+
+    def new_line():
+        nonlocal current, width
+        lines.append(current)
+        current = []
+        width = 0.0
+
+    def place_word():
+        nonlocal width
+        if current and width + spaces_width + word_width > limit:
+            new_line()  # the white spaces at the break are dropped
+        elif current:
+            current.extend(spaces)
+            width += spaces_width
+        if word_width <= limit or current:
+            current.extend((text, attrs) for text, attrs, _ in word)
+            width += word_width
+            return
+        # A word longer than the line : break between the characters
+        for text, attrs, font in word:
+            for ch in text:
+                w = measure(ch, font)
+                if current and width + w > limit:
+                    new_line()
+                current.append((ch, attrs))
+                width += w
+
+    for token in tokens:
+        text, attrs, font = token
+        if text.isspace():
+            if word:
+                place_word()
+                word = []
+                word_width = 0.0
+                spaces = []
+                spaces_width = 0.0
+            spaces.append((text, attrs))
+            spaces_width += measure(text, font)
+        else:
+            word.append(token)
+            word_width += measure(text, font)
+    if word:
+        place_word()
+    if current:
+        lines.append(current)
+    return lines
+
+
+def line_tokens(line, base_font):
+    """ (text, attrs, font) of the words / white spaces of a split line, in one walk """
+    tokens = []
+    for text, attrs in iter_runs(line):
+        font = font_key(attrs, base_font)
+        for m in TOKEN_RE.finditer(text):
+            tokens.append((m.group(), attrs, font))
+    return tokens
+
+
+def build_line(template, parts):
+    """ New <text> element (attributes of template) from tuple (text, attrs) parts """
+    groups = []  # the parts of the same run are joined
+    for text, attrs in parts:
+        if groups and groups[-1][1] is attrs:
+            groups[-1][0].append(text)
+        else:
+            groups.append(([text], attrs))
+
+    node = ET.Element("text", template.attrib)
+    for texts, attrs in groups:
+        text = "".join(texts)
+        if attrs:
+            ET.SubElement(node, "tspan", attrs).text = text
+        elif len(node):
+            node[-1].tail = (node[-1].tail or "") + text
+        else:
+            node.text = (node.text or "") + text
+    return node
+
+
+@lru_cache(maxsize=256)
+def strip_area_style(style):
+    props = parse_style(style)
+    return ";".join(f"{k}:{v}" for k, v in props.items() if k not in AREA_PROPERTIES)
+
+
+def strip_area_properties(line):
+    """ Remove the area text properties from a line element (it is not wrapped again) """
+    for k in AREA_PROPERTIES:
+        line.attrib.pop(k, None)
+    style = line.get("style")
+    if style:
+        line.set("style", strip_area_style(style))
+
+
+def line_offset(line, writing_mode):
+    if writing_mode == "horizontal-tb":
+        return float(line.get("y", 0))
+    offset = float(line.get("x", 0))
+    return -offset if writing_mode == "vertical-rl" else offset
+
+
+def set_line_offset(line, writing_mode, offset):
+    if writing_mode == "horizontal-tb":
+        line.set("y", str(offset))
+    else:
+        line.set("x", str(offset * (-1 if writing_mode == "vertical-rl" else 1)))
+
+
+def wrap_lines(lines, limit, writing_mode, base_font, step, metrics=None):
+    """
+    Wrap split lines (<text> elements) at the width limit
+    - step: distance between the wrapped lines (pt)
+    The following lines move down (left / right for vertical text) by the added lines,
+    and the area text properties are removed from all lines.
+    Returns list of new line elements
+    """
+    measure = WidthCache(metrics, writing_mode != "horizontal-tb")
+    wrapped = []
+    shift = 0.0
+    for line in lines:
+        strip_area_properties(line)
+        offset = line_offset(line, writing_mode) + shift
+        visual = break_tokens(line_tokens(line, base_font), limit, measure)
+        if len(visual) <= 1:
+            if shift:
+                set_line_offset(line, writing_mode, offset)
+            wrapped.append(line)
+            continue
+        for i, parts in enumerate(visual):
+            node = build_line(line, parts)
+            set_line_offset(node, writing_mode, offset + step * i)
+            wrapped.append(node)
+        shift += step * (len(visual) - 1)
+    return wrapped
@@ -0,0 +1,25 @@
+# ======================================
+# Krita text split plug-in : test fixtures
+# ======================================
+# See split_text.py for the full license notice.
+
+import importlib
+import sys
+
+import pytest
+
+from benchmarks import krita_stub
+
+
+@pytest.fixture
+def plugin(monkeypatch):
+    """ The plug-in module with the stand-in Krita (and Qt without PyQt), split in this process """
+    krita_stub.install()
+    importlib.import_module("split_text.split_text")
+    module = sys.modules["split_text.split_text"]
+    monkeypatch.setattr(module, "CHUNKED_MODE", False)
+    monkeypatch.setattr(module, "LINE_METRICS", False)
+    monkeypatch.setattr(module, "USE_WORKER_POOL", False)
+    monkeypatch.setattr(module, "SPLIT_CACHE", None)
+    monkeypatch.setattr(module, "notice_autoclose_dialog", lambda *args, **kwargs: None)
+    return module
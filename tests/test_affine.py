@@ -0,0 +1,108 @@
+# ======================================
+# Krita text split plug-in : affine transform tests
+# ======================================
+# See split_text.py for the full license notice.
+
+import math
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from benchmarks import krita_stub
+from split_text import affine
+from split_text.affine import NUMPY_MIN_POINTS, bake_lines, map_points
+from split_text.core import split_svg_elements
+
+# (m11, m12, m21, m22, dx, dy) as QTransform
+ROTATE_90 = (0.0, 1.0, -1.0, 0.0, 5.0, 7.0)
+SKEW_X = (1.0, 0.0, 0.5, 1.0, 0.0, 0.0)      # skewX(atan(0.5))
+SCALE = (2.0, 0.0, 0.0, 3.0, 1.0, 1.0)
+ROTATE_30 = (math.cos(math.pi / 6), math.sin(math.pi / 6), -math.sin(math.pi / 6), math.cos(math.pi / 6), 10.0, -4.0)
+
+
+def qtransform_map():
+    """ QTransform.map() of PyQt5 as function(m, x, y), the test is skipped without PyQt5 """
+    QtGui = pytest.importorskip("PyQt5.QtGui")
+    if isinstance(QtGui, krita_stub.StubQtModule):
+        pytest.skip("only the Qt stand-ins of krita_stub are loaded")
+    return lambda m, x, y: QtGui.QTransform(*m).map(x, y)
+
+
+def formula_map(m, x, y):
+    # Fallback reference without PyQt5 (hand copy of QTransform::map() for affine matrices) :
+    # x' = m11 x + m21 y + dx, y' = m12 x + m22 y + dy
+    return m[0] * x + m[2] * y + m[4], m[1] * x + m[3] * y + m[5]
+
+
+@pytest.fixture
+def qt_map():
+    """ The reference mapping : QTransform.map(), the formula when PyQt5 is not installed """
+    try:
+        return qtransform_map()
+    except pytest.skip.Exception:
+        return formula_map
+
+
+@pytest.mark.parametrize("m", [ROTATE_90, SKEW_X, SCALE, ROTATE_30])
+def test_formula_matches_qtransform(m):
+    reference = qtransform_map()
+    for x, y in ((0.0, 0.0), (2.0, 3.0), (-7.5, 11.25)):
+        assert formula_map(m, x, y) == pytest.approx(reference(m, x, y), abs=1e-12)
+
+
+@pytest.fixture(params=["python", "numpy"])
+def path(request, monkeypatch):
+    """ The count of points for the path, the other path can not be taken """
+    if request.param == "python":
+        monkeypatch.setattr(affine, "np", None)
+        return 3
+    pytest.importorskip("numpy")
+    return NUMPY_MIN_POINTS + 8
+
+
+@pytest.mark.parametrize("m, expected", [
+    (ROTATE_90, (2.0, 9.0)),
+    (SKEW_X, (3.5, 3.0)),
+    (SCALE, (5.0, 10.0)),
+])
+def test_map_points_exact(path, m, expected):
+    xs, ys = map_points(m, [2.0] * path, [3.0] * path)
+    assert set(zip(xs, ys)) == {expected}
+
+
+@pytest.mark.parametrize("m", [ROTATE_90, SKEW_X, SCALE, ROTATE_30])
+def test_map_points_reference(path, qt_map, m):
+    xs = [i * 1.25 - 7.0 for i in range(path)]
+    ys = [i * -0.5 + 3.0 for i in range(path)]
+    mapped = list(zip(*map_points(m, xs, ys)))
+    assert len(mapped) == path
+    for (x, y), (mx, my) in zip(zip(xs, ys), mapped):
+        rx, ry = qt_map(m, x, y)
+        assert mx == pytest.approx(rx, abs=1e-12)
+        assert my == pytest.approx(ry, abs=1e-12)
+
+
+def line_origin(line, qt_map):
+    """ Document position of the line start from its own transform """
+    values = [float(v) for v in line.get("transform")[len("matrix("):-1].split()]
+    return qt_map(values, float(line.get("x")), float(line.get("y")))
+
+
+@pytest.mark.parametrize("m", [ROTATE_30, SKEW_X, SCALE])
+def test_bake_lines_keeps_positions(path, qt_map, m):
+    lines = [ET.Element("text", x=str(i * 0.5), y=str(12.0 * (i + 1))) for i in range(path)]
+    expected = [qt_map(m, float(line.get("x")), float(line.get("y"))) for line in lines]
+    baked = bake_lines(lines, m)
+    for line, (x, y) in zip(baked, expected):
+        assert (line.get("x"), line.get("y")) == ("0", "0")
+        assert line_origin(line, qt_map) == pytest.approx((x, y), abs=1e-9)
+
+
+def test_split_bake_keeps_positions(qt_map):
+    text = "\n".join(f"line {i}" for i in range(NUMPY_MIN_POINTS + 2))
+    src = f'<text font-size="12">{text}</text>'
+    plain = split_svg_elements(src, ROTATE_30)
+    baked = split_svg_elements(src, ROTATE_30, bake=True)
+    assert len(baked) == len(plain)
+    for a, b in zip(plain, baked):
+        assert line_origin(b, qt_map) == pytest.approx(qt_map(ROTATE_30, float(a.get("x", 0)), float(a.get("y", 0))), abs=1e-9)
@@ -0,0 +1,91 @@
+# ======================================
+# Krita text split plug-in : split result cache tests
+# ======================================
+# See split_text.py for the full license notice.
+
+import json
+
+from benchmarks import krita_stub
+from split_text.cache import CACHE_FILE_VERSION, SplitCache
+from split_text.core import split_svg
+
+SOURCE = '<text font-size="12">first\nsecond</text>'
+
+
+def test_lru_eviction_by_entries():
+    cache = SplitCache(max_entries=2, max_size=None)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"  # "b" is the oldest now
+    cache.put("c", "3")
+    assert "b" not in cache
+    assert list(cache.entries) == ["a", "c"]
+    assert cache.evictions == 1
+
+
+def test_lru_eviction_by_size():
+    cache = SplitCache(max_entries=10, max_size=10)
+    cache.put("a", "x" * 4)
+    cache.put("b", "x" * 4)
+    cache.put("c", "x" * 4)
+    assert list(cache.entries) == ["b", "c"]
+    assert cache.size == 8
+    cache.put("big", "x" * 11)  # never fits
+    assert "big" not in cache
+    cache.put("b", "x" * 2)  # replaced, the size follows
+    assert cache.size == 6
+
+
+def test_hit_counts():
+    cache = SplitCache()
+    assert cache.get("a") is None
+    cache.put("a", "1")
+    assert cache.get("a") == "1"
+    assert cache.get("a") == "1"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+    assert stats["hit_rate"] == 2 / 3
+
+
+def test_json_persistence(tmp_path):
+    path = tmp_path / "sub" / "cache.json"
+    cache = SplitCache(path=str(path))
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.save()
+
+    loaded = SplitCache(path=str(path))
+    assert loaded.load() == 2
+    assert list(loaded.entries.items()) == [("b", "2"), ("a", "1")]  # the LRU order is kept
+    assert loaded.loaded
+
+
+def test_json_other_version_or_broken(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text(json.dumps({"version": CACHE_FILE_VERSION + 1, "entries": [["a", "1"]]}))
+    assert SplitCache(path=str(path)).load() == 0
+    path.write_text("{broken")
+    assert SplitCache(path=str(path)).load() == 0
+    assert SplitCache(path=str(tmp_path / "missing.json")).load() == 0
+
+
+def test_key_without_transform():
+    assert SplitCache.key(SOURCE, "line", "") == SplitCache.key(SOURCE, "line", "")
+    assert SplitCache.key(SOURCE, "line", "") != SplitCache.key(SOURCE, "word", "")
+    assert SplitCache.key(SOURCE, "line", "") != SplitCache.key(SOURCE + " ", "line", "")
+
+
+def test_same_label_at_other_positions(plugin, monkeypatch):
+    cache = SplitCache()
+    monkeypatch.setattr(plugin, "SPLIT_CACHE", cache)
+    transforms = [(1.0, 0.0, 0.0, 1.0, 10.0 * i, 5.0 * i) for i in range(4)]
+    shapes = [krita_stub.StubShape(SOURCE, krita_stub.StubTransform(t)) for t in transforms]
+    layer = krita_stub.StubVectorLayer(shapes, keep_shapes=True)
+    krita_stub.set_selection([layer])
+    plugin.main()
+    assert (cache.misses, cache.hits) == (1, 3)
+    expected = "\n".join(split_svg(SOURCE, t) for t in transforms)
+    added = krita_stub.StubVectorLayer(keep_shapes=True)
+    added.addShapesFromSvg(f"<svg>{expected}</svg>")
+    assert [shape.toSvg() for shape in layer.shapes()] == [shape.toSvg() for shape in added.shapes()]
@@ -0,0 +1,100 @@
+# ======================================
+# Krita text split plug-in : compact output tests
+# ======================================
+# See split_text.py for the full license notice.
+
+import random
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from split_text import batch
+from split_text.affine import parse_svg_transform
+from split_text.compact import (DEFAULT_DIGITS, LINEAR_DIGITS, compact_lines, drop_redundant, format_number,
+                                format_transform)
+from split_text.core import split_svg_elements
+
+SOURCE = ('<text font-size="12" style="fill:#000000"><tspan x="0" dy="14">Alpha</tspan>'
+          '<tspan x="0" dy="14">Beta</tspan></text>')
+TRANSFORM = (0.866025403784, 0.5, -0.5, 0.866025403784, 10.123456, 20.5)
+
+
+def test_drop_default_attributes():
+    line = ET.fromstring('<text x="0" y="0" writing-mode="horizontal-tb" font-size="12">a</text>')
+    drop_redundant(line)
+    assert line.attrib == {"font-size": "12"}
+    # not the default value
+    line = ET.fromstring('<text x="3" y="0" writing-mode="vertical-rl">a</text>')
+    drop_redundant(line)
+    assert line.attrib == {"x": "3", "writing-mode": "vertical-rl"}
+
+
+def test_drop_attribute_under_style():
+    # the style property wins over the attribute, only for the properties
+    line = ET.fromstring('<text font-size="10" fill="red" id="t" style="font-size:12;fill:blue">a</text>')
+    drop_redundant(line)
+    assert line.attrib == {"id": "t", "style": "font-size:12;fill:blue"}
+
+
+def test_drop_inherited_tspan_attributes():
+    line = ET.fromstring('<text fill="red" style="font-size:12"><tspan fill="red" font-size="12" x="4">a'
+                         '<tspan fill="blue"><tspan fill="blue" font-weight="bold">b</tspan></tspan></tspan></text>')
+    drop_redundant(line)
+    outer = line[0]
+    assert outer.attrib == {"x": "4"}
+    assert outer[0].attrib == {"fill": "blue"}
+    assert outer[0][0].attrib == {"font-weight": "bold"}
+
+
+@pytest.mark.parametrize("value, expected", [
+    (28.346500000000002, "28.347"),
+    (12.0, "12"),
+    (-0.0001, "0"),
+    (-2.5, "-2.5"),
+    (1e-7, "0"),
+    (123456.0, "123456"),
+])
+def test_format_number(value, expected):
+    assert format_number(value) == expected
+
+
+@pytest.mark.parametrize("digits", [0, 1, 3, 6])
+def test_format_number_precision(digits):
+    rng = random.Random(digits)
+    for _ in range(1000):
+        value = rng.uniform(-5000, 5000)
+        assert abs(float(format_number(value, digits)) - value) <= 0.5 * 10 ** -digits + 1e-9
+
+
+def test_transform_round_trip():
+    rng = random.Random(1)
+    for _ in range(200):
+        m = tuple(rng.uniform(-2, 2) for _ in range(4)) + tuple(rng.uniform(-5000, 5000) for _ in range(2))
+        text = f"matrix({' '.join(repr(v) for v in m)})"
+        back = parse_svg_transform(format_transform(text))
+        for i, (a, b) in enumerate(zip(m, back)):
+            digits = LINEAR_DIGITS if i < 4 else DEFAULT_DIGITS
+            assert abs(a - b) <= 0.5 * 10 ** -digits + 1e-12
+
+
+def test_no_group_by_default():
+    lines = split_svg_elements(SOURCE, TRANSFORM, compact=3)
+    assert [line.tag for line in lines] == ["text", "text"]
+    # each line keeps its transform and style
+    assert all(line.get("transform") and line.get("style") for line in lines)
+    assert parse_svg_transform(lines[0].get("transform")) == pytest.approx(TRANSFORM, abs=1e-3)
+
+
+def test_group_opt_in():
+    [group] = split_svg_elements(SOURCE, TRANSFORM, compact=3, group=True)
+    assert group.tag == "g" and len(group) == 2
+    assert group.get("transform") and group.get("style") == "fill:#000000"
+    assert all(line.get("transform") is None for line in group)
+    # a single line is not grouped
+    line = ET.fromstring('<text x="1" transform="matrix(1 0 0 1 2 3)">a</text>')
+    assert compact_lines([line], 3, group=True) == [line]
+
+
+def test_batch_group_needs_compact(tmp_path):
+    with pytest.raises(SystemExit):
+        batch.main([str(tmp_path), "--group"])
@@ -0,0 +1,21 @@
+# ======================================
+# Krita text split plug-in : split tests
+# ======================================
+# See split_text.py for the full license notice.
+
+import pytest
+
+from split_text.core import split_svg_elements
+
+
+@pytest.mark.parametrize("line_height, step", [
+    ('', 12.0),
+    ('line-height="normal"', 12.0),
+    ('line-height="1.5"', 18.0),          # a number is a multiplier of the font size
+    ('style="line-height:1.5"', 18.0),
+    ('line-height="20pt"', 20.0),
+    ('line-height="150%"', 18.0),
+])
+def test_line_height(line_height, step):
+    lines = split_svg_elements(f'<text font-size="12" {line_height}>a\nb\nc</text>')
+    assert [float(line.get("y")) for line in lines] == [step, step * 2, step * 3]
@@ -0,0 +1,64 @@
+# ======================================
+# Krita text split plug-in : word / character split tests
+# ======================================
+# See split_text.py for the full license notice.
+
+import pytest
+
+from split_text.core import split_svg_elements
+from split_text.glyphs import DEFAULT_METRICS, FontKey, grapheme_spans
+
+FONT = FontKey("sans-serif", 10.0, "normal", "normal")
+
+
+def clusters(text):
+    return [text[start:end] for start, end in grapheme_spans(text)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("abc", ["a", "b", "c"]),
+    ("e\u0301te\u0301", ["e\u0301", "t", "e\u0301"]),  # combining acute accent
+    ("a\u0308\u0323b", ["a\u0308\u0323", "b"]),  # two combining marks
+    ("\U0001F44D\U0001F3FD!", ["\U0001F44D\U0001F3FD", "!"]),  # skin tone modifier
+    ("\U0001F468\u200d\U0001F469\u200d\U0001F467x",  # ZWJ family
+     ["\U0001F468\u200d\U0001F469\u200d\U0001F467", "x"]),
+    ("\U0001F1EF\U0001F1F5\U0001F1FA\U0001F1F8", ["\U0001F1EF\U0001F1F5", "\U0001F1FA\U0001F1F8"]),  # flags
+    ("1\ufe0f\u20e3", ["1\ufe0f\u20e3"]),  # keycap
+    ("\u1100\u1161\u11a8", ["\u1100\u1161\u11a8"]),  # Hangul jamo
+])
+def test_grapheme_spans(text, expected):
+    assert clusters(text) == expected
+
+
+def char_texts(svg):
+    return ["".join(piece.itertext()) for piece in split_svg_elements(svg, granularity="char")]
+
+
+def test_char_split_keeps_clusters():
+    text = "ne\u0301e \U0001F468\u200d\U0001F469\u200d\U0001F467!"
+    assert char_texts(f'<text font-size="10">{text}</text>') == [
+        "n", "e\u0301", "e", "\U0001F468\u200d\U0001F469\u200d\U0001F467", "!"]
+
+
+def test_vertical_advance_per_cluster():
+    assert DEFAULT_METRICS.vertical_advance("e\u0301\U0001F468\u200d\U0001F469x", FONT) == 30.0
+    pieces = split_svg_elements('<text font-size="10" writing-mode="vertical-rl">e\u0301\U0001F44D\U0001F3FDx</text>',
+                                granularity="char")
+    assert [float(piece.get("y")) for piece in pieces] == [0.0, 10.0, 20.0]
+
+
+def test_horizontal_advance_per_cluster():
+    # a combining mark has no width of its own
+    assert DEFAULT_METRICS.advance("e\u0301", FONT) == DEFAULT_METRICS.advance("e", FONT) == 5.0
+    pieces = split_svg_elements('<text font-size="10">e\u0301e</text>', granularity="char")
+    assert [float(piece.get("x")) for piece in pieces] == [0.0, 5.0]
+
+
+@pytest.mark.parametrize("granularity", ["word", "char"])
+def test_piece_ids_are_unique(granularity):
+    svg = ('<text id="t" font-size="10"><tspan id="s1" x="0" dy="12">ab cd</tspan>'
+           '<tspan id="s2" x="0" dy="12">e<tspan id="inner" font-weight="bold">f g</tspan></tspan></text>')
+    pieces = split_svg_elements(svg, granularity=granularity)
+    ids = [el.get("id") for piece in pieces for el in piece.iter() if el.get("id")]
+    assert len(ids) == len(set(ids)) == len(pieces)
+    assert ids[0] == "t"
@@ -0,0 +1,46 @@
+# ======================================
+# Krita text split plug-in : join tests
+# ======================================
+# See split_text.py for the full license notice.
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from split_text.core import split_svg_elements
+from split_text.join import join_svg
+from split_text.serialize import serialize_elements
+
+SOURCE = ('<text font-size="12" writing-mode="{}"><tspan x="0" dy="14">Alpha</tspan>'
+          '<tspan x="0" dy="14">Beta</tspan><tspan x="0" dy="14">Gamma</tspan></text>')
+TRANSFORM = (1, 0, 0, 1, 10, 20)
+
+
+def document_positions(lines, transform):
+    a, b, c, d, e, f = transform
+    result = []
+    for line in lines:
+        x, y = float(line.get("x", 0)), float(line.get("y", 0))
+        result.append((round(a * x + c * y + e, 6), round(b * x + d * y + f, 6)))
+    return result
+
+
+def transform_of(svg):
+    value = ET.fromstring(svg).get("transform")
+    return tuple(float(v) for v in value[len("matrix("):-1].split())
+
+
+@pytest.mark.parametrize("writing_mode", ["horizontal-tb", "vertical-rl"])
+def test_split_join_round_trip(writing_mode):
+    lines = split_svg_elements(SOURCE.format(writing_mode), TRANSFORM)
+    # the snapshots of the split shapes, not in the reading order
+    snapshots = [(serialize_elements([line]), TRANSFORM) for line in reversed(lines)]
+    joined = join_svg(snapshots)
+
+    root = ET.fromstring(joined)
+    assert [t.text for t in root] == ["Alpha", "Beta", "Gamma"]
+
+    transform = transform_of(joined)
+    again = split_svg_elements(joined, transform)
+    assert [el.findtext("tspan") or el.text for el in again] == ["Alpha", "Beta", "Gamma"]
+    assert document_positions(again, transform) == document_positions(lines, TRANSFORM)
@@ -0,0 +1,67 @@
+# ======================================
+# Krita text split plug-in : .kra document tool tests
+# ======================================
+# See split_text.py for the full license notice.
+
+import os
+import zipfile
+
+from split_text import kra
+
+LAYER = "doc/layers/layer2.shapelayer/content.svg"
+SVG_NS = "http://www.w3.org/2000/svg"
+SPLIT_LAYER = (f'<svg xmlns="{SVG_NS}"><text id="t" font-size="12" transform="translate(10 20)">'
+               '<tspan x="0" dy="12">Alpha</tspan><tspan x="0" dy="12">Beta</tspan></text></svg>').encode()
+NO_TEXT_LAYER = (f'<svg xmlns="{SVG_NS}"><rect id="r" width="10" height="10"/><text id="t"/></svg>').encode()
+# the other members : binary data of a pixel layer, the document XML ...
+MEMBERS = [
+    ("doc/layers/layer1", bytes(range(256)) * 64, zipfile.ZIP_DEFLATED),
+    ("maindoc.xml", b'<?xml version="1.0"?><DOC/>', zipfile.ZIP_DEFLATED),
+    ("preview.png", b"\x89PNG\r\n\x1a\n" + b"\x00" * 100, zipfile.ZIP_STORED),
+]
+
+
+def write_kra(path, layer):
+    # "mimetype" is not the first member and compressed here, the output must fix both
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("maindoc.xml", MEMBERS[1][1], zipfile.ZIP_DEFLATED)
+        z.writestr("mimetype", b"application/x-krita", zipfile.ZIP_DEFLATED)
+        for name, data, compression in (MEMBERS[0], MEMBERS[2]):
+            z.writestr(name, data, compression)
+        z.writestr(LAYER, layer, zipfile.ZIP_DEFLATED)
+
+
+def test_round_trip(tmp_path):
+    src, dst = tmp_path / "a.kra", tmp_path / ("a" + kra.OUTPUT_SUFFIX)
+    write_kra(src, SPLIT_LAYER)
+    assert kra.split_archive(str(src), str(dst)) == 1
+
+    with zipfile.ZipFile(src) as zin, zipfile.ZipFile(dst) as zout:
+        infos = zout.infolist()
+        assert infos[0].filename == "mimetype"
+        assert infos[0].compress_type == zipfile.ZIP_STORED
+        assert infos[0].header_offset == 0
+        assert zout.read("mimetype") == b"application/x-krita"
+        assert sorted(zout.namelist()) == sorted(zin.namelist())
+        for name, _, _ in MEMBERS:
+            assert zout.read(name) == zin.read(name)
+        layer = zout.read(LAYER).decode("utf-8")
+    assert layer.count("<text") == 2
+    assert "Alpha" in layer and "Beta" in layer
+
+
+def test_nothing_to_split(tmp_path):
+    src, dst = tmp_path / "a.kra", tmp_path / ("a" + kra.OUTPUT_SUFFIX)
+    write_kra(src, NO_TEXT_LAYER)
+    assert kra.split_archive(str(src), str(dst)) == 0
+    # no output and no temporary file left
+    assert sorted(os.listdir(tmp_path)) == ["a.kra"]
+
+
+def test_in_place(tmp_path):
+    src = tmp_path / "a.kra"
+    write_kra(src, SPLIT_LAYER)
+    assert kra.main([str(src), "--in-place", "-j", "1"]) == 0
+    assert sorted(os.listdir(tmp_path)) == ["a.kra"]
+    with zipfile.ZipFile(src) as z:
+        assert z.read(LAYER).decode("utf-8").count("<text") == 2
@@ -0,0 +1,108 @@
+# ======================================
+# Krita text split plug-in : live (linked) split tests
+# ======================================
+# See split_text.py for the full license notice.
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from benchmarks import krita_stub
+from split_text.affine import map_points, parse_svg_transform
+from split_text.live import line_position, linked_lines, parse_name, plan_resync
+
+TRANSFORM = (1.0, 0.0, 0.0, 1.0, 5.0, 7.0)
+
+
+def source(*lines):
+    return '<text font-size="10">' + "".join(f'<tspan x="0" dy="12">{t}</tspan>' for t in lines) + "</text>"
+
+
+def placement(line):
+    # the old line elements stand for the shapes here
+    return parse_svg_transform(line.get("transform")), line_position(line)
+
+
+def old_lines(*lines, bake=False):
+    return [(line, h) for h, line in linked_lines(source(*lines), "abc", TRANSFORM, bake=bake)]
+
+
+def resync(old, *lines, bake=False):
+    new = linked_lines(source(*lines), "abc", TRANSFORM, bake=bake)
+    return new, plan_resync(new, old, placement)
+
+
+def drawn_at(transform, position):
+    xs, ys = map_points(transform, [position[0]], [position[1]])
+    return xs[0], ys[0]
+
+
+def shape_text(shape):
+    return "".join(ET.fromstring(shape.toSvg()).itertext())
+
+
+def texts(lines):
+    return ["".join(line.itertext()) for line in lines]
+
+
+def test_unchanged():
+    old = old_lines("Alpha", "Beta", "Gamma")
+    _, (kept, added, removed, moves) = resync(old, "Alpha", "Beta", "Gamma")
+    assert kept == [line for line, _ in old]
+    assert (added, removed, moves) == ([], [], [])
+
+
+def test_edited_line():
+    old = old_lines("Alpha", "Beta", "Gamma")
+    _, (kept, added, removed, moves) = resync(old, "Alpha", "Beth", "Gamma")
+    assert texts(kept) == ["Alpha", "Gamma"]
+    assert texts(added) == ["Beth"]
+    assert texts(removed) == ["Beta"]
+    assert moves == []  # the same number of lines, nothing moves
+
+
+@pytest.mark.parametrize("bake", [False, True])
+def test_inserted_line(bake):
+    old = old_lines("Alpha", "Beta", "Gamma", bake=bake)
+    new, (kept, added, removed, moves) = resync(old, "Alpha", "New", "Beta", "Gamma", bake=bake)
+    assert texts(kept) == ["Alpha", "Beta", "Gamma"]
+    assert texts(added) == ["New"]
+    assert removed == []
+    # the lines below the new one move down, their content stays at its old position
+    assert texts(shape for shape, _ in moves) == ["Beta", "Gamma"]
+    targets = {texts([line])[0]: line for _, line in new}
+    for shape, m in moves:
+        line = targets[texts([shape])[0]]
+        expected = drawn_at(parse_svg_transform(line.get("transform")), line_position(line))
+        assert drawn_at(m, line_position(shape)) == pytest.approx(expected)
+        assert drawn_at(m, line_position(shape))[1] == pytest.approx(drawn_at(*placement(shape))[1] + 12)
+
+
+def test_removed_line():
+    old = old_lines("Alpha", "Beta", "Gamma")
+    _, (kept, added, removed, moves) = resync(old, "Alpha", "Gamma")
+    assert texts(kept) == ["Alpha", "Gamma"]
+    assert added == []
+    assert texts(removed) == ["Beta"]
+    [(shape, m)] = moves
+    assert texts([shape]) == ["Gamma"]
+    assert m == pytest.approx((1.0, 0.0, 0.0, 1.0, 5.0, 7.0 - 12))
+
+
+def test_plugin_resync(plugin):
+    src = krita_stub.StubShape(source("Alpha", "Beta", "Gamma"), krita_stub.StubTransform(TRANSFORM))
+    layer = krita_stub.StubVectorLayer([src], keep_shapes=True)
+    app = krita_stub.set_selection([layer])
+    plugin.main_split_live()
+    lines = {shape_text(shape): shape for shape in layer.shapes() if shape is not src}
+    assert sorted(lines) == ["Alpha", "Beta", "Gamma"]
+
+    src.svg = source("New", "Alpha", "Beta", "Gamma")
+    src.select()
+    plugin.main_resync()
+    shapes = [shape for shape in layer.shapes() if parse_name(shape.name())[0] == "line"]
+    assert sorted(shape_text(shape) for shape in shapes) == ["Alpha", "Beta", "Gamma", "New"]
+    # the kept shapes moved down by one line
+    assert lines["Alpha"].transform.m == pytest.approx((1.0, 0.0, 0.0, 1.0, 5.0, 7.0 + 12))
+    assert not lines["Alpha"].removed
+    assert app.window.view.messages[-1].startswith("The Text were splited : 1 shape(s) -> 4 text(s)")
@@ -0,0 +1,106 @@
+# ======================================
+# Krita text split plug-in : plug-in actions with the stand-in Krita
+# ======================================
+# See split_text.py for the full license notice.
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks import krita_stub
+from benchmarks.corpus import make_corpus
+from split_text.cache import SplitCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("batch", [True, False])
+def test_add_calls(plugin, monkeypatch, batch):
+    monkeypatch.setattr(plugin, "BATCH_ADD_SHAPES", batch)
+    corpus = make_corpus(count=12, lines=3, depth=1, extra_props=1)
+    layers = [krita_stub.StubVectorLayer([krita_stub.StubShape(svg) for svg in corpus[i::2]], keep_shapes=True)
+              for i in range(2)]
+    krita_stub.set_selection(layers)
+    plugin.main()
+    # one call per layer, or one per shape
+    assert [layer.add_calls for layer in layers] == ([1, 1] if batch else [6, 6])
+    assert sum(len(layer.shapes()) for layer in layers) == 12 * 3
+
+
+def test_import_resolves_no_qt_symbol():
+    # fresh interpreter : the plug-in module must not touch any Qt class at import
+    source = "\n".join([
+        "import importlib, split_text",
+        "from benchmarks import krita_stub",
+        "krita_stub.install()",
+        "importlib.import_module('split_text.split_text')",
+        "qc = importlib.import_module('split_text.qt_compat')",
+        "print(sorted(set(qc._SYMBOLS) & set(vars(qc))))",
+    ])
+    out = subprocess.run([sys.executable, "-c", source], capture_output=True, text=True, cwd=ROOT, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_chunked_runner(plugin, monkeypatch):
+    # the runner class is made on the first chunked split
+    monkeypatch.setattr(plugin, "CHUNKED_MODE", True)
+    monkeypatch.setattr(plugin, "CHUNKED_MIN_SHAPES", 1)
+    layer = krita_stub.StubVectorLayer([krita_stub.StubShape(svg) for svg in make_corpus(count=4, lines=2)],
+                                       keep_shapes=True)
+    krita_stub.set_selection([layer])
+    plugin.main()
+    runner = plugin.ChunkedSplitRunner
+    assert runner is not None and runner is plugin.chunked_runner_class()
+    krita_stub.run_timers()
+    assert not runner.active
+    assert len(layer.shapes()) == 4 * 2
+
+
+class CountingShape(krita_stub.StubShape):
+    """ A shape that counts its toSvg() calls """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.serialized = 0
+
+    def toSvg(self):
+        self.serialized += 1
+        return super().toSvg()
+
+
+@pytest.fixture(params=[False, True], ids=["direct", "cache"])
+def split_path(request, plugin, monkeypatch):
+    """ The plug-in, splitting directly or through the cache (templates) """
+    if request.param:
+        monkeypatch.setattr(plugin, "SPLIT_CACHE", SplitCache())
+    return plugin
+
+
+def test_non_text_shapes_are_skipped(split_path):
+    text = krita_stub.StubShape(make_corpus(count=1, lines=3)[0])
+    path = CountingShape('<path d="M0 0 L10 10"/>', shape_type="KoPathShape")
+    image = CountingShape("<image/>", shape_type="KoImageShape", selected=False)
+    layer = krita_stub.StubVectorLayer([path, text, image], keep_shapes=True)
+    paint = krita_stub.StubVectorLayer([CountingShape(make_corpus(count=1, lines=3)[0])])
+    paint.type = lambda: "paintlayer"
+    krita_stub.set_selection([layer, paint])
+    split_path.main()
+    # the other shapes are never serialized and stay
+    assert (path.serialized, image.serialized, paint.shape_list[0].serialized) == (0, 0, 0)
+    assert not path.removed and not image.removed and not paint.shape_list[0].removed
+    assert text.removed
+    assert [shape.type() for shape in layer.shapes()] == ["KoPathShape", "KoImageShape"] + ["KoSvgTextShapeID"] * 3
+
+
+@pytest.mark.parametrize("svg", ['<text font-size="12"></text>', "<text>  </text>", "<text"])
+def test_empty_output_keeps_the_shape(split_path, svg):
+    empty = krita_stub.StubShape(svg)
+    text = krita_stub.StubShape(make_corpus(count=1, lines=2)[0])
+    layer = krita_stub.StubVectorLayer([empty, text], keep_shapes=True)
+    krita_stub.set_selection([layer])
+    split_path.main()
+    assert not empty.removed
+    assert empty in layer.shapes()
+    assert text.removed
+    assert len(layer.shapes()) == 1 + 2
@@ -0,0 +1,36 @@
+# ======================================
+# Krita text split plug-in : split result tests
+# ======================================
+# See split_text.py for the full license notice.
+
+import math
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from split_text.core import split_svg_result
+from split_text.result import SplitResult
+
+ROTATE_60 = (0.5, math.sin(math.pi / 3), -math.sin(math.pi / 3), 0.5, 10.0, 20.0)
+
+
+def test_document_positions_with_bake():
+    src = '<text font-size="12">a\nbb\nccc</text>'
+    plain = split_svg_result(src, ROTATE_60, "line", None, False).document_positions()
+    baked = split_svg_result(src, ROTATE_60, "line", None, True).document_positions()
+    assert len(set(baked)) == 3
+    for p, b in zip(plain, baked):
+        assert b == pytest.approx(p)
+
+
+@pytest.mark.parametrize("attrib", [
+    {"font-size": "1pc"},
+    {"style": "font-size:1pc"},
+    {"style": "font-size:12pt;font-family:serif"},
+])
+def test_bbox_font_size_units(attrib):
+    line = ET.Element("text", dict(attrib, x="0", y="20"))
+    line.text = "a"
+    result = SplitResult.from_elements([line])
+    x0, y0, x1, y1 = result.bboxes()[0]
+    assert (y0, y1) == pytest.approx((20.0 - 12.0, 20.0 + 12.0 * 0.2))
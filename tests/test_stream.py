@@ -0,0 +1,61 @@
+# ======================================
+# Krita text split plug-in : streaming splitter tests
+# ======================================
+# See split_text.py for the full license notice.
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from split_text import batch
+from split_text.core import split_svg
+from split_text.stream import iter_split_svg
+
+SVG_NS = "http://www.w3.org/2000/svg"
+
+# several texts : plain lines, tspans with dy / x, nested tspans, units, vertical, tails
+TEXTS = [
+    '<text id="a" font-size="12" transform="translate(10 20)">first\nsecond\nthird</text>',
+    '<text id="b" style="font-size:16px;line-height:1.5;fill:#f00">'
+    '<tspan x="0" dy="14">Alpha <tspan font-weight="bold">bold</tspan> end</tspan>'
+    '<tspan x="0" dy="1.2em">Beta</tspan>tail<tspan x="0">Gamma</tspan></text>',
+    '<text id="c" font-size="10" writing-mode="vertical-rl" transform="rotate(30)">'
+    'head\n<tspan y="0" dx="-12">one</tspan><tspan y="0">two</tspan></text>',
+    '<text id="d" font-size="2mm">' + "".join(f'<tspan x="0" dy="9">line {i}</tspan>' for i in range(50))
+    + '</text>',
+]
+DOCUMENT = (f'<svg xmlns="{SVG_NS}" width="200" height="200"><g id="layer">{"".join(TEXTS)}</g>'
+            f'<text id="e" font-size="12">x\ny</text></svg>')
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 64 * 1024])
+@pytest.mark.parametrize("text", TEXTS)
+def test_same_as_split_svg(text, chunk_size):
+    transform = (0.5, 0.8, -0.8, 0.5, 3.0, 4.0)
+    streamed = "\n".join(iter_split_svg(text, transform, chunk_size))
+    assert streamed == split_svg(text, transform)
+
+
+def test_document_same_as_split_svg(monkeypatch):
+    expected, count = batch.split_svg_document(DOCUMENT)
+    assert count == 5
+
+    calls = []
+    def counting(source, transform, *args):
+        calls.append(source)
+        return iter_split_svg(source, transform, *args)
+    monkeypatch.setattr(batch, "STREAM_MIN_SIZE", 0)
+    monkeypatch.setattr(batch, "iter_split_svg", counting)
+    streamed, count = batch.split_svg_document(DOCUMENT)
+    assert len(calls) == 5
+    assert count == 5
+    assert streamed == expected
+    assert len(ET.fromstring(streamed).findall(f".//{{{SVG_NS}}}text")) > 50
+
+
+def test_document_options_not_streamed(monkeypatch):
+    monkeypatch.setattr(batch, "STREAM_MIN_SIZE", 0)
+    monkeypatch.setattr(batch, "iter_split_svg", None)  # fails if it is called
+    batch.split_svg_document(DOCUMENT, "word")
+    batch.split_svg_document(DOCUMENT, bake=True)
+    batch.split_svg_document(DOCUMENT, compact=3)
@@ -0,0 +1,37 @@
+# ======================================
+# Krita text split plug-in : style engine tests
+# ======================================
+# See split_text.py for the full license notice.
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from split_text.core import split_svg_elements, text_properties
+from split_text.style import parse_style, style_length, style_property
+
+
+@pytest.mark.parametrize("style, expected", [
+    # a vendor property that ends with the name is not the property itself
+    ("-inkscape-font-size:30px", (12.0, "pt")),
+    ("-inkscape-font-size:30px;font-size:10pt", (10.0, "pt")),
+    ("font-size:10pt;-inkscape-font-size:30px", (10.0, "pt")),
+    ("x-font-size:30px", (12.0, "pt")),
+])
+def test_prefixed_property_is_not_matched(style, expected):
+    assert style_length({"style": style}, "font-size") == expected
+
+
+def test_prefixed_line_height_is_not_matched():
+    root = ET.fromstring('<text style="font-size:10pt;-inkscape-line-height:40pt">a\nb</text>')
+    _, font_size, line_shift, _ = text_properties(root)
+    assert (font_size, line_shift) == (10.0, 10.0)
+    lines = split_svg_elements(ET.tostring(root, encoding="unicode"))
+    assert [float(line.get("y")) for line in lines] == [10.0, 20.0]
+
+
+def test_parse_style():
+    props = parse_style(" Font-Size : 14px ; fill:#000;;broken; fill:#fff")
+    assert dict(props) == {"font-size": "14px", "fill": "#fff"}
+    # the attribute wins over the style
+    assert style_property({"font-size": "9", "style": "font-size:14px"}, "font-size") == "9"
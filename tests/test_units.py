@@ -0,0 +1,57 @@
+# ======================================
+# Krita text split plug-in : unit conversion tests
+# ======================================
+# See split_text.py for the full license notice.
+
+import pytest
+
+from split_text import units
+from split_text.core import convert_pt_to_unit, convert_to_pt
+from split_text.units import NUMPY_MIN_VALUES, to_pt_array
+
+
+@pytest.mark.parametrize("value, unit, base, expected", [
+    # these raised NameError (safe_base_font_size) before
+    (12.0, "em", 12.0, 1.0),
+    (12.0, "EM", 24.0, 0.5),
+    (6.0, "ex", 12.0, 1.0),
+    (12.0, "%", 12.0, 100.0),
+    (72.0, "in", 12.0, 1.0),
+    (28.3465, "cm", 12.0, 1.0),
+    (12, "pc", 12, 1.0),
+    (12.0, "px", 12.0, 12.0),
+    # the base font size falls back to 12pt
+    (12.0, "em", 0, 1.0),
+    (12.0, "em", -5.0, 1.0),
+])
+def test_convert_pt_to_unit(value, unit, base, expected):
+    assert convert_pt_to_unit(value, unit, base) == pytest.approx(expected)
+
+
+def test_convert_pt_to_unit_errors():
+    with pytest.raises(ValueError):
+        convert_pt_to_unit(12.0, "furlong")
+    with pytest.raises(ValueError):
+        convert_pt_to_unit(None, "pt")
+    with pytest.raises(TypeError):
+        convert_pt_to_unit("12", "pt")
+
+
+@pytest.mark.parametrize("unit", ["pt", "em", "ex", "%", "lines", "px", "mm", "cm", "q", "in", "pc"])
+def test_round_trip(unit):
+    assert convert_to_pt(convert_pt_to_unit(10.0, unit, 16.0), unit, 16.0) == pytest.approx(10.0)
+
+
+@pytest.mark.parametrize("count", [3, NUMPY_MIN_VALUES + 5])
+@pytest.mark.parametrize("with_numpy", [True, False])
+def test_to_pt_array(monkeypatch, count, with_numpy):
+    if with_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(units, "np", None)
+    values = [float(i) for i in range(count)]
+    unit_list = [("em", "pt", "mm", "%")[i % 4] for i in range(count)]
+    bases = [10.0 + i for i in range(count)]
+    expected = [units.to_pt(v, u, b) for v, u, b in zip(values, unit_list, bases)]
+    assert to_pt_array(values, unit_list, bases) == pytest.approx(expected)
+    assert to_pt_array(values, "em", 12.0) == pytest.approx([v * 12.0 for v in values])
@@ -0,0 +1,80 @@
+# ======================================
+# Krita text split plug-in : watch folder service tests
+# ======================================
+# See split_text.py for the full license notice.
+
+import asyncio
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from split_text import watch
+from split_text.batch import OUTPUT_SUFFIX, process_file
+
+DOCUMENT = ('<svg xmlns="http://www.w3.org/2000/svg">'
+            '<text font-size="12" transform="translate(10 20)">a\nb</text></svg>')
+
+SLOW_SECONDS = 0.5
+
+pytestmark = pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                                reason="the patched job must be in the worker processes")
+
+
+def crash_or_split(job):
+    # the worker process dies on "crash.svg" (Ex: out of memory)
+    if os.path.basename(job[0]) == "crash.svg":
+        os._exit(1)
+    return process_file(job)
+
+
+def slow_split(job):
+    time.sleep(SLOW_SECONDS)
+    return process_file(job)
+
+
+def run_service(service, timeout=30):
+    return asyncio.run(asyncio.wait_for(service.run(once=True), timeout))
+
+
+def write_inputs(directory, names):
+    for name in names:
+        (directory / name).write_text(DOCUMENT, encoding="utf-8")
+
+
+def test_broken_pool_is_replaced(tmp_path, monkeypatch):
+    monkeypatch.setattr(watch, "process_file", crash_or_split)
+    write_inputs(tmp_path, ["crash.svg", "a.svg", "b.svg"])
+    # one worker : only the crashing file is in the pool when it breaks
+    service = watch.WatchService(str(tmp_path), jobs=1, interval=0.05, settle=0.0, stats_interval=60)
+    counters = run_service(service)
+    assert counters["failed"] == 1
+    assert counters["done"] == 2
+    assert (tmp_path / ("a" + OUTPUT_SUFFIX)).exists()
+    assert not (tmp_path / ("crash" + OUTPUT_SUFFIX)).exists()
+
+
+def test_stop_with_full_queue(tmp_path, monkeypatch):
+    # slow worker : 8 files would take 8 * SLOW_SECONDS one after another
+    monkeypatch.setattr(watch, "process_file", slow_split)
+    write_inputs(tmp_path, [f"{i}.svg" for i in range(8)])
+    service = watch.WatchService(str(tmp_path), jobs=1, queue_size=1, interval=0.05, settle=0.0,
+                                 stats_interval=60)
+
+    async def stop_soon():
+        task = asyncio.create_task(service.run())
+        await asyncio.sleep(0.2)
+        stopped = time.perf_counter()
+        service.stop()
+        counters = await asyncio.wait_for(task, 30)
+        return counters, time.perf_counter() - stopped
+
+    counters, elapsed = asyncio.run(stop_soon())
+    # only the file in the worker is finished, the waiting ones are not started
+    assert elapsed < 2 * SLOW_SECONDS + 1.0
+    assert counters["done"] + counters["failed"] < 8
+    assert counters["done"] + counters["failed"] <= 2
+    outputs = [name for name in os.listdir(tmp_path) if name.endswith(OUTPUT_SUFFIX)]
+    assert len(outputs) == counters["done"]
+    assert counters["queue_depth"] == 0
@@ -0,0 +1,66 @@
+# ======================================
+# Krita text split plug-in : auto wrap tests
+# ======================================
+# See split_text.py for the full license notice.
+
+import xml.etree.ElementTree as ET
+
+from split_text.core import split_svg_elements
+from split_text.glyphs import FontKey
+from split_text.wrap import break_tokens, line_tokens, wrap_lines
+
+FONT = FontKey("sans-serif", 10.0, "normal", "normal")
+
+
+def measure(text, font):
+    # one unit per character
+    return float(len(text))
+
+
+def tokens(text):
+    return line_tokens(ET.fromstring(f"<text>{text}</text>"), FONT)
+
+
+def texts(lines):
+    return ["".join(text for text, _ in parts) for parts in lines]
+
+
+def test_greedy_break():
+    lines = break_tokens(tokens("aa bb cc dd"), 5, measure)
+    # the white spaces at the breaks are dropped
+    assert texts(lines) == ["aa bb", "cc dd"]
+
+
+def test_word_longer_than_width():
+    lines = break_tokens(tokens("ab abcdefghij cd"), 4, measure)
+    # the long word starts a new line and is broken between the characters
+    assert texts(lines) == ["ab", "abcd", "efgh", "ij", "cd"]
+
+
+def test_single_long_word():
+    assert texts(break_tokens(tokens("abcdefg"), 3, measure)) == ["abc", "def", "g"]
+
+
+def test_cjk_without_spaces():
+    text = "\u65e5\u672c\u8a9e\u306e\u6587\u7ae0\u3067\u3059"  # 8 wide glyphs, 1em each
+    root = ET.fromstring(f"<text>{text}</text>")
+    lines = wrap_lines([root], 30, "horizontal-tb", FONT, 12)
+    assert ["".join(line.itertext()) for line in lines] == [text[0:3], text[3:6], text[6:8]]
+    assert [float(line.get("y")) for line in lines] == [0, 12, 24]
+
+
+def test_explicit_newlines():
+    # 0.5em = 5pt per latin glyph
+    # each source line starts a new visual line, the following lines move down by the added lines
+    lines = [ET.fromstring(f'<text y="{y}">{t}</text>') for y, t in ((0, "aaaa bbbb"), (12, "cc"), (24, "dddd eeee"))]
+    wrapped = wrap_lines(lines, 30, "horizontal-tb", FONT, 12)
+    assert ["".join(line.itertext()) for line in wrapped] == ["aaaa", "bbbb", "cc", "dddd", "eeee"]
+    assert [float(line.get("y")) for line in wrapped] == [0, 12, 24, 36, 48]
+
+
+def test_area_text_document():
+    svg = ('<text font-size="10" style="inline-size:30"><tspan x="0" dy="12">aaaa bbbb</tspan>'
+           '<tspan x="0" dy="12">cc</tspan></text>')
+    lines = split_svg_elements(svg, (1, 0, 0, 1, 0, 0))
+    assert ["".join(line.itertext()).strip() for line in lines] == ["aaaa", "bbbb", "cc"]
+    assert all("inline-size" not in (line.get("style") or "") for line in lines)